@@ -1,10 +1,11 @@
 """Export of Baroque main classes"""
 
 from .baroque import Baroque
-from .entities.eventtype import EventType
+from .asyncbaroque import AsyncBaroque
+from .entities.eventtype import EventType, EventPriority
 from .entities.event import Event
 from .entities.topic import Topic
-from .entities.reactor import Reactor
+from .entities.reactor import Reactor, BatchingReactor
 from .defaults.eventtypes import GenericEventType, StateTransitionEventType, \
     DataOperationEventType, MetricEventType
 from .defaults.reactors import ReactorFactory
@@ -0,0 +1,323 @@
+import asyncio
+import weakref
+from .baroque import Baroque
+from .dispatchers.base import Dispatcher
+from .entities.event import Event
+from .exceptions.configuration import InvalidConfigurationError
+from .exceptions.eventtypes import UnregisteredEventTypeError
+from .exceptions.topics import UnregisteredTopicError
+
+
+class AsyncBaroque(Baroque):
+    """The asyncio-native Baroque event broker class.
+
+    Publishing methods are coroutines: the reactors triggered by an event are
+    run concurrently on the event loop, so reaction functions can be
+    coroutine functions as well as plain functions. Plain reaction functions
+    are called as they are, and block the event loop while they run, unless
+    reactors are configured to run on a thread pool (``reactors.executor``
+    configuration section): in that case they are run on the pool.
+
+    The number of reactors running at the same time can be capped per broker
+    instance through the ``reactors.concurrency_limit`` configuration switch.
+
+    Events are persisted by awaiting the persistence backend, when this is a
+    :obj:`baroque.persistence.backend.AsyncPersistenceBackend`.
+
+    Publications are always carried out by the awaiting coroutine, which
+    validates, counts and persists events and runs reactors by itself rather
+    than through the publication pipeline (see
+    :obj:`baroque.pipelines.base.Pipeline`). The pipeline features that
+    this broker cannot honour are rejected rather than ignored: custom
+    stages, rate limits, coalescing, instrumentation and queued dispatch.
+
+    Note:
+        When no configuration file is specified, the default configuration
+        is loaded.
+
+    Args:
+        configfile (str, optional): Path to the configuration YML file.
+
+    Raises:
+        :obj:`baroque.exceptions.configuration.ConfigurationNotFoundError`: when the supplied filepath is not a regular file
+        :obj:`baroque.exceptions.configuration.ConfigurationParseError`: when the supplied file cannot be parsed
+        :obj:`baroque.exceptions.configuration.InvalidConfigurationError`: when the configuration enables features this broker does not support
+
+    """
+
+    def __init__(self, configfile=None):
+        Baroque.__init__(self, configfile)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    # -------- pipeline-related methods --------
+    def use(self, stage):
+        """Custom pipeline stages are not supported by the asyncio broker.
+
+        Raises:
+            :obj:`baroque.exceptions.configuration.InvalidConfigurationError`: always
+
+        """
+        raise InvalidConfigurationError(
+            'Custom pipeline stages are not supported by {}'.format(
+                self.__class__.__name__))
+
+    def compile_pipeline(self):
+        """Checks that the configuration only enables features supported by
+        the asyncio broker, then compiles the publication pipeline as
+        :obj:`baroque.baroque.Baroque.compile_pipeline()` does.
+
+        Raises:
+            :obj:`baroque.exceptions.configuration.InvalidConfigurationError`: when the configuration enables custom stages, rate limits, coalescing, instrumentation or queued dispatch
+
+        """
+        unsupported = self._unsupported_features()
+        if unsupported:
+            raise InvalidConfigurationError(
+                '{} does not support: {}'.format(self.__class__.__name__,
+                                                 ', '.join(unsupported)))
+        Baroque.compile_pipeline(self)
+
+    def _unsupported_features(self):
+        """Tells which of the features enabled by the configuration are not
+        supported by the asyncio broker.
+
+        Returns:
+            `list` of str
+
+        """
+        events_config = self.config['events']
+        result = list()
+        if self._middlewares:
+            result.append('middlewares')
+        limits = events_config.get('rate_limits') or dict()
+        if any(limits.get(kind)
+               for kind in ('eventtypes', 'topics', 'owners')):
+            result.append('rate_limits')
+        coalescing = events_config.get('coalescing') or dict()
+        if coalescing.get('window') and coalescing.get('eventtypes'):
+            result.append('coalescing')
+        if (events_config.get('instrumentation') or dict()).get('enabled'):
+            result.append('instrumentation')
+        if ((events_config.get('dispatch') or dict()).get('mode') or
+                'sync') != 'sync':
+            result.append('dispatch')
+        return result
+
+    # -------- event-related methods --------
+    async def publish(self, event):
+        """Publishes an event on the broker.
+
+        Note:
+            This is a template-method
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be published
+
+        """
+        assert isinstance(event, Event)
+        if self.config['events']['validate_schema']:
+            self._validate_event_schema(event)
+        self._count_event(event)
+        await self._execute_reactors(event)
+        self._update_event_status(event)
+        if self.config['events']['persist']:
+            await self._persist_event_async(event)
+
+    async def publish_many(self, events):
+        """Publishes a batch of events on the broker.
+
+        Note:
+            This is a template-method. Events are dispatched one after the
+            other, in the same order as they are supplied.
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects to be published
+
+        """
+        events = list(events)
+        assert all(isinstance(event, Event) for event in events)
+        if self.config['events']['validate_schema']:
+            self._validate_events_schema(events)
+        self._count_events(events)
+        await self._execute_reactors_on_events(events)
+        self._update_events_status(events)
+        if self.config['events']['persist']:
+            await self._persist_events_async(events)
+
+    async def publish_on_topic(self, event, topic):
+        """Publishes an event on a specified topic registered on the broker.
+
+        Note:
+            This is a template-method
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be published on the topic
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the event must be published
+
+        Raises
+            :obj:`baroque.exceptions.topics.UnregisteredTopicError`:
+            when trying to publish events on a topic that is not registered
+            on the broker
+
+        """
+        if topic not in self.topics:
+            raise UnregisteredTopicError(topic)
+        assert isinstance(event, Event)
+        self._count_event(event)
+        await self._run_reactors(
+            self.topics.get_reactors(topic, event.type_class), event)
+        self._update_event_status(event)
+        if self.config['events']['persist']:
+            await self._persist_event_async(event)
+
+    async def publish_many_on_topic(self, events, topic):
+        """Publishes a batch of events on a specified topic registered on the
+        broker.
+
+        Note:
+            This is a template-method
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects to be published on the topic
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the events must be published
+
+        Raises
+            :obj:`baroque.exceptions.topics.UnregisteredTopicError`:
+            when trying to publish events on a topic that is not registered
+            on the broker
+
+        """
+        if topic not in self.topics:
+            raise UnregisteredTopicError(topic)
+        events = list(events)
+        assert all(isinstance(event, Event) for event in events)
+        self._count_events(events)
+        for event in events:
+            await self._run_reactors(
+                self.topics.get_reactors(topic, event.type_class), event)
+        self._update_events_status(events)
+        if self.config['events']['persist']:
+            await self._persist_events_async(events)
+
+    # "private" methods
+    def _load_dispatcher(self):
+        """Publications are carried out by the awaiting coroutine, so no
+        dispatcher threads are started (queued dispatch is rejected by
+        :obj:`compile_pipeline()`)."""
+        self._dispatcher = Dispatcher()
+
+    async def _execute_reactors(self, event):
+        """Concurrently execute all reactors that subscribed to the event type
+        of the input event.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event
+        Raises
+            :obj:`baroque.exceptions.eventtypes.UnregisteredEventTypeError`: when the type of the event is not registered on the broker
+
+        """
+        ignore = self.config['eventtypes']['ignore_unregistered']
+        if not ignore:
+            if event.type_class not in self.eventtypes:
+                raise UnregisteredEventTypeError(event.type)
+        await self._run_reactors(self.reactreg.get_reactors(event.type_class), event)
+
+    async def _execute_reactors_on_events(self, events):
+        """Execute on each event of a batch all reactors that subscribed to its
+        event type: the reactors of each event run concurrently, events are
+        dispatched one after the other.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects
+        Raises
+            :obj:`baroque.exceptions.eventtypes.UnregisteredEventTypeError`: when the type of any event is not registered on the broker
+
+        """
+        for event in events:
+            await self._execute_reactors(event)
+
+    async def _run_reactors(self, reactors, event):
+        """Concurrently runs reactors on an event, within the concurrency
+        limit of this broker instance.
+
+        Args:
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be run
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        Raises:
+            the first exception raised by any reactor, if exceptions
+            propagation is configured
+
+        """
+        if not reactors:
+            return
+        semaphore = self._get_semaphore()
+        if semaphore is None:
+            coros = [self._executor.react_async(r, event) for r in reactors]
+        else:
+            coros = [self._run_limited(semaphore, r, event) for r in reactors]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        if self.config['reactors']['propagate_exceptions']:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+    async def _run_limited(self, semaphore, reactor, event):
+        """Runs a reactor on an event as soon as the semaphore allows it.
+
+        Args:
+            semaphore (:obj:`asyncio.Semaphore`): the concurrency-limiting semaphore
+            reactor (:obj:`baroque.entities.reactor.Reactor`): the reactor
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        """
+        async with semaphore:
+            await self._executor.react_async(reactor, event)
+
+    def _get_semaphore(self):
+        """Gives the semaphore enforcing the reactors concurrency limit of this
+        broker instance on the running event loop, creating it on first use.
+        As semaphores are bound to an event loop, one is kept for each loop.
+
+        Returns:
+            :obj:`asyncio.Semaphore`, or ``None`` if no limit is configured
+
+        """
+        limit = self.config['reactors'].get('concurrency_limit')
+        if not limit:
+            return None
+        loop = asyncio.get_running_loop()
+        cached = self._semaphores.get(loop)
+        if cached is None or cached[0] != limit:
+            cached = self._semaphores[loop] = (limit, asyncio.Semaphore(limit))
+        return cached[1]
+
+    async def _persist_event_async(self, event):
+        """Persists the event information to a datastore, awaiting the
+        persistence backend if this is asynchronous.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be persisted
+
+        """
+        result = self._persistance_backend.create(event)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def _persist_events_async(self, events):
+        """Persists a batch of events to a datastore, awaiting the persistence
+        backend if this is asynchronous.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects to be persisted
+
+        """
+        result = self._persistance_backend.create_many(events)
+        if asyncio.iscoroutine(result):
+            await result
+
+    # -------- aliases --------
+
+    async def fire(self, event):
+        """Alias for `baroque.asyncbaroque.AsyncBaroque.publish()` method"""
+        await self.publish(event)
@@ -1,11 +1,38 @@
+import copy
+import threading
 from .constants import BAROQUE_VERSION
-from .datastructures import registries, counters
+from .datastructures import registries, counters, histograms
+from .datastructures.queues import OverflowPolicy
 from .utils import configreader, importer
-from .entities.eventtype import EventType
 from .entities.event import Event
-from .exceptions.eventtypes import UnregisteredEventTypeError, \
-    InvalidEventSchemaError
+from .exceptions.eventtypes import InvalidEventSchemaError
 from .exceptions.topics import UnregisteredTopicError
+from .exceptions.configuration import InvalidConfigurationError
+from .executors.base import ReactorsExecutor
+from .executors.threads import ThreadPoolReactorsExecutor
+from .dispatchers.base import Dispatcher
+from .dispatchers.queued import QueuedDispatcher
+from .dispatchers.priority import PriorityDispatcher
+from .dispatchers.partitioned import PartitionedDispatcher
+from .pipelines.base import Pipeline, Stage
+from .pipelines.instrumentation import InstrumentedExecutor
+from .pipelines.stages import RateLimitStage, CoalescingStage, \
+    ValidationStage, CountingStage, StatusStage, PersistenceStage, \
+    ReactorsStage
+
+REACTORS_EXECUTORS = {
+    'inline': ReactorsExecutor,
+    'threads': ThreadPoolReactorsExecutor
+}
+"""dict: reactors executor classes, by execution mode"""
+
+DISPATCHERS = {
+    'sync': Dispatcher,
+    'queued': QueuedDispatcher,
+    'priority': PriorityDispatcher,
+    'partitioned': PartitionedDispatcher
+}
+"""dict: dispatcher classes, by dispatch mode"""
 
 
 class Baroque:
@@ -25,12 +52,40 @@ class Baroque:
     """
 
     def __init__(self, configfile=None):
-        self.config = configreader.read_config_or_default(configfile)
+        self._config = configreader.read_config_or_default(configfile)
         self.reactreg = registries.ReactorsRegistry()
         self.topicsreg = registries.TopicsRegistry()
         self.evtcounter = counters.EventCounter()
+        self._latencies = None
+        self._rate_limit_stage = None
+        self._used_stages = list()
+        self._compiled_config = None
+        self._reconfiguring = threading.RLock()
         self._load_preregistered_eventtypes()
         self._load_persistence_backend()
+        self._load_reactors_executor()
+        self._load_dispatcher()
+        self._load_middlewares()
+        self.compile_pipeline()
+
+    @property
+    def config(self):
+        """:obj:`dict`: the configuration for this broker instance. Changes
+        take effect when the configuration is set: the custom stages, the
+        reactors executor and the dispatcher are reloaded when their
+        configuration changed, and the publication pipeline is recompiled
+        (see :obj:`compile_pipeline()`). Changes made in place are not looked
+        for while publishing: set the configuration again afterwards (eg.
+        ``brq.config = brq.config``). The persistence backend and the
+        pre-registered event types are only loaded when the broker is
+        created"""
+        return self._config
+
+    @config.setter
+    def config(self, config):
+        with self._reconfiguring:
+            self._config = config
+            self._reconfigure()
 
     @property
     def configuration(self):
@@ -66,13 +121,174 @@ class Baroque:
         registry of topics registered on this broker instance"""
         return self.topicsreg
 
+    @property
+    def latencies(self):
+        """:obj:`baroque.datastructures.histograms.LatencyHistograms`:
+        latencies of the publication pipeline stages on this broker instance,
+        ``None`` if instrumentation is not enabled"""
+        return self._latencies
+
+    @property
+    def executor(self):
+        """:obj:`baroque.executors.base.ReactorsExecutor`: the executor
+        running reactors on this broker instance"""
+        return self._executor
+
+    @property
+    def pipeline(self):
+        """:obj:`baroque.pipelines.base.Pipeline`: the publication pipeline of
+        this broker instance"""
+        return self._pipeline
+
+    @property
+    def dispatcher(self):
+        """:obj:`baroque.dispatchers.base.Dispatcher`: the dispatcher carrying
+        out publications on this broker instance"""
+        return self._dispatcher
+
+    def flush(self, timeout=None):
+        """Waits for all pending publications to be carried out, then
+        publishes right away the events held by the pipeline stages (eg. for
+        coalescing) and delivers the events held by reactors (eg. batching
+        reactors). Publications are pending only when events are dispatched
+        through a queue.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for
+
+        Returns:
+            ``True`` if there are no pending publications, ``False`` on timeout
+
+        Raises:
+            the first exception raised while carrying out publications since
+            the last flush, if exceptions propagation is configured
+
+        """
+        done = self._dispatcher.flush(timeout)
+        self._pipeline.flush()
+        self._flush_reactors()
+        return done
+
+    def close(self, timeout=None):
+        """Releases the resources held by this broker instance: stops accepting
+        publications, drains the pending ones and waits for pending reactions
+        to be over.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for
+                pending publications to be drained
+
+        Raises:
+            the first exception raised while carrying out publications since
+            the last flush, if exceptions propagation is configured
+
+        """
+        try:
+            try:
+                self._dispatcher.close(timeout)
+            finally:
+                try:
+                    self._pipeline.close()
+                finally:
+                    self._flush_reactors()
+        finally:
+            self._executor.shutdown(wait=True)
+
     def reset(self):
-        """Resets the reactors register and the published events counter of
-        this broker instance.
+        """Resets the reactors register, the published events counter and the
+        latency histograms of this broker instance.
 
         """
         self.reactreg = registries.ReactorsRegistry()
         self.evtcounter = counters.EventCounter()
+        self._latencies = None
+        self.compile_pipeline()
+
+    # -------- pipeline-related methods --------
+    def use(self, stage):
+        """Adds a custom stage to the publication pipeline of the broker and
+        recompiles the pipeline. Custom stages are run in the same order as
+        they are added, after rate limits are enforced and before events are
+        validated and counted.
+
+        Args:
+            stage (:obj:`baroque.pipelines.base.Stage`): the stage
+
+        Returns:
+            :obj:`baroque.pipelines.base.Stage`
+
+        """
+        assert isinstance(stage, Stage)
+        self._used_stages.append(stage)
+        self.compile_pipeline()
+        return stage
+
+    def compile_pipeline(self):
+        """Assembles the enabled stages of the publication pipeline into
+        flat call chains, according to the current configuration. Events held
+        by the previous pipeline stages are published before it is dropped.
+
+        When instrumentation is enabled, stages are compiled wrapped into
+        hooks recording their latencies (see :obj:`latencies`); otherwise no
+        hooks are compiled at all.
+
+        The state of rate limits that are not changed (eg. the tokens taken
+        so far) is carried over to the new pipeline.
+
+        Raises:
+            :obj:`baroque.exceptions.configuration.InvalidConfigurationError`: when the rate limits or coalescing configuration is not valid
+
+        """
+        self._compiled_config = copy.deepcopy(self._config)
+        self._rate_limit_stage = RateLimitStage(
+            self, previous=self._rate_limit_stage)
+        stages = [self._rate_limit_stage] + list(self._middlewares) + \
+            list(self._used_stages) + \
+            [CoalescingStage(self), ValidationStage(self), CountingStage(self),
+             PersistenceStage(self), StatusStage(self)]
+        self.reactreg.set_supertypes(
+            self.config['eventtypes'].get('dispatch_to_supertypes', False))
+        latencies = self._load_latencies()
+        executor = self._executor
+        if latencies is not None:
+            executor = InstrumentedExecutor(executor, latencies)
+        previous = getattr(self, '_pipeline', None)
+        self._pipeline = Pipeline(stages, ReactorsStage(self, executor),
+                                  self.config, histograms=latencies)
+        if previous is not None:
+            previous.close()
+
+    def _reconfigure(self):
+        """Reloads the components of this broker instance whose configuration
+        changed since the pipeline was last compiled, then recompiles the
+        pipeline. Pending publications are carried out before the dispatcher
+        is replaced, pending reactions are over before the reactors executor
+        is shut down."""
+        previous = self._compiled_config or dict()
+
+        def changed(section, key):
+            return (self._config.get(section) or dict()).get(key) != \
+                (previous.get(section) or dict()).get(key)
+
+        if changed('events', 'middlewares'):
+            self._load_middlewares()
+        executor = None
+        reload_dispatcher = changed('events', 'dispatch') or \
+            changed('reactors', 'propagate_exceptions')
+        if changed('reactors', 'executor'):
+            executor = self._executor
+            reload_dispatcher = True
+        if reload_dispatcher:
+            self._dispatcher.close()
+        try:
+            if executor is not None:
+                self._load_reactors_executor()
+            self.compile_pipeline()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+            if reload_dispatcher:
+                self._load_dispatcher()
 
     # -------- reactor-related methods --------
     def on(self, eventtype):
@@ -99,27 +315,126 @@ class Baroque:
         """
         return self.reactreg.get_jolly_bag().run(reactor)
 
+    def on_any_event_run_many(self, reactors):
+        """Subscribes a collection of reactors on the broker to be run upon
+        any event firing.
+
+        Args:
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be subscribed
+
+        Returns:
+            `list` of :obj:`baroque.datastructures.reactor.Reactor` items
+
+        """
+        return self.reactreg.get_jolly_bag().run_many(reactors)
+
     # -------- event-related methods --------
     def publish(self, event):
         """Publishes an event on the broker.
 
         Note:
-            This is a template-method
+            When events are dispatched through a queue, the event is just
+            enqueued and the publication is carried out later on by a
+            dispatcher thread (see :obj:`flush()`)
 
         Args:
             event (:obj:`baroque.entities.event.Event`): the event to be published
 
+        Returns:
+            a :obj:`baroque.executors.base.ReactionsHandle` to wait for the
+            reactions when events are dispatched synchronously and either
+            reactors are run on a thread pool or CPU-bound reactors are run
+            without propagating exceptions, ``None`` otherwise
+
+        Raises:
+            :obj:`baroque.exceptions.dispatch.QueueFullError`: when events are dispatched through a full queue and the overflow policy is ``raise``
+
         """
         assert isinstance(event, Event)
-        if self.config['events']['validate_schema']:
-            self._validate_event_schema(event)
-        self._count_event(event)
-        self._execute_reactors(event)
-        self._update_event_status(event)
-        if self.config['events']['persist']:
-            self._persist_event(event)
+        return self._dispatcher.dispatch(self._publish, event)
+
+    def publish_many(self, events):
+        """Publishes a batch of events on the broker.
+
+        Configuration switches, validators and reactors are looked up once
+        per batch instead of once per event, then events are validated,
+        counted, dispatched to reactors and persisted in grouped passes.
+        Events are dispatched in the same order as they are supplied.
+
+        Note:
+            As validation happens before any event is dispatched, a single
+            invalid event prevents the whole batch from being published.
+            When events are dispatched through a queue, the batch takes a
+            single slot of the queue.
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects to be published
+
+        Returns:
+            a :obj:`baroque.executors.base.ReactionsHandle` to wait for the
+            reactions when events are dispatched synchronously and either
+            reactors are run on a thread pool or CPU-bound reactors are run
+            without propagating exceptions, ``None`` otherwise
+
+        """
+        events = list(events)
+        assert all(isinstance(event, Event) for event in events)
+        return self._dispatcher.dispatch(self._publish_many, events)
 
     # "private" methods
+    def _publish(self, event):
+        """Carries out the publication of an event through the pipeline.
+
+        Note:
+            When reactors are run on a thread pool, the event is marked as
+            published and persisted as soon as reactors are submitted to the
+            pool.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be published
+
+        Returns:
+            the :obj:`baroque.executors.base.ReactionsHandle` given by the
+            reactors executor, if any
+
+        """
+        return self._pipeline.publish(event, None)
+
+    def _publish_many(self, events):
+        """Carries out the publication of a batch of events through the
+        pipeline.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects to be published
+
+        Returns:
+            the :obj:`baroque.executors.base.ReactionsHandle` given by the
+            reactors executor, if any
+
+        """
+        return self._pipeline.publish_many(events, None)
+
+    def _flush_reactors(self):
+        """Delivers the events held by the reactors subscribed on this broker
+        instance, either to event types or to topics.
+
+        Raises:
+            the first exception raised by any reactor, if exceptions
+            propagation is configured
+
+        """
+        error = None
+        for reactor in self.reactreg.get_all_reactors() + \
+                self.topics.get_all_reactors():
+            try:
+                reactor.flush()
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None and \
+                self.config['reactors']['propagate_exceptions']:
+            raise error
+
     def _count_event(self, event):
         """Increments the events counter of the broker
 
@@ -129,33 +444,14 @@ class Baroque:
         """
         self.evtcounter.increment_counting(event)
 
-    def _execute_reactors(self, event):
-        """Execute all reactors that subscribed to the event type of the input
-        event.
+    def _count_events(self, events):
+        """Increments the events counter of the broker by a batch of events
 
         Args:
-            event (:obj:`baroque.entities.event.Event`): the event
-        Raises
-            :obj:`baroque.exceptions.eventtypes.UnregisteredEventTypeError`: when the type of the event is not registered on the broker
+            events (list): the :obj:`baroque.entities.event.Event` objects to be counted
 
         """
-        propagate = self.config['reactors']['propagate_exceptions']
-        ignore = self.config['eventtypes']['ignore_unregistered']
-        if not ignore:
-            if event.type not in self.eventtypes:
-                raise UnregisteredEventTypeError(event.type)
-        for r in self.reactreg.get_jolly_bag():
-            try:
-                r.react_conditionally(event)
-            except:
-                if propagate:
-                    raise
-        for r in self.reactreg.get_bag(event.type):
-            try:
-                r.react_conditionally(event)
-            except:
-                if propagate:
-                    raise
+        self.evtcounter.increment_counting_many(events)
 
     def _update_event_status(self, event):
         """Turns the event status to published.
@@ -166,6 +462,25 @@ class Baroque:
         """
         event.set_published()
 
+    def _update_events_status(self, events):
+        """Turns the status of a batch of events to published.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects whose status needs to be set to published.
+
+        """
+        for event in events:
+            event.set_published()
+
+    def _persist_events(self, events):
+        """Persists a batch of events to a datastore.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects to be persisted
+
+        """
+        self._persistance_backend.create_many(events)
+
     def _persist_event(self, event):
         """Persists the event information to a datastore.
 
@@ -180,8 +495,7 @@ class Baroque:
         broker instance"""
         for path in self.config['eventtypes']['pre_registered']:
             class_ = importer.class_from_dotted_path(path)
-            eventtype = class_()
-            self.eventtypes.register(eventtype)
+            self.eventtypes.register(class_.canonical())
 
     def _load_persistence_backend(self):
         """Loads on this broker instance the persistence backend defined in
@@ -191,17 +505,132 @@ class Baroque:
             class_ = importer.class_from_dotted_path(path)
             self._persistance_backend = class_()
 
-    def _validate_event_schema(self, event):
+    def _load_middlewares(self):
+        """Loads on this broker instance the custom pipeline stages defined in
+        configuration"""
+        self._middlewares = list()
+        for path in self.config['events'].get('middlewares') or list():
+            class_ = importer.class_from_dotted_path(path)
+            self._middlewares.append(class_())
+
+    def _load_latencies(self):
+        """Loads on this broker instance the latency histograms, according to
+        the ``events.instrumentation`` configuration section. Histograms are
+        kept as long as their buckets are not changed.
+
+        Returns:
+            :obj:`baroque.datastructures.histograms.LatencyHistograms`, ``None``
+            if instrumentation is not enabled
+
+        """
+        instrumentation = self.config['events'].get('instrumentation') or \
+            dict()
+        if not instrumentation.get('enabled'):
+            self._latencies = None
+            return None
+        buckets = tuple(instrumentation.get('buckets') or
+                        histograms.DEFAULT_BUCKETS)
+        if self._latencies is None or self._latencies.buckets != buckets:
+            self._latencies = histograms.LatencyHistograms(buckets)
+        return self._latencies
+
+    def _load_reactors_executor(self):
+        """Loads on this broker instance the reactors executor defined in
+        configuration
+
+        Raises:
+            :obj:`baroque.exceptions.configuration.InvalidConfigurationError`: when the execution mode is not supported
+
+        """
+        executor_config = self.config['reactors'].get('executor') or dict()
+        mode = executor_config.get('mode') or 'inline'
+        if mode not in REACTORS_EXECUTORS:
+            raise InvalidConfigurationError(
+                'Unsupported reactors execution mode: {}'.format(mode))
+        process_workers = executor_config.get('process_workers')
+        if mode == 'inline':
+            self._executor = ReactorsExecutor(process_workers=process_workers)
+        else:
+            self._executor = REACTORS_EXECUTORS[mode](
+                workers=executor_config.get('workers'),
+                process_workers=process_workers)
+
+    def _load_dispatcher(self):
+        """Loads on this broker instance the dispatcher defined in
+        configuration
+
+        Raises:
+            :obj:`baroque.exceptions.configuration.InvalidConfigurationError`: when the dispatch mode or the overflow policy are not supported, or when no partition key is provided for key-partitioned dispatch
+
+        """
+        dispatch_config = self.config['events'].get('dispatch') or dict()
+        mode = dispatch_config.get('mode') or 'sync'
+        if mode not in DISPATCHERS:
+            raise InvalidConfigurationError(
+                'Unsupported events dispatch mode: {}'.format(mode))
+        if mode == 'sync':
+            self._dispatcher = Dispatcher()
+            return
+        overflow = dispatch_config.get('overflow') or OverflowPolicy.BLOCK
+        if overflow not in OverflowPolicy.ALL:
+            raise InvalidConfigurationError(
+                'Unsupported queue overflow policy: {}'.format(overflow))
+        kwargs = dict(
+            queue_size=dispatch_config.get('queue_size'),
+            overflow=overflow,
+            propagate=self.config['reactors']['propagate_exceptions'])
+        if mode == 'partitioned':
+            path = dispatch_config.get('partition_key')
+            if not path:
+                raise InvalidConfigurationError(
+                    'No partition key provided for key-partitioned dispatch')
+            kwargs['key'] = importer.class_from_dotted_path(path)
+            kwargs['lanes'] = dispatch_config.get('lanes') or 4
+        else:
+            kwargs['dispatchers'] = dispatch_config.get('dispatchers') or 1
+        if mode == 'priority':
+            aging = dispatch_config.get('aging')
+            kwargs['aging'] = 100 if aging is None else aging
+        self._dispatcher = DISPATCHERS[mode](**kwargs)
+
+    def _validate_events_schema(self, events):
+        """Validate the JSON Schema of a batch of events. The validator of
+        each event type is looked up once for the batch (see
+        :obj:`baroque.entities.eventtype.EventType.validator`).
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects whose JSON schema needs to be validated.
+        Raises
+            :obj:`baroque.exceptions.eventtypes.InvalidEventSchema`:
+            when the first invalid event of the batch is met
+
+        """
+        validators = dict()
+        for event in events:
+            self._validate_event_schema(event, validators)
+
+    def _validate_event_schema(self, event, validators=None):
         """Validate the JSON Schema of the input event.
 
         Args:
             event (:obj:`baroque.entities.event.Event`): the event whose JSON schema needs to be validated.
+            validators (dict, optional): the validators looked up so far, by event type class, to be reused and added to
         Raises
             :obj:`baroque.exceptions.eventtypes.InvalidEventSchema`:
             when the type of the event is not registered on the broker
 
         """
-        if not EventType.validate(event, event.type):
+        eventtype = event.type
+        validator = None
+        if validators is not None:
+            validator = validators.get(event.type_class)
+        # instances of the same class may have schemas of their own
+        if validator is None or \
+                validator.jsonschema is not eventtype.jsonschema:
+            validator = eventtype.validator
+            if validators is not None:
+                validators[event.type_class] = validator
+        if not validator.is_valid(event):
             raise InvalidEventSchemaError(event)
 
     # -------- event-related methods --------
@@ -209,12 +638,20 @@ class Baroque:
         """Publishes an event on a specified topic registered on the broker.
 
         Note:
-            This is a template-method
+            When events are dispatched through a queue, the event is just
+            enqueued and the publication is carried out later on by a
+            dispatcher thread (see :obj:`flush()`)
 
         Args:
             event (:obj:`baroque.entities.event.Event`): the event to be published on the topic
             topic (:obj:`baroque.entities.topic.Topic`): the topic on which the event must be published
 
+        Returns:
+            a :obj:`baroque.executors.base.ReactionsHandle` to wait for the
+            reactions when events are dispatched synchronously and either
+            reactors are run on a thread pool or CPU-bound reactors are run
+            without propagating exceptions, ``None`` otherwise
+
         Raises
             :obj:`baroque.exceptions.topics.UnregisteredTopicError`:
             when trying to publish events on a topic that is not registered
@@ -223,11 +660,67 @@ class Baroque:
         """
         if topic not in self.topics:
             raise UnregisteredTopicError(topic)
-        self._count_event(event)
-        self.topics.publish_on_topic(event, topic)
-        self._update_event_status(event)
-        if self.config['events']['persist']:
-            self._persist_event(event)
+        return self._dispatcher.dispatch(self._publish_on_topic, event, topic)
+
+    def publish_many_on_topic(self, events, topic):
+        """Publishes a batch of events on a specified topic registered on the
+        broker, counting, dispatching and persisting them in grouped passes.
+
+        Note:
+            When events are dispatched through a queue, the batch takes a
+            single slot of the queue.
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects to be published on the topic
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the events must be published
+
+        Returns:
+            a :obj:`baroque.executors.base.ReactionsHandle` to wait for the
+            reactions when events are dispatched synchronously and either
+            reactors are run on a thread pool or CPU-bound reactors are run
+            without propagating exceptions, ``None`` otherwise
+
+        Raises
+            :obj:`baroque.exceptions.topics.UnregisteredTopicError`:
+            when trying to publish events on a topic that is not registered
+            on the broker
+
+        """
+        if topic not in self.topics:
+            raise UnregisteredTopicError(topic)
+        events = list(events)
+        return self._dispatcher.dispatch(self._publish_many_on_topic, events,
+                                         topic)
+
+    def _publish_on_topic(self, event, topic):
+        """Carries out the publication of an event on a topic through the
+        pipeline.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be published on the topic
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the event must be published
+
+        Returns:
+            the :obj:`baroque.executors.base.ReactionsHandle` given by the
+            reactors executor, if any
+
+        """
+        return self._pipeline.publish_on_topic(event, topic)
+
+    def _publish_many_on_topic(self, events, topic):
+        """Carries out the publication of a batch of events on a topic through
+        the pipeline.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects to be published on the topic
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the events must be published
+
+        Returns:
+            the :obj:`baroque.executors.base.ReactionsHandle` given by the
+            reactors executor, if any
+
+        """
+        return self._pipeline.publish_many_on_topic(events, topic)
 
     def on_topic_run(self, topic, reactor):
         """Attaches a reactor on a topic registered on the broker.
@@ -236,18 +729,48 @@ class Baroque:
             topic (:obj:`baroque.entities.topic.Topic`): the topic to which the reactor must be attached
             reactor (:obj:`baroque.entities.reactor.Reactor`): the reactor to be attached to the topic
         """
+        self._bind_topic(topic)
+        self.topics.on_topic_run(topic, reactor)
+
+    def on_topic_run_many(self, topic, reactors):
+        """Attaches a collection of reactors on a topic registered on the
+        broker.
+
+        Args:
+            topic (:obj:`baroque.entities.topic.Topic`): the topic to which the reactors must be attached
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be attached to the topic
+        """
+        self._bind_topic(topic)
+        self.topics.on_topic_run_many(topic, reactors)
+
+    def remove_from_topic(self, topic, reactors):
+        """Detaches a collection of reactors from a topic registered on the
+        broker.
+
+        Args:
+            topic (:obj:`baroque.entities.topic.Topic`): the topic from which the reactors must be detached
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be detached from the topic
+
+        Returns:
+            int: how many reactors were detached
+
+        """
+        return self.topics.remove_from_topic(topic, reactors)
+
+    def _bind_topic(self, topic):
+        """Makes sure reactors can be attached to the topic, registering it
+        when the configuration allows it."""
         if topic not in self.topics:
             if self.config['topics']['register_on_binding']:
                 self.topics.register(topic)
             else:
                 raise UnregisteredTopicError(topic)
-        self.topics.on_topic_run(topic, reactor)
 
     # -------- aliases --------
 
     def fire(self, event):
         """Alias for `baroque.baroque.Baroque.publish()` method"""
-        self.publish(event)
+        return self.publish(event)
 
     def on_any_event_trigger(self, reactor):
         """Alias for `baroque.baroque.Baroque.on_any_event_run()` method"""
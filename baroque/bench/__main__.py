@@ -0,0 +1,84 @@
+"""Runs the benchmarks of the broker hot paths.
+
+Usage: ``python -m baroque.bench [-o results.json] [-c baseline.json]
+[-s scale] [-m] [name ...]``
+"""
+
+import argparse
+import sys
+from . import runner
+from .suites import BENCHMARKS
+from .memory import MEMORY_BENCHMARKS
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m baroque.bench',
+        description='Measures events/sec and per-event latency percentiles '
+                    'of the Baroque broker hot paths.')
+    parser.add_argument('names', nargs='*',
+                        help='benchmarks to be run (default: all of them)')
+    parser.add_argument('-o', '--output',
+                        help='path to the JSON file results are written to')
+    parser.add_argument('-c', '--compare',
+                        help='path to the JSON results of a previous run to '
+                             'compare with')
+    parser.add_argument('-s', '--scale', type=float, default=1.,
+                        help='factor applied to the number of iterations')
+    parser.add_argument('-m', '--memory', action='store_true',
+                        help='also measure the memory held by events')
+    parser.add_argument('-l', '--list', action='store_true',
+                        help='list the benchmarks and exit')
+    return parser.parse_args(argv)
+
+
+def report(result):
+    data = result.as_dict()
+    print('{:<36}{:>14.1f}{:>12.2f}{:>12.2f}{:>12.2f}'.format(
+        data['name'], data['ops_per_sec'], data['p50_us'], data['p90_us'],
+        data['p99_us']))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list:
+        for benchmark in BENCHMARKS + MEMORY_BENCHMARKS:
+            print('{:<36}{}'.format(benchmark.name, benchmark.description))
+        return 0
+    benchmarks = BENCHMARKS
+    if args.names:
+        unknown = set(args.names) - set(b.name for b in BENCHMARKS)
+        if unknown:
+            print('Unknown benchmarks: {}'.format(', '.join(sorted(unknown))),
+                  file=sys.stderr)
+            return 2
+        benchmarks = [b for b in BENCHMARKS if b.name in args.names]
+
+    print('{:<36}{:>14}{:>12}{:>12}{:>12}'.format(
+        'benchmark', 'ops/sec', 'p50 (us)', 'p90 (us)', 'p99 (us)'))
+    results = runner.run_all(benchmarks, scale=args.scale, report=report)
+    memory = list()
+    if args.memory:
+        print()
+        print('{:<36}{:>14}{:>16}'.format('benchmark', 'items', 'bytes/item'))
+        for benchmark in MEMORY_BENCHMARKS:
+            result = benchmark.run(scale=args.scale)
+            print('{:<36}{:>14}{:>16.1f}'.format(
+                result.name, result.count, result.bytes_per_item()))
+            memory.append(result)
+    if args.output:
+        runner.save(results, args.output, memory=memory)
+    if args.compare:
+        print()
+        print('{:<36}{:>14}{:>14}{:>10}'.format(
+            'benchmark', 'before', 'after', 'ratio'))
+        comparison = runner.compare(runner.load(args.compare),
+                                    runner.to_document(results))
+        for name, before, after, ratio in comparison:
+            print('{:<36}{:>14.1f}{:>14.1f}{:>9.2f}x'.format(
+                name, before, after, ratio))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
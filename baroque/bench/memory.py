@@ -0,0 +1,140 @@
+"""The benchmarks of the memory held by events"""
+
+import gc
+import tracemalloc
+from baroque.datastructures.queues import BoundedQueue
+from baroque.defaults.eventtypes import MetricEventType
+from baroque.entities.event import Event
+from baroque.persistence.inmemory import DictBackend
+
+
+class MemoryResult:
+    """The outcome of a memory benchmark run.
+
+    Args:
+        name (str): the benchmark name
+        count (int): the number of items held
+        size (int): the number of bytes allocated to hold the items
+
+    """
+
+    def __init__(self, name, count, size):
+        assert count > 0
+        self.name = name
+        self.count = count
+        self.size = size
+
+    def bytes_per_item(self):
+        """Tells how many bytes each item takes
+
+        Returns:
+            float
+
+        """
+        return self.size / self.count
+
+    def as_dict(self):
+        """Gives the figures of this result
+
+        Returns:
+            dict
+
+        """
+        return dict(name=self.name, count=self.count, bytes=self.size,
+                    bytes_per_item=self.bytes_per_item())
+
+    def __repr__(self):
+        return '<{}.{} - name: {} - bytes per item: {:.1f}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.name,
+            self.bytes_per_item())
+
+
+class MemoryBenchmark:
+    """A benchmark of the memory taken by items held by the broker.
+
+    Args:
+        name (str): the benchmark name
+        setup (function): function taking the number of items and giving an object holding them. Allocations made by the function are traced
+        count (int): default number of items
+        description (str, optional): what the benchmark measures
+
+    """
+
+    def __init__(self, name, setup, count, description=None):
+        assert callable(setup)
+        assert count > 0
+        self.name = name
+        self.setup = setup
+        self.count = count
+        self.description = description
+
+    def run(self, scale=1.):
+        """Runs the benchmark, tracing the memory allocated to hold the items.
+
+        Args:
+            scale (float, optional): factor applied to the default number of items
+
+        Returns:
+            :obj:`baroque.bench.memory.MemoryResult`
+
+        """
+        count = max(int(self.count * scale), 1)
+        gc.collect()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            held = self.setup(count)
+            gc.collect()
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+        del held
+        return MemoryResult(self.name, count, after - before)
+
+    def __repr__(self):
+        return '<{}.{} - name: {} - count: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.name,
+            self.count)
+
+
+def _events(n):
+    et = MetricEventType()
+    return [Event(et, payload=dict(metric='temperature', value=float(i),
+                                   timestamp=i))
+            for i in range(n)]
+
+
+def events(n):
+    return _events(n)
+
+
+def dictbackend_events(n):
+    backend = DictBackend()
+    backend.create_many(_events(n))
+    return backend
+
+
+def queued_events(n):
+    queue = BoundedQueue()
+    for event in _events(n):
+        queue.put(event)
+    return queue
+
+
+MEMORY_BENCHMARKS = [
+    MemoryBenchmark('events', events, 100000,
+                    'Events held in a list, fields not read'),
+    MemoryBenchmark('dictbackend_events', dictbackend_events, 100000,
+                    'Events held by DictBackend'),
+    MemoryBenchmark('queued_events', queued_events, 100000,
+                    'Events held in a BoundedQueue'),
+]
+"""list: the :obj:`baroque.bench.memory.MemoryBenchmark` objects, in running
+order"""
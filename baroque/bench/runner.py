@@ -0,0 +1,217 @@
+import json
+import platform
+import time
+from baroque.constants import BAROQUE_VERSION
+
+PERCENTILES = (50, 90, 99)
+"""tuple: latency percentiles given by benchmark results"""
+
+
+class BenchmarkResult:
+    """The outcome of a benchmark run.
+
+    Args:
+        name (str): the benchmark name
+        samples (list): the latency (seconds) of each operation
+
+    """
+
+    def __init__(self, name, samples):
+        assert samples
+        self.name = name
+        self.samples = sorted(samples)
+        self.iterations = len(samples)
+        self.elapsed = sum(samples)
+
+    def ops_per_sec(self):
+        """Tells how many operations per second were carried out
+
+        Returns:
+            float
+
+        """
+        if not self.elapsed:
+            return float('inf')
+        return self.iterations / self.elapsed
+
+    def percentile(self, p):
+        """Gives a latency percentile, by nearest rank
+
+        Args:
+            p (float): the percentile, between 0 and 100
+
+        Returns:
+            float (microseconds)
+
+        """
+        assert 0 <= p <= 100
+        rank = max(int(round(p * self.iterations / 100.)), 1)
+        return self.samples[rank - 1] * 1e6
+
+    def as_dict(self):
+        """Gives the figures of this result
+
+        Returns:
+            dict
+
+        """
+        data = dict(name=self.name, iterations=self.iterations,
+                    ops_per_sec=self.ops_per_sec(),
+                    mean_us=self.elapsed * 1e6 / self.iterations,
+                    max_us=self.samples[-1] * 1e6)
+        for p in PERCENTILES:
+            data['p{}_us'.format(p)] = self.percentile(p)
+        return data
+
+    def __repr__(self):
+        return '<{}.{} - name: {} - ops/sec: {:.1f}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.name,
+            self.ops_per_sec())
+
+
+class Benchmark:
+    """A benchmark of an operation on the broker.
+
+    Args:
+        name (str): the benchmark name
+        setup (function): function taking the number of iterations and giving the operation to be measured, a function taking no arguments. It is called once per run, outside of measurements
+        iterations (int): default number of times the operation is carried out
+        description (str, optional): what the benchmark measures
+
+    """
+
+    def __init__(self, name, setup, iterations, description=None):
+        assert callable(setup)
+        assert iterations > 0
+        self.name = name
+        self.setup = setup
+        self.iterations = iterations
+        self.description = description
+
+    def run(self, scale=1., warmup=0.1, clock=time.perf_counter):
+        """Runs the benchmark, timing each operation.
+
+        Args:
+            scale (float, optional): factor applied to the default number of iterations
+            warmup (float, optional): fraction of the iterations run before measurements start
+            clock (function, optional): the clock giving the current time, in seconds
+
+        Returns:
+            :obj:`baroque.bench.runner.BenchmarkResult`
+
+        """
+        iterations = max(int(self.iterations * scale), 1)
+        warmups = int(iterations * warmup)
+        op = self.setup(iterations + warmups)
+        for _ in range(warmups):
+            op()
+        samples = list()
+        append = samples.append
+        for _ in range(iterations):
+            start = clock()
+            op()
+            append(clock() - start)
+        return BenchmarkResult(self.name, samples)
+
+    def __repr__(self):
+        return '<{}.{} - name: {} - iterations: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.name,
+            self.iterations)
+
+
+def run_all(benchmarks, scale=1., report=None):
+    """Runs benchmarks one after the other.
+
+    Args:
+        benchmarks (iterable): the :obj:`baroque.bench.runner.Benchmark` objects
+        scale (float, optional): factor applied to the default number of iterations
+        report (function, optional): function called with each result, as soon as it is available
+
+    Returns:
+        `list` of :obj:`baroque.bench.runner.BenchmarkResult` items
+
+    """
+    results = list()
+    for benchmark in benchmarks:
+        result = benchmark.run(scale=scale)
+        if report is not None:
+            report(result)
+        results.append(result)
+    return results
+
+
+def to_document(results, memory=()):
+    """Gives a JSON-serializable document carrying benchmark results along
+    with the environment they were measured on.
+
+    Args:
+        results (list): the :obj:`baroque.bench.runner.BenchmarkResult` objects
+        memory (list, optional): the :obj:`baroque.bench.memory.MemoryResult` objects
+
+    Returns:
+        dict
+
+    """
+    return dict(baroque_version='.'.join(map(str, BAROQUE_VERSION)),
+                python=platform.python_version(),
+                implementation=platform.python_implementation(),
+                platform=platform.platform(),
+                timestamp=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                results=[result.as_dict() for result in results],
+                memory=[result.as_dict() for result in memory])
+
+
+def save(results, path, memory=()):
+    """Writes benchmark results to a JSON file.
+
+    Args:
+        results (list): the :obj:`baroque.bench.runner.BenchmarkResult` objects
+        path (str): path to the file
+        memory (list, optional): the :obj:`baroque.bench.memory.MemoryResult` objects
+
+    """
+    with open(path, 'w') as f:
+        json.dump(to_document(results, memory), f, indent=2, sort_keys=True)
+
+
+def load(path):
+    """Reads benchmark results from a JSON file written by :obj:`save()`.
+
+    Args:
+        path (str): path to the file
+
+    Returns:
+        dict
+
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare(baseline, document):
+    """Compares the throughput of two runs, benchmark by benchmark.
+
+    Args:
+        baseline (dict): the document of the reference run
+        document (dict): the document of the run to be compared
+
+    Returns:
+        `list` of (name, baseline ops/sec, ops/sec, ratio) tuples for the
+        benchmarks found in both runs: a ratio below 1 means the compared run
+        is slower
+
+    """
+    reference = {r['name']: r['ops_per_sec'] for r in baseline['results']}
+    comparison = list()
+    for result in document['results']:
+        before = reference.get(result['name'])
+        if before is None:
+            continue
+        after = result['ops_per_sec']
+        comparison.append((result['name'], before, after,
+                           after / before if before else float('inf')))
+    return comparison
@@ -0,0 +1,118 @@
+"""The benchmarks of the broker hot paths"""
+
+import copy
+from baroque.baroque import Baroque
+from baroque.defaults.config import DEFAULT_CONFIG
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType
+from baroque.entities.event import Event
+from baroque.entities.eventtype import EventType
+from baroque.entities.reactor import Reactor
+from .runner import Benchmark
+
+METRIC_PAYLOAD = dict(metric='temperature', value=56.7793,
+                      timestamp='2017-02-15T13:56:09Z')
+
+
+def _noop(event):
+    pass
+
+
+def _broker(**events_config):
+    """Gives a broker running on a copy of the default configuration, with
+    the supplied ``events`` configuration switches."""
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config['events'].update(events_config)
+    brq = Baroque()
+    brq.config = config
+    return brq
+
+
+def _events(n, eventtype=GenericEventType, payload=None):
+    """Gives distinct events, one per iteration."""
+    et = eventtype()
+    return iter([Event(et, payload=payload) for _ in range(n)])
+
+
+def event_construction(n):
+    et = MetricEventType()
+    return lambda: Event(et, payload=METRIC_PAYLOAD)
+
+
+def eventtype_validate(n):
+    et = MetricEventType()
+    event = Event(et, payload=METRIC_PAYLOAD)
+    validator = et.validator
+    return lambda: EventType.validate(event, et, validator=validator)
+
+
+def publish_with_reactors(count):
+    def setup(n):
+        brq = _broker()
+        bag = brq.on(GenericEventType)
+        for _ in range(count):
+            bag.run(Reactor(_noop))
+        events = _events(n)
+        return lambda: brq.publish(next(events))
+    return setup
+
+
+def publish_jolly(n):
+    brq = _broker()
+    for _ in range(100):
+        brq.on_any_event_run(Reactor(_noop))
+    events = _events(n)
+    return lambda: brq.publish(next(events))
+
+
+def publish_on_topic(n):
+    brq = _broker()
+    topic = brq.topics.new('bench', [GenericEventType()])
+    for _ in range(100):
+        brq.on_topic_run(topic, Reactor(_noop))
+    events = _events(n)
+    return lambda: brq.publish_on_topic(next(events), topic)
+
+
+def publish_with_conditions(n):
+    brq = _broker()
+    bag = brq.on(MetricEventType)
+    for i in range(100):
+        threshold = float(i)
+        bag.run(Reactor(_noop, condition=lambda e, t=threshold:
+                        e.payload['value'] > t and e.owner is None))
+    events = _events(n, MetricEventType, METRIC_PAYLOAD)
+    return lambda: brq.publish(next(events))
+
+
+def publish_persisted(n):
+    brq = _broker(persist=True,
+                  persistence_backend='baroque.persistence.inmemory.DictBackend')
+    brq.on(GenericEventType).run(Reactor(_noop))
+    events = _events(n)
+    return lambda: brq.publish(next(events))
+
+
+BENCHMARKS = [
+    Benchmark('event_construction', event_construction, 20000,
+              'Event construction'),
+    Benchmark('eventtype_validate', eventtype_validate, 10000,
+              'EventType.validate with a precompiled validator'),
+    Benchmark('publish_0_reactors', publish_with_reactors(0), 10000,
+              'Baroque.publish with no reactors'),
+    Benchmark('publish_1_reactor', publish_with_reactors(1), 10000,
+              'Baroque.publish with 1 typed reactor'),
+    Benchmark('publish_100_reactors', publish_with_reactors(100), 2000,
+              'Baroque.publish with 100 typed reactors'),
+    Benchmark('publish_10k_reactors', publish_with_reactors(10000), 50,
+              'Baroque.publish with 10000 typed reactors'),
+    Benchmark('publish_100_jolly_reactors', publish_jolly, 2000,
+              'Baroque.publish with 100 reactors subscribed to any event'),
+    Benchmark('publish_on_topic_100_reactors', publish_on_topic, 2000,
+              'Baroque.publish_on_topic fanning out to 100 reactors'),
+    Benchmark('publish_100_conditional_reactors', publish_with_conditions,
+              2000, 'Baroque.publish with 100 reactors having conditions'),
+    Benchmark('publish_persisted', publish_persisted, 10000,
+              'Baroque.publish persisting events on DictBackend'),
+]
+"""list: the :obj:`baroque.bench.runner.Benchmark` objects, in running
+order"""
@@ -0,0 +1,434 @@
+"""A compact binary format for events.
+
+An encoded event is a record made of:
+
+  - a flags byte
+  - the event ID, as 16 raw bytes when it is a UUID string or as a tagged
+    value otherwise
+  - the event type, as a registered numeric code or as its interned
+    ``type_id`` string
+  - the timestamp, as a 64 bits integer of nanoseconds since the epoch
+  - the priority, owner, description and tags
+  - the payload, laid out as its event type schema prescribes (see
+    :obj:`baroque.codecs.layouts.PayloadLayout`) or as a tagged value (see
+    :obj:`baroque.codecs.values`)
+
+Many records can be streamed into one buffer, each one being prefixed by its
+length. Strings are interned across the records of a stream; an empty record
+resets the interned strings and starts every stream, so that streams can be
+concatenated.
+
+"""
+
+import struct
+from baroque.codecs.layouts import PayloadLayout
+from baroque.codecs.values import INT64, StringTable, read_uvarint, \
+    read_value, unzigzag, write_uvarint, write_value, zigzag
+from baroque.entities.event import Event, EventStatus
+from baroque.entities.eventtype import EventType, class_type_id
+from baroque.exceptions.codecs import EventDecodeError
+from baroque.exceptions.eventtypes import UnregisteredEventTypeError
+from baroque.utils.importer import class_from_dotted_path
+
+_UUID_ID = 0x01
+_TYPE_CODE = 0x02
+_PUBLISHED = 0x04
+_TIMESTAMP = 0x08
+_TAGS = 0x10
+_LAYOUT = 0x20
+
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+
+class EventCodec:
+    """Encodes events into compact binary records and decodes them back.
+
+    Event types are referenced by their ``type_id`` (see
+    :obj:`baroque.entities.eventtype.EventType.type_id`), or by a numeric
+    code when they are registered with one: the codecs encoding and decoding
+    the same records must register the same codes. On decoding, only the
+    event types registered on the codec or on the supplied event types
+    registry are resolved, so that records cannot make the codec import
+    arbitrary modules; resolving any event type class by importing it from
+    its ``type_id`` must be explicitly enabled, for trusted records only.
+
+    Payload values can be ``None``, booleans, integers, floats, strings,
+    bytes, lists, tuples and dicts of them; tuples are decoded as lists.
+    When the schema of the event type requires payload fields, payloads
+    having them are written with a fixed layout: their fields then come back
+    with the required ones first.
+
+    Args:
+        layouts (bool, optional): shall payloads be written with the layouts derived from event type schemas? Laid out payloads are read anyway
+        eventtypes (:obj:`baroque.datastructures.registries.EventTypesRegistry`, optional): registry whose event type classes are resolved on decoding, in addition to the ones registered on the codec (eg. the ``eventtypes`` registry of a broker)
+        import_types (bool, optional): shall event type classes that are not registered be imported from their ``type_id`` on decoding? Only enable for trusted records
+
+    """
+
+    def __init__(self, layouts=True, eventtypes=None, import_types=False):
+        self.codes = dict()
+        self.types = dict()
+        self.use_layouts = layouts
+        self.layouts = dict()
+        self.eventtypes = eventtypes
+        self.import_types = import_types
+
+    def register(self, eventtype, code=None):
+        """Registers an event type on this codec.
+
+        Args:
+            eventtype (:obj:`baroque.entities.eventtype.EventType` instance or `type` object): the event type
+            code (int, optional): the numeric code the event type is referenced by in records
+
+        """
+        if type(eventtype) == type:
+            assert issubclass(eventtype, EventType)
+            assert eventtype is not EventType
+            type_id = class_type_id(eventtype)
+        else:
+            assert isinstance(eventtype, EventType)
+            type_id = eventtype.type_id
+        self.types[type_id] = eventtype
+        if code is not None:
+            assert isinstance(code, int) and code >= 0
+            assert self.types.get(code, eventtype) is eventtype
+            self.codes[type_id] = code
+            self.types[code] = eventtype
+
+    def eventtype_of(self, ref):
+        """Gives the event type referenced by a numeric code or a
+        ``type_id``.
+
+        Args:
+            ref (int or str): the numeric code or the ``type_id``
+
+        Returns:
+            :obj:`baroque.entities.eventtype.EventType` instance or `type` object
+
+        Raises:
+            :obj:`baroque.exceptions.eventtypes.UnregisteredEventTypeError`: when the event type is not registered and cannot be imported
+
+        """
+        eventtype = self.types.get(ref)
+        if eventtype is None:
+            if not isinstance(ref, str):
+                raise UnregisteredEventTypeError(ref)
+            if self.eventtypes is not None:
+                eventtype = self.eventtypes.with_type_id(ref)
+                if eventtype is not None:
+                    return eventtype
+            if not self.import_types or ':' in ref:
+                raise UnregisteredEventTypeError(ref)
+            try:
+                eventtype = class_from_dotted_path(ref)
+            except (ImportError, AttributeError, ValueError):
+                raise UnregisteredEventTypeError(ref)
+            if type(eventtype) != type or \
+                    not issubclass(eventtype, EventType):
+                raise UnregisteredEventTypeError(ref)
+            self.types[ref] = eventtype
+        return eventtype
+
+    def layout_of(self, eventtype):
+        """Gives the payload layout derived from the schema of an event type.
+        The outcome is cached per ``type_id``.
+
+        Args:
+            eventtype (:obj:`baroque.entities.eventtype.EventType` instance or `type` object): the event type
+
+        Returns:
+            :obj:`baroque.codecs.layouts.PayloadLayout`, ``None`` if
+            payloads of the event type are not laid out
+
+        """
+        if type(eventtype) == type:
+            type_id = class_type_id(eventtype)
+        else:
+            type_id = eventtype.type_id
+        try:
+            return self.layouts[type_id]
+        except KeyError:
+            pass
+        layout = None
+        try:
+            if type(eventtype) == type:
+                eventtype = eventtype.canonical()
+            layout = PayloadLayout.from_schema(eventtype.jsonschema)
+        except TypeError:
+            pass
+        self.layouts[type_id] = layout
+        return layout
+
+    def encode(self, event):
+        """Encodes an event into a binary record.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event
+
+        Returns:
+            bytes
+
+        Raises:
+            `TypeError`: when the event carries values that cannot be encoded
+
+        """
+        buf = bytearray()
+        self._write_event(buf, event, StringTable())
+        return bytes(buf)
+
+    def decode(self, data):
+        """Decodes an event from a binary record.
+
+        Args:
+            data (bytes-like): the record, as given by :obj:`encode()`
+
+        Returns:
+            :obj:`baroque.entities.event.Event`
+
+        Raises:
+            :obj:`baroque.exceptions.codecs.EventDecodeError`: when the data is not a valid record
+            :obj:`baroque.exceptions.eventtypes.UnregisteredEventTypeError`: when the event type cannot be found
+
+        """
+        return self._decode_record(memoryview(data), StringTable())
+
+    def encode_many(self, events):
+        """Encodes events into a stream of length-prefixed records.
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects
+
+        Returns:
+            bytes
+
+        """
+        strings = StringTable()
+        buf = bytearray(1)
+        record = bytearray()
+        for event in events:
+            del record[:]
+            self._write_event(record, event, strings)
+            write_uvarint(buf, len(record))
+            buf += record
+        return bytes(buf)
+
+    def decode_many(self, data):
+        """Decodes events from a stream of length-prefixed records, one at a
+        time.
+
+        Args:
+            data (bytes-like): the stream, as given by :obj:`encode_many()`
+
+        Yields:
+            :obj:`baroque.entities.event.Event`
+
+        Raises:
+            :obj:`baroque.exceptions.codecs.EventDecodeError`: when the data is not a valid stream
+
+        """
+        data = memoryview(data)
+        strings = StringTable()
+        pos = 0
+        end = len(data)
+        while pos < end:
+            size, pos = self._read(read_uvarint, data, pos)
+            if pos + size > end:
+                raise EventDecodeError('truncated event record')
+            if size:
+                yield self._decode_record(data[pos:pos + size], strings)
+            else:
+                strings.clear()
+            pos += size
+
+    def dump(self, events, stream):
+        """Writes events to a binary stream as length-prefixed records.
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects
+            stream (file-like): the stream, open for binary writing
+
+        Returns:
+            int: how many events were written
+
+        """
+        count = 0
+        strings = StringTable()
+        stream.write(b'\x00')
+        buf = bytearray()
+        record = bytearray()
+        for event in events:
+            del record[:]
+            self._write_event(record, event, strings)
+            del buf[:]
+            write_uvarint(buf, len(record))
+            buf += record
+            stream.write(buf)
+            count += 1
+        return count
+
+    def load(self, stream):
+        """Reads events from a binary stream of length-prefixed records, one
+        at a time.
+
+        Args:
+            stream (file-like): the stream, open for binary reading
+
+        Yields:
+            :obj:`baroque.entities.event.Event`
+
+        Raises:
+            :obj:`baroque.exceptions.codecs.EventDecodeError`: when the stream does not hold valid records
+
+        """
+        strings = StringTable()
+        while True:
+            size = 0
+            shift = 0
+            while True:
+                byte = stream.read(1)
+                if not byte:
+                    if shift:
+                        raise EventDecodeError('truncated record length')
+                    return
+                size |= (byte[0] & 0x7f) << shift
+                if byte[0] < 0x80:
+                    break
+                shift += 7
+            if not size:
+                strings.clear()
+                continue
+            record = stream.read(size)
+            if len(record) != size:
+                raise EventDecodeError('truncated event record')
+            yield self._decode_record(memoryview(record), strings)
+
+    def _decode_record(self, data, strings):
+        """Decodes a whole record"""
+        event, pos = self._read(self._read_event, data, 0, strings)
+        if pos != len(data):
+            raise EventDecodeError('trailing bytes after the event record')
+        return event
+
+    def _write_event(self, buf, event, strings):
+        """Appends the record of an event to a buffer"""
+        event_id, eventtype, owner, status, description, payload, tags, ns, \
+            priority = event.compact()
+        flags = 0
+        id_bytes = _uuid_bytes(event_id)
+        if id_bytes is not None:
+            flags |= _UUID_ID
+        type_id = event.type_id
+        code = self.codes.get(type_id)
+        if code is not None:
+            flags |= _TYPE_CODE
+        if status == EventStatus.PUBLISHED:
+            flags |= _PUBLISHED
+        if ns is not None:
+            flags |= _TIMESTAMP
+        if tags:
+            flags |= _TAGS
+        layout = None
+        if self.use_layouts:
+            layout = self.layouts.get(type_id, False)
+            if layout is False:
+                layout = self.layout_of(eventtype)
+        kinds = None
+        if layout is not None:
+            kinds = layout.kinds_of(payload)
+            if kinds is not None:
+                flags |= _LAYOUT
+        buf.append(flags)
+        if id_bytes is not None:
+            buf += id_bytes
+        else:
+            write_value(buf, event_id)
+        if code is not None:
+            write_uvarint(buf, code)
+        else:
+            strings.write(buf, type_id)
+        if ns is not None:
+            buf += INT64.pack(ns)
+        write_uvarint(buf, zigzag(priority))
+        write_value(buf, owner)
+        write_value(buf, description)
+        if tags:
+            write_uvarint(buf, len(tags))
+            for tag in tags:
+                write_value(buf, tag)
+        if kinds is not None:
+            layout.write(buf, payload, kinds, strings)
+        else:
+            write_value(buf, payload)
+
+    def _read_event(self, data, pos, strings):
+        """Reads the record of an event from a buffer"""
+        flags = data[pos]
+        pos += 1
+        if flags & _UUID_ID:
+            h = data[pos:pos + 16].hex()
+            if len(h) != 32:
+                raise IndexError('truncated event ID')
+            event_id = '-'.join((h[:8], h[8:12], h[12:16], h[16:20], h[20:]))
+            pos += 16
+        else:
+            event_id, pos = read_value(data, pos)
+        if flags & _TYPE_CODE:
+            ref, pos = read_uvarint(data, pos)
+        else:
+            ref, pos = strings.read(data, pos)
+        eventtype = self.eventtype_of(ref)
+        ns = None
+        if flags & _TIMESTAMP:
+            ns = INT64.unpack_from(data, pos)[0]
+            pos += 8
+        priority, pos = read_uvarint(data, pos)
+        owner, pos = read_value(data, pos)
+        description, pos = read_value(data, pos)
+        tags = tuple()
+        if flags & _TAGS:
+            count, pos = read_uvarint(data, pos)
+            tags = [None] * count
+            for i in range(count):
+                tags[i], pos = read_value(data, pos)
+        if flags & _LAYOUT:
+            layout = self.layout_of(eventtype)
+            if layout is None:
+                raise ValueError('no payload layout for {}'.format(ref))
+            payload, pos = layout.read(data, pos, strings)
+        else:
+            payload, pos = read_value(data, pos)
+        status = EventStatus.PUBLISHED if flags & _PUBLISHED else \
+            EventStatus.UNPUBLISHED
+        event = Event.from_compact((event_id, eventtype, owner, status,
+                                    description, payload, tags, ns,
+                                    unzigzag(priority)))
+        return event, pos
+
+    @staticmethod
+    def _read(reader, data, pos, *args):
+        """Runs a reader on a buffer, turning decoding failures into
+        :obj:`baroque.exceptions.codecs.EventDecodeError`"""
+        try:
+            return reader(data, pos, *args)
+        except (IndexError, ValueError, TypeError, AssertionError,
+                StopIteration, struct.error) as e:
+            raise EventDecodeError(e)
+
+    def __repr__(self):
+        return '<{}.{} - registered types: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            sum(1 for ref in self.types if isinstance(ref, str)))
+
+
+def _uuid_bytes(event_id):
+    """Gives the 16 raw bytes of an ID that is a canonical UUID string (lower
+    case hex digits, dash-separated), ``None`` otherwise"""
+    if type(event_id) != str or len(event_id) != 36 or \
+            event_id[8] != '-' or event_id[13] != '-' or \
+            event_id[18] != '-' or event_id[23] != '-':
+        return None
+    digits = event_id.replace('-', '')
+    if len(digits) != 32 or not _HEX_DIGITS.issuperset(digits):
+        return None
+    return bytes.fromhex(digits)
@@ -0,0 +1,231 @@
+"""Fixed record layouts for event payloads, derived from the JSON schemas of
+event types.
+
+The payload fields that a schema requires are written in a fixed order and
+without their names: numbers are packed together as 64 bits integers or
+doubles, strings are interned (see
+:obj:`baroque.codecs.values.StringTable`) and any other value is a tagged
+value. Fields that the schema allows to be of more than one type carry two
+bits telling which type they have. The payload fields not required by the
+schema (eg. a free-form ``meta`` object) follow as a generic tagged dict.
+
+"""
+
+import json
+import struct
+from baroque.codecs.values import NONE, read_uvarint, read_value, \
+    write_uvarint, write_value
+
+INT64 = 0
+"""int: layout slot kind of integers, packed as 64 bits signed integers"""
+
+DOUBLE = 1
+"""int: layout slot kind of floats, packed as 64 bits doubles"""
+
+STRING = 2
+"""int: layout slot kind of interned strings"""
+
+ANY = 3
+"""int: layout slot kind of any other value, written as a tagged value"""
+
+_KINDS_OF_JSON_TYPES = {
+    'integer': (INT64,),
+    'number': (INT64, DOUBLE),
+    'string': (STRING,)
+}
+
+_MIN_INT64 = -2 ** 63
+_MAX_INT64 = 2 ** 63 - 1
+
+_PACKING = {INT64: 'q', DOUBLE: 'd'}
+
+
+class PayloadLayout:
+    """A fixed record layout for the payloads of the events of a type.
+
+    Args:
+        fields (iterable): (name, kinds) tuples, one for each required payload field, ``kinds`` being the tuple of slot kinds the field values can be written as (see :obj:`INT64`, :obj:`DOUBLE`, :obj:`STRING`, :obj:`ANY`)
+
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple((name, tuple(kinds)) for name, kinds in fields)
+        assert self.fields
+        assert all(kinds and set(kinds) <= {INT64, DOUBLE, STRING, ANY}
+                   for _, kinds in self.fields)
+        self.names = frozenset(name for name, _ in self.fields)
+        self.structs = dict()
+
+    @classmethod
+    def from_schema(cls, jsonschema):
+        """Derives the layout of the payloads described by the JSON schema of
+        an event type: the payload fields listed as required by the schema
+        get a slot, whose kinds follow the JSON types the schema allows for
+        the field.
+
+        Args:
+            jsonschema (str): the JSON schema string
+
+        Returns:
+            :obj:`baroque.codecs.layouts.PayloadLayout`, ``None`` if the
+            schema does not require any payload field
+
+        """
+        try:
+            schema = json.loads(jsonschema)
+            payload = schema['properties']['payload']
+            required = payload['required']
+            properties = payload.get('properties', dict())
+        except (ValueError, KeyError, TypeError):
+            return None
+        if not isinstance(required, list) or not isinstance(properties, dict):
+            return None
+        fields = list()
+        for name in required:
+            if not isinstance(name, str) or name in dict(fields):
+                return None
+            fields.append((name, cls._kinds_of(properties.get(name))))
+        if not fields:
+            return None
+        return cls(fields)
+
+    @staticmethod
+    def _kinds_of(field_schema):
+        """Tells the slot kinds of the values allowed by the schema of a
+        field"""
+        json_types = field_schema.get('type') \
+            if isinstance(field_schema, dict) else None
+        if isinstance(json_types, str):
+            json_types = [json_types]
+        if not isinstance(json_types, list):
+            return (ANY,)
+        kinds = list()
+        for json_type in json_types:
+            for kind in _KINDS_OF_JSON_TYPES.get(json_type, (ANY,)):
+                if kind not in kinds:
+                    kinds.append(kind)
+        return tuple(kinds)
+
+    def _struct_of(self, kinds):
+        """Gives the struct packing the numeric slots of records having the
+        specified slot kinds, caching it"""
+        result = self.structs.get(kinds)
+        if result is None:
+            result = self.structs[kinds] = struct.Struct(
+                '<' + ''.join(_PACKING[k] for k in kinds if k in _PACKING))
+        return result
+
+    def kinds_of(self, payload):
+        """Tells the slot kinds the fields of a payload are written as.
+
+        Args:
+            payload (dict): the payload
+
+        Returns:
+            tuple, ``None`` when the payload does not fit this layout (eg. a
+            required field is missing)
+
+        """
+        if type(payload) is not dict:
+            return None
+        result = list()
+        for name, allowed in self.fields:
+            try:
+                value = payload[name]
+            except KeyError:
+                return None
+            t = type(value)
+            if t is int and _MIN_INT64 <= value <= _MAX_INT64:
+                kind = INT64
+            elif t is float:
+                kind = DOUBLE
+            elif t is str:
+                kind = STRING
+            else:
+                kind = ANY
+            if kind not in allowed:
+                if ANY not in allowed:
+                    return None
+                kind = ANY
+            result.append(kind)
+        return tuple(result)
+
+    def write(self, buf, payload, kinds, strings):
+        """Appends a payload laid out by this layout.
+
+        Args:
+            buf (bytearray): the buffer
+            payload (dict): the payload
+            kinds (tuple): the slot kinds of the payload fields, as given by :obj:`kinds_of()`
+            strings (:obj:`baroque.codecs.values.StringTable`): the interned strings
+
+        """
+        selectors = 0
+        shift = 0
+        for (_, allowed), kind in zip(self.fields, kinds):
+            if len(allowed) > 1:
+                selectors |= allowed.index(kind) << shift
+                shift += 2
+        if shift:
+            write_uvarint(buf, selectors)
+        packer = self._struct_of(kinds)
+        if packer.size:
+            buf += packer.pack(*[payload[name] for (name, _), kind
+                                 in zip(self.fields, kinds)
+                                 if kind in _PACKING])
+        for (name, _), kind in zip(self.fields, kinds):
+            if kind == STRING:
+                strings.write(buf, payload[name])
+            elif kind == ANY:
+                write_value(buf, payload[name])
+        if len(payload) > len(self.fields):
+            write_value(buf, {k: v for k, v in payload.items()
+                              if k not in self.names})
+        else:
+            buf.append(NONE)
+
+    def read(self, data, pos, strings):
+        """Reads a payload laid out by this layout.
+
+        Args:
+            data (bytes-like): the buffer
+            pos (int): the position to read at
+            strings (:obj:`baroque.codecs.values.StringTable`): the interned strings
+
+        Returns:
+            tuple: the payload and the position past it
+
+        """
+        kinds = list()
+        selectors = None
+        for _, allowed in self.fields:
+            if len(allowed) == 1:
+                kinds.append(allowed[0])
+                continue
+            if selectors is None:
+                selectors, pos = read_uvarint(data, pos)
+            kinds.append(allowed[selectors & 3])
+            selectors >>= 2
+        kinds = tuple(kinds)
+        packer = self._struct_of(kinds)
+        numbers = iter(packer.unpack_from(data, pos))
+        pos += packer.size
+        payload = dict()
+        for (name, _), kind in zip(self.fields, kinds):
+            if kind == STRING:
+                payload[name], pos = strings.read(data, pos)
+            elif kind == ANY:
+                payload[name], pos = read_value(data, pos)
+            else:
+                payload[name] = next(numbers)
+        others, pos = read_value(data, pos)
+        if others:
+            payload.update(others)
+        return payload, pos
+
+    def __repr__(self):
+        return '<{}.{} - fields: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            ', '.join(name for name, _ in self.fields))
+
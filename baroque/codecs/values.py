@@ -0,0 +1,226 @@
+"""Primitives of the binary encoding of events: varints, strings, tagged
+values and interned strings.
+
+Tagged values start with a byte telling their kind, followed by the value
+itself: integers are zigzag varints, floats are 64 bits doubles, strings and
+bytes are length-prefixed, lists and dicts are count-prefixed sequences of
+tagged values.
+
+Writers append to a `bytearray`; readers take a bytes-like object and a
+position, and give the value along with the position past it.
+
+"""
+
+import struct
+
+NONE = 0
+FALSE = 1
+TRUE = 2
+INT = 3
+FLOAT = 4
+STR = 5
+BYTES = 6
+LIST = 7
+DICT = 8
+
+INT64 = struct.Struct('<q')
+DOUBLE = struct.Struct('<d')
+
+
+def zigzag(n):
+    """Maps a signed integer to an unsigned one, small magnitudes to small
+    values"""
+    return n << 1 if n >= 0 else (-n << 1) - 1
+
+
+def unzigzag(z):
+    """Inverse of :obj:`zigzag()`"""
+    return z >> 1 if not z & 1 else -((z + 1) >> 1)
+
+
+def write_uvarint(buf, n):
+    """Appends an unsigned integer, 7 bits per byte"""
+    if n < 0x80:
+        buf.append(n)
+        return
+    while n > 0x7f:
+        buf.append((n & 0x7f) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def read_uvarint(data, pos):
+    """Reads an unsigned integer written by :obj:`write_uvarint()`"""
+    byte = data[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def write_str(buf, value):
+    """Appends a length-prefixed UTF-8 string"""
+    encoded = value.encode('utf-8')
+    write_uvarint(buf, len(encoded))
+    buf += encoded
+
+
+def read_str(data, pos):
+    """Reads a string written by :obj:`write_str()`"""
+    size, pos = read_uvarint(data, pos)
+    end = pos + size
+    if end > len(data):
+        raise IndexError('truncated string')
+    return str(data[pos:end], 'utf-8'), end
+
+
+def write_value(buf, value):
+    """Appends a tagged value
+
+    Raises:
+        `TypeError`: when the value cannot be encoded
+
+    """
+    kind = type(value)
+    if kind is str:
+        buf.append(STR)
+        write_str(buf, value)
+    elif value is None:
+        buf.append(NONE)
+    elif kind is bool:
+        buf.append(TRUE if value else FALSE)
+    elif kind is int:
+        buf.append(INT)
+        write_uvarint(buf, zigzag(value))
+    elif kind is float:
+        buf.append(FLOAT)
+        buf += DOUBLE.pack(value)
+    elif kind is dict:
+        buf.append(DICT)
+        write_uvarint(buf, len(value))
+        for k, v in value.items():
+            write_value(buf, k)
+            write_value(buf, v)
+    elif kind is list or kind is tuple:
+        buf.append(LIST)
+        write_uvarint(buf, len(value))
+        for v in value:
+            write_value(buf, v)
+    elif kind is bytes:
+        buf.append(BYTES)
+        write_uvarint(buf, len(value))
+        buf += value
+    else:
+        raise TypeError('cannot encode value of type {}'.format(
+            kind.__name__))
+
+
+def read_value(data, pos):
+    """Reads a tagged value written by :obj:`write_value()`"""
+    kind = data[pos]
+    pos += 1
+    if kind == STR:
+        return read_str(data, pos)
+    if kind == INT:
+        z, pos = read_uvarint(data, pos)
+        return unzigzag(z), pos
+    if kind == DICT:
+        count, pos = read_uvarint(data, pos)
+        result = dict()
+        for _ in range(count):
+            k, pos = read_value(data, pos)
+            result[k], pos = read_value(data, pos)
+        return result, pos
+    if kind == NONE:
+        return None, pos
+    if kind == FLOAT:
+        return DOUBLE.unpack_from(data, pos)[0], pos + 8
+    if kind == LIST:
+        count, pos = read_uvarint(data, pos)
+        result = [None] * count
+        for i in range(count):
+            result[i], pos = read_value(data, pos)
+        return result, pos
+    if kind == TRUE:
+        return True, pos
+    if kind == FALSE:
+        return False, pos
+    if kind == BYTES:
+        size, pos = read_uvarint(data, pos)
+        end = pos + size
+        if end > len(data):
+            raise IndexError('truncated bytes')
+        return bytes(data[pos:end]), end
+    raise ValueError('unknown value tag {}'.format(kind))
+
+
+class StringTable:
+    """Interns the strings of a stream of records: the first time a string
+    is written it is carried in full, afterwards it is referenced by its
+    position in the table. Writers and readers of the same stream build the
+    same table as they go, so they must process records in the same order.
+
+    """
+
+    def __init__(self):
+        self.index = dict()
+        self.strings = list()
+
+    def write(self, buf, value):
+        """Appends an interned string
+
+        Args:
+            buf (bytearray): the buffer
+            value (str): the string
+
+        """
+        i = self.index.get(value)
+        if i is not None:
+            write_uvarint(buf, (i << 1) | 1)
+            return
+        self.index[value] = len(self.index)
+        encoded = value.encode('utf-8')
+        write_uvarint(buf, len(encoded) << 1)
+        buf += encoded
+
+    def read(self, data, pos):
+        """Reads an interned string written by :obj:`write()`
+
+        Args:
+            data (bytes-like): the buffer
+            pos (int): the position to read at
+
+        Returns:
+            tuple: the string and the position past it
+
+        """
+        n, pos = read_uvarint(data, pos)
+        if n & 1:
+            return self.strings[n >> 1], pos
+        end = pos + (n >> 1)
+        if end > len(data):
+            raise IndexError('truncated string')
+        value = str(data[pos:end], 'utf-8')
+        self.strings.append(value)
+        return value, end
+
+    def clear(self):
+        """Forgets all the interned strings"""
+        self.index = dict()
+        self.strings = list()
+
+    def __len__(self):
+        return len(self.strings) or len(self.index)
+
+    def __repr__(self):
+        return '<{}.{} - strings: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            len(self))
@@ -1,13 +1,56 @@
 import collections
+import threading
 from baroque.entities.reactor import Reactor
 from baroque.entities.eventtype import EventType
 
 
 class ReactorsBag:
-    """A type-aware collection of reactors."""
+    """A type-aware collection of reactors.
 
-    def __init__(self):
-        self.reactors = list()
+    Reactors are kept in insertion order and indexed by identity, so that
+    adding, removing and looking up a reactor take constant time however
+    many reactors the bag holds. The reactor given back by :obj:`run()` is
+    the handle to unsubscribe it with (see :obj:`remove()`).
+
+    Args:
+        on_change (function, optional): callback invoked with no arguments
+            whenever reactors are added to or removed from this bag
+
+    """
+
+    def __init__(self, on_change=None):
+        self._reactors = collections.OrderedDict()
+        self._snapshot = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.on_change = on_change
+
+    @property
+    def reactors(self):
+        """The reactors in this bag, in the order they were added
+
+        Returns:
+            `tuple` of :obj:`baroque.entities.reactor.Reactor` items
+
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            # a snapshot taken while the bag changes is not kept
+            generation = self._generation
+            snapshot = tuple(self._reactors)
+            with self._lock:
+                if self._generation == generation:
+                    self._snapshot = snapshot
+        return snapshot
+
+    def _changed(self):
+        """Notifies the change callback (if any) that the contents of this bag
+        have changed."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+        if self.on_change is not None:
+            self.on_change()
 
     def run(self, reactor):
         """Adds a reactor to this bag.
@@ -15,27 +58,85 @@ class ReactorsBag:
         Args:
             reactor (:obj:`baroque.entities.reactor.Reactor`): the reactor to be added
 
+        Returns:
+            :obj:`baroque.entities.reactor.Reactor`: the reactor itself, to be
+            used as the handle for removing it from the bag
+
         Raises:
             `AssertionError`: when the supplied arg is not a :obj:`baroque.entities.reactor.Reactor` instance
 
         """
         assert isinstance(reactor, Reactor)
-        if reactor not in self.reactors:
-            self.reactors.append(reactor)
+        if reactor not in self._reactors:
+            self._reactors[reactor] = None
+            self._changed()
         return reactor
 
+    def run_many(self, reactors):
+        """Adds a collection of reactors to this bag, notifying the change
+        callback at most once.
+
+        Args:
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be added
+
+        Returns:
+            `list` of :obj:`baroque.entities.reactor.Reactor` items: the
+            reactors themselves, to be used as handles for removing them
+
+        Raises:
+            `AssertionError`: when any of the supplied items is not a :obj:`baroque.entities.reactor.Reactor` instance
+
+        """
+        reactors = list(reactors)
+        assert all(isinstance(r, Reactor) for r in reactors)
+        size = len(self._reactors)
+        self._reactors.update(
+            (r, None) for r in reactors if r not in self._reactors)
+        if len(self._reactors) != size:
+            self._changed()
+        return reactors
+
     def remove(self, reactor):
         """Removes a reactor from this bag.
 
         Args:
             reactor (:obj:`baroque.entities.reactor.Reactor`): the reactor to be removed
 
+        Raises:
+            `ValueError`: when the reactor is not in this bag
+
+        """
+        try:
+            del self._reactors[reactor]
+        except KeyError:
+            raise ValueError('reactor not in bag: {}'.format(reactor))
+        self._changed()
+
+    def remove_many(self, reactors):
+        """Removes a collection of reactors from this bag, notifying the
+        change callback at most once. Reactors that are not in this bag are
+        skipped.
+
+        Args:
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be removed
+
+        Returns:
+            int: how many reactors were removed
+
         """
-        self.reactors.remove(reactor)
+        removed = 0
+        for r in reactors:
+            if r in self._reactors:
+                del self._reactors[r]
+                removed += 1
+        if removed:
+            self._changed()
+        return removed
 
     def remove_all(self):
         """Removes all reactors from this bag."""
-        self.reactors = list()
+        self._reactors = collections.OrderedDict()
+        self._changed()
 
     def count(self):
         """Tells how many reactors are in this bag.
@@ -59,16 +160,18 @@ class ReactorsBag:
         return self.run(reactor)
 
     def __contains__(self, item):
-        return item in self.reactors
+        return item in self._reactors
 
     def __iter__(self):
-        return (r for r in self.reactors)
+        # iterating over a snapshot lets reactors subscribe and unsubscribe
+        # while the bag is being run
+        return iter(self.reactors)
 
     def __len__(self):
-        return len(self.reactors)
+        return len(self._reactors)
 
     def __repr__(self):
-        return str(self.reactors)
+        return str(list(self.reactors))
 
 
 class EventTypesBag:
@@ -106,4 +209,5 @@ class EventTypesBag:
         return (et for et in self.types)
 
     def __contains__(self, item):
-        return type(item) in self.types
+        t = item if type(item) == type else type(item)
+        return t in self.types
@@ -0,0 +1,131 @@
+import collections
+import time
+
+
+class CoalescingMode:
+    """
+    Represents how events sharing a key within a time window are coalesced:
+    only the ``last`` one is kept, or they are ``merge`` -d into the last one
+    (top-level payload fields are merged, later values winning, and tags are
+    joined)"""
+    LAST = 'last'
+    MERGE = 'merge'
+    ALL = (LAST, MERGE)
+
+
+class Coalescer:
+    """Holds events for a time window, coalescing the ones sharing a key.
+
+    The window of a key opens when the first event having that key is added
+    and closes after a fixed amount of time, whatever the events added in
+    the meantime: so events are delayed at most by the window length. As
+    the window length is fixed, windows close in the same order as they
+    open, so the earliest one is always the first held.
+
+    Note:
+        Coalescers are not thread-safe on their own.
+
+    Args:
+        window (float): length of the time window, in seconds
+        mode (str, optional): one of the :obj:`CoalescingMode` values
+        clock (function, optional): function giving the current time in
+            seconds
+
+    """
+
+    def __init__(self, window, mode=CoalescingMode.LAST, clock=time.monotonic):
+        assert window is not None and window > 0
+        assert mode in CoalescingMode.ALL
+        self.window = window
+        self.mode = mode
+        self.clock = clock
+        self.entries = collections.OrderedDict()
+
+    def add(self, key, event, context=None):
+        """Adds an event, coalescing it with the event held for the same key
+        if any.
+
+        Args:
+            key (object): the coalescing key, must be hashable
+            event (:obj:`baroque.entities.event.Event`): the event
+            context (object, optional): data to be given back along with the event
+
+        Returns:
+            ``True`` if the event opened a new window, ``False`` if it has been
+            coalesced with a held event
+
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [event, context, self.clock() + self.window]
+            return True
+        if self.mode == CoalescingMode.MERGE:
+            self._merge(entry[0], event)
+        entry[0] = event
+        entry[1] = context
+        return False
+
+    @staticmethod
+    def _merge(older, newer):
+        """Merges the content of an event into a newer one.
+
+        Args:
+            older (:obj:`baroque.entities.event.Event`): the older event
+            newer (:obj:`baroque.entities.event.Event`): the newer event, modified in place
+
+        """
+        if older.payload:
+            payload = dict(older.payload)
+            payload.update(newer.payload or dict())
+            newer.payload = payload
+        newer.tags.update(older.tags)
+
+    def next_deadline(self):
+        """Tells when the earliest window closes.
+
+        Returns:
+            float, or ``None`` if no events are held
+
+        """
+        for entry in self.entries.values():
+            return entry[2]
+        return None
+
+    def due(self):
+        """Removes and gives the events whose window is closed.
+
+        Returns:
+            `list` of ``(event, context)`` tuples
+
+        """
+        now = self.clock()
+        result = list()
+        for entry in self.entries.values():
+            if entry[2] > now:
+                break
+            result.append((entry[0], entry[1]))
+        for _ in range(len(result)):
+            self.entries.popitem(last=False)
+        return result
+
+    def drain(self):
+        """Removes and gives all the held events.
+
+        Returns:
+            `list` of ``(event, context)`` tuples
+
+        """
+        result = [(entry[0], entry[1]) for entry in self.entries.values()]
+        self.entries.clear()
+        return result
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return '<{}.{} - window: {} - mode: {} - held: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.window,
+            self.mode,
+            len(self.entries))
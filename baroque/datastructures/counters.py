@@ -7,6 +7,8 @@ class EventCounter:
     def __init__(self):
         self.events_count = 0
         self.events_count_by_type = dict()
+        self.limited_count_by_action = dict()
+        self.coalesced_count = 0
 
     def increment_counting(self, event):
         """Counts an event
@@ -17,12 +19,73 @@ class EventCounter:
         """
         assert isinstance(event, Event)
         self.events_count += 1
-        t = type(event.type)
+        t = event.type_class
         if t in self.events_count_by_type:
             self.events_count_by_type[t] += 1
         else:
             self.events_count_by_type[t] = 1
 
+    def increment_counting_many(self, events):
+        """Counts a batch of events
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects to be counted
+
+        """
+        counts = self.events_count_by_type
+        total = 0
+        for event in events:
+            assert isinstance(event, Event)
+            t = event.type_class
+            counts[t] = counts.get(t, 0) + 1
+            total += 1
+        self.events_count += total
+
+    def increment_limited(self, event, action):
+        """Counts an event that exceeded a rate limit
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be counted
+            action (str): what happened to the event, one of the :obj:`baroque.datastructures.limiters.LimitAction` values
+
+        """
+        assert isinstance(event, Event)
+        counts = self.limited_count_by_action
+        counts[action] = counts.get(action, 0) + 1
+
+    def count_limited(self, action=None):
+        """Tells how many events exceeded rate limits
+
+        Args:
+            action (str, optional): only count the events that underwent this action
+
+        Returns:
+            int
+
+        """
+        if action is None:
+            return sum(self.limited_count_by_action.values())
+        return self.limited_count_by_action.get(action, 0)
+
+    def increment_coalesced(self, event):
+        """Counts an event that has been coalesced with a newer one
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be counted
+
+        """
+        assert isinstance(event, Event)
+        self.coalesced_count += 1
+
+    def count_coalesced(self):
+        """Tells how many events have been coalesced with newer ones
+
+        Returns:
+            int
+
+        """
+        return self.coalesced_count
+
     def count_all(self):
         """Tells how many events have been counted globally
 
@@ -0,0 +1,213 @@
+import bisect
+import threading
+import weakref
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50,
+                   100, 250, 500, 1000)
+"""tuple: default upper bounds (milliseconds) of the buckets of latency
+histograms"""
+
+
+class LatencyHistogram:
+    """A histogram of latencies, counting samples into fixed buckets.
+
+    Each bucket counts the samples up to its upper bound (and above the bound
+    of the previous bucket); an extra bucket counts the samples above the
+    highest bound.
+
+    Args:
+        buckets (iterable, optional): the increasing upper bounds (milliseconds) of the buckets
+
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        assert self.bounds
+        assert all(a < b for a, b in zip(self.bounds, self.bounds[1:]))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.
+        self.max = 0.
+
+    def record(self, seconds):
+        """Counts a latency sample
+
+        Args:
+            seconds (float): the latency
+
+        """
+        ms = seconds * 1000.
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def count(self):
+        """Tells how many samples have been counted
+
+        Returns:
+            int
+
+        """
+        return sum(self.counts)
+
+    def mean(self):
+        """Gives the mean latency (milliseconds) of the samples
+
+        Returns:
+            float, ``None`` if no samples have been counted
+
+        """
+        count = self.count()
+        if not count:
+            return None
+        return self.total / count
+
+    def percentile(self, p):
+        """Gives an upper bound to the specified percentile of the samples,
+        that is the upper bound of the bucket the percentile falls into, or
+        the highest latency counted when it falls above the highest bound.
+
+        Args:
+            p (float): the percentile, between 0 and 100
+
+        Returns:
+            float (milliseconds), ``None`` if no samples have been counted
+
+        """
+        assert 0 <= p <= 100
+        count = self.count()
+        if not count:
+            return None
+        rank = p * count / 100.
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank and seen > 0:
+                return min(bound, self.max)
+        return self.max
+
+    def buckets(self):
+        """Gives the count of samples of each bucket
+
+        Returns:
+            `list` of (upper bound, count) tuples, the upper bound of the
+            last bucket being ``float('inf')``
+
+        """
+        return list(zip(self.bounds + (float('inf'),), self.counts))
+
+    def __len__(self):
+        return self.count()
+
+    def __repr__(self):
+        return '<{}.{} - samples: {} - mean: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.count(),
+            self.mean())
+
+
+class LatencyHistograms:
+    """A registry of latency histograms, one for each stage of the publication
+    pipeline and key (event type, topic or reactor) latencies are recorded
+    for. Histograms are created on first use.
+
+    Args:
+        buckets (iterable, optional): the increasing upper bounds (milliseconds) of the buckets of the histograms
+
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.histograms = dict()
+        self.weak_stages = set()
+        self.lock = threading.Lock()
+
+    def key_weakly(self, stage):
+        """Holds the histograms of a stage by weak references to their keys,
+        so that a histogram goes away along with its key (eg. a reactor)
+
+        Args:
+            stage (str): the stage name
+
+        """
+        with self.lock:
+            self.weak_stages.add(stage)
+            by_key = self.histograms.get(stage)
+            if by_key is not None:
+                self.histograms[stage] = weakref.WeakKeyDictionary(by_key)
+
+    def record(self, stage, key, seconds):
+        """Records a latency sample on the histogram of a stage and key
+
+        Args:
+            stage (str): the stage name
+            key (object): the key, eg. an event type class, a topic or a reactor
+            seconds (float): the latency
+
+        """
+        with self.lock:
+            by_key = self.histograms.get(stage)
+            if by_key is None:
+                if stage in self.weak_stages:
+                    by_key = weakref.WeakKeyDictionary()
+                else:
+                    by_key = dict()
+                self.histograms[stage] = by_key
+            histogram = by_key.get(key)
+            if histogram is None:
+                histogram = by_key[key] = LatencyHistogram(self.buckets)
+            histogram.record(seconds)
+
+    def get(self, stage, key):
+        """Gives the histogram of a stage and key
+
+        Args:
+            stage (str): the stage name
+            key (object): the key
+
+        Returns:
+            :obj:`baroque.datastructures.histograms.LatencyHistogram`, ``None``
+            if no latencies have been recorded for the stage and key
+
+        """
+        return self.histograms.get(stage, dict()).get(key)
+
+    def of(self, stage):
+        """Gives the histograms of a stage
+
+        Args:
+            stage (str): the stage name
+
+        Returns:
+            `dict` of :obj:`baroque.datastructures.histograms.LatencyHistogram` items, by key
+
+        """
+        return dict(self.histograms.get(stage, dict()))
+
+    def stages(self):
+        """Gives the names of the stages latencies have been recorded for
+
+        Returns:
+            `list` of str
+
+        """
+        return list(self.histograms)
+
+    def clear(self):
+        """Removes all histograms"""
+        with self.lock:
+            self.histograms = dict()
+
+    def __contains__(self, stage):
+        return stage in self.histograms
+
+    def __len__(self):
+        return sum(len(by_key) for by_key in self.histograms.values())
+
+    def __repr__(self):
+        return '<{}.{} - stages: {} - histograms: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            len(self.histograms),
+            len(self))
@@ -0,0 +1,222 @@
+import threading
+import time
+
+
+class LimitAction:
+    """
+    Represents what happens to events exceeding a rate limit: they are
+    ``drop`` -ped, ``delay`` -ed until the limit allows them or ``reroute``
+    -d to a dedicated topic"""
+    DROP = 'drop'
+    DELAY = 'delay'
+    REROUTE = 'reroute'
+    ALL = (DROP, DELAY, REROUTE)
+
+
+class TokenBucket:
+    """A token bucket, refilled at a constant rate up to its capacity.
+
+    Note:
+        Buckets are not thread-safe on their own.
+
+    Args:
+        rate (float): number of tokens added per second
+        burst (int, optional): capacity of the bucket, defaults to the rate
+            (at least 1 token)
+        clock (function, optional): function giving the current time in
+            seconds
+
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        assert rate is not None and rate > 0
+        self.rate = float(rate)
+        self.capacity = float(burst or max(rate, 1))
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated_at = clock()
+
+    def refill(self):
+        """Adds the tokens accrued since the last refill."""
+        now = self.clock()
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, tokens=1):
+        """Tells how long it takes for the bucket to hold enough tokens.
+
+        Args:
+            tokens (int, optional): number of needed tokens
+
+        Returns:
+            float, number of seconds (``0`` if the tokens are available)
+
+        """
+        self.refill()
+        missing = tokens - self.tokens
+        if missing <= 0:
+            return 0
+        return missing / self.rate
+
+    def consume(self, tokens=1):
+        """Takes tokens from the bucket, if available.
+
+        Args:
+            tokens (int, optional): number of tokens to be taken
+
+        Returns:
+            ``True`` if tokens have been taken, ``False`` otherwise
+
+        """
+        if self.wait_time(tokens):
+            return False
+        self.tokens -= tokens
+        return True
+
+    def __repr__(self):
+        return '<{}.{} - rate: {} - capacity: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.rate,
+            self.capacity)
+
+
+class RateLimiter:
+    """Enforces token-bucket rate limits on events by event type class, by
+    topic and by owner. An event is allowed only if all the limits that apply
+    to it allow it, in which case a token is taken from each of them.
+
+    Limits are given as ``(rate, burst)`` tuples, where rate is in events per
+    second. Owner limits keyed by ``'*'`` apply to each owner that has no
+    limit of its own, with a separate bucket per owner.
+
+    Buckets are created on first use. Whenever their number doubles (and is
+    at least ``SWEEP_THRESHOLD``), the buckets that have filled up again are
+    dropped: a full bucket is no different from a new one, so the number of
+    buckets is bounded by the owners active within the refill time of their
+    buckets, however many owners ever published.
+
+    Args:
+        eventtypes (dict, optional): limits by event type class
+        topics (dict, optional): limits by topic name
+        owners (dict, optional): limits by event owner
+        clock (function, optional): function giving the current time in
+            seconds
+
+    """
+
+    ANY_OWNER = '*'
+    """str: key of the limit applying to each owner without a limit of its own"""
+
+    SWEEP_THRESHOLD = 1024
+    """int: min number of buckets before idle ones are dropped"""
+
+    def __init__(self, eventtypes=None, topics=None, owners=None,
+                 clock=time.monotonic):
+        self.limits = dict()
+        for kind, limits in (('eventtype', eventtypes), ('topic', topics),
+                             ('owner', owners)):
+            for key, limit in (limits or dict()).items():
+                self.limits[(kind, key)] = limit
+        self.clock = clock
+        self.buckets = dict()
+        self.sweep_at = self.SWEEP_THRESHOLD
+        self.lock = threading.Lock()
+
+    def _bucket(self, kind, key):
+        """Gives the bucket enforcing the limit of a kind for a key, creating
+        it on first use.
+
+        Returns:
+            :obj:`TokenBucket`, or ``None`` if no limit applies
+
+        """
+        bucket = self.buckets.get((kind, key))
+        if bucket is None:
+            limit = self._limit(kind, key)
+            if limit is None:
+                return None
+            if len(self.buckets) >= self.sweep_at:
+                self._drop_idle_buckets()
+            rate, burst = limit
+            bucket = TokenBucket(rate, burst, clock=self.clock)
+            self.buckets[(kind, key)] = bucket
+        return bucket
+
+    def _drop_idle_buckets(self):
+        """Drops the buckets that have filled up again, then sets the number
+        of buckets the next sweep happens at."""
+        idle = list()
+        for key, bucket in self.buckets.items():
+            bucket.refill()
+            if bucket.tokens >= bucket.capacity:
+                idle.append(key)
+        for key in idle:
+            del self.buckets[key]
+        self.sweep_at = max(self.SWEEP_THRESHOLD, 2 * len(self.buckets))
+
+    def _limit(self, kind, key):
+        """Gives the limit of a kind applying to a key.
+
+        Returns:
+            a ``(rate, burst)`` tuple, or ``None`` if no limit applies
+
+        """
+        limit = self.limits.get((kind, key))
+        if limit is None and kind == 'owner' and key is not None:
+            limit = self.limits.get((kind, self.ANY_OWNER))
+        return limit
+
+    def carry_over(self, previous):
+        """Takes over the buckets of another limiter for the limits that are
+        the same on both, so that the tokens already taken still count.
+
+        Args:
+            previous (:obj:`RateLimiter`): the limiter this one replaces
+
+        """
+        with previous.lock:
+            buckets = list(previous.buckets.items())
+        with self.lock:
+            for (kind, key), bucket in buckets:
+                limit = self._limit(kind, key)
+                if limit is not None and \
+                        limit == previous._limit(kind, key):
+                    self.buckets[(kind, key)] = bucket
+
+    def acquire(self, event, topic=None):
+        """Takes a token for an event from all the limits that apply to it, if
+        all of them allow it.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event
+            topic (:obj:`baroque.entities.topic.Topic`, optional): the topic the event is published on
+
+        Returns:
+            float, ``0`` if the event is allowed, otherwise the number of
+            seconds to wait for before it may be allowed
+
+        """
+        with self.lock:
+            buckets = [self._bucket('eventtype', event.type_class),
+                       self._bucket('owner', event.owner)]
+            if topic is not None:
+                buckets.append(self._bucket('topic', topic.name))
+            buckets = [b for b in buckets if b is not None]
+            wait = max([b.wait_time() for b in buckets] or [0])
+            if wait:
+                return wait
+            for b in buckets:
+                b.tokens -= 1
+            return 0
+
+    def __len__(self):
+        return len(self.limits)
+
+    def __repr__(self):
+        return '<{}.{} - limits: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            len(self.limits))
@@ -0,0 +1,221 @@
+import collections
+import heapq
+import threading
+from baroque.exceptions.dispatch import QueueFullError, QueueClosedError
+
+
+class OverflowPolicy:
+    """
+    Represents what happens when items are put on a full queue: ``block``
+    until there is room, ``drop_newest`` (the item being put is discarded),
+    ``drop_oldest`` (the oldest item in the queue is discarded) or ``raise``
+    an exception"""
+    BLOCK = 'block'
+    DROP_NEWEST = 'drop_newest'
+    DROP_OLDEST = 'drop_oldest'
+    RAISE = 'raise'
+    ALL = (BLOCK, DROP_NEWEST, DROP_OLDEST, RAISE)
+
+
+class BoundedQueue:
+    """A thread-safe FIFO queue holding at most a fixed number of items, with
+    a configurable policy for handling overflows.
+
+    Consumers must call :obj:`task_done()` once they are over with each item
+    they got, so that :obj:`join()` can tell when all items are processed.
+
+    Args:
+        maxsize (int, optional): max number of items in the queue, if ``0``
+            or ``None`` the queue is unbounded
+        overflow (str, optional): the overflow policy, one of the
+            :obj:`OverflowPolicy` values
+
+    Raises:
+        `AssertionError`: when the overflow policy is not supported
+
+    """
+
+    def __init__(self, maxsize=0, overflow=OverflowPolicy.BLOCK):
+        assert overflow in OverflowPolicy.ALL
+        self.maxsize = maxsize or 0
+        self.overflow = overflow
+        self.items = collections.deque()
+        self.dropped = 0
+        self.unfinished = 0
+        self.closed = False
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+        self.all_done = threading.Condition(self.mutex)
+
+    def put(self, item, timeout=None):
+        """Puts an item on the queue, applying the overflow policy if the queue
+        is full.
+
+        Args:
+            item (object): the item
+            timeout (float, optional): max number of seconds to block for, when
+                the overflow policy is ``block``
+
+        Returns:
+            ``True`` if the item has been enqueued, ``False`` if it has been
+            dropped
+
+        Raises:
+            :obj:`baroque.exceptions.dispatch.QueueFullError`: when the queue is full and the overflow policy is ``raise``, or when blocking times out
+            :obj:`baroque.exceptions.dispatch.QueueClosedError`: when the queue is closed
+
+        """
+        with self.not_full:
+            if self.closed:
+                raise QueueClosedError()
+            if self.maxsize and len(self.items) >= self.maxsize:
+                if self.overflow == OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.overflow == OverflowPolicy.RAISE:
+                    raise QueueFullError()
+                if self.overflow == OverflowPolicy.DROP_OLDEST:
+                    self._discard()
+                    self.dropped += 1
+                    self._task_done()
+                else:
+                    room = self.not_full.wait_for(
+                        lambda: self.closed or
+                        len(self.items) < self.maxsize, timeout)
+                    if not room:
+                        raise QueueFullError()
+                    if self.closed:
+                        raise QueueClosedError()
+            self._push(item)
+            self.unfinished += 1
+            self.not_empty.notify()
+            return True
+
+    def get(self):
+        """Removes and gives the next item of the queue, blocking until there is
+        one or until the queue is closed.
+
+        Returns:
+            the item, or ``None`` when the queue is closed and empty
+
+        """
+        with self.not_empty:
+            while not self.items:
+                if self.closed:
+                    return None
+                self.not_empty.wait()
+            item = self._pop()
+            self.not_full.notify()
+            return item
+
+    def task_done(self):
+        """Tells the queue that an item got from it has been processed."""
+        with self.mutex:
+            self._task_done()
+
+    def join(self, timeout=None):
+        """Blocks until all the items put on the queue have been processed.
+
+        Args:
+            timeout (float, optional): max number of seconds to block for
+
+        Returns:
+            ``True`` if all items have been processed, ``False`` on timeout
+
+        """
+        with self.all_done:
+            return self.all_done.wait_for(lambda: self.unfinished == 0,
+                                          timeout)
+
+    def close(self):
+        """Closes the queue: no more items can be put on it, while the
+        items already on it can still be got."""
+        with self.mutex:
+            self.closed = True
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+
+    def _push(self, item):
+        """Stores an item in the underlying container."""
+        self.items.append(item)
+
+    def _pop(self):
+        """Removes and gives the next item from the underlying container."""
+        return self.items.popleft()
+
+    def _discard(self):
+        """Removes from the underlying container the item to be sacrificed
+        when the queue overflows under the ``drop_oldest`` policy."""
+        self._pop()
+
+    def _task_done(self):
+        """Accounts for a processed item, to be called holding the mutex."""
+        self.unfinished -= 1
+        if self.unfinished <= 0:
+            self.unfinished = 0
+            self.all_done.notify_all()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return '<{}.{} - items: {} - maxsize: {} - overflow: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            len(self.items),
+            self.maxsize or 'unbounded',
+            self.overflow)
+
+
+class PriorityQueue(BoundedQueue):
+    """A bounded queue serving items with a higher priority first.
+
+    Starvation of low-priority items is prevented through aging: each item
+    is ranked by its insertion sequence number minus its priority times the
+    aging factor, so a priority level is worth ``aging`` insertions. A
+    high-priority item overtakes the lower-priority items that were put on
+    the queue less than ``aging`` insertions per level of difference before
+    it, while items that have been waiting long
+    enough are eventually served whatever the priority of newer items.
+    Items having the same priority are served in FIFO order.
+
+    Under the ``drop_oldest`` overflow policy, the item that would be served
+    last is discarded.
+
+    Args:
+        priority (function): function giving the priority (int) of an item
+        maxsize (int, optional): max number of items in the queue, if ``0``
+            or ``None`` the queue is unbounded
+        overflow (str, optional): the overflow policy, one of the
+            :obj:`OverflowPolicy` values
+        aging (int, optional): number of insertions a priority level is worth,
+            if ``0`` priorities are strict and starvation is possible
+
+    """
+
+    def __init__(self, priority, maxsize=0, overflow=OverflowPolicy.BLOCK,
+                 aging=100):
+        BoundedQueue.__init__(self, maxsize=maxsize, overflow=overflow)
+        assert aging is not None and aging >= 0
+        self.priority = priority
+        self.aging = aging
+        self.items = list()
+        self.sequence = 0
+
+    def _push(self, item):
+        if self.aging:
+            rank = self.sequence - self.priority(item) * self.aging
+        else:
+            rank = -self.priority(item)
+        heapq.heappush(self.items, (rank, self.sequence, item))
+        self.sequence += 1
+
+    def _pop(self):
+        return heapq.heappop(self.items)[2]
+
+    def _discard(self):
+        last = max(range(len(self.items)), key=self.items.__getitem__)
+        self.items[last] = self.items[-1]
+        self.items.pop()
+        heapq.heapify(self.items)
@@ -1,15 +1,29 @@
 import collections
+import threading
 from . import bags
 from baroque.entities.event import Event
-from baroque.entities.eventtype import EventType
+from baroque.entities.eventtype import EventType, class_type_id
 from baroque.entities.reactor import Reactor
 from baroque.entities.topic import Topic
+from baroque.executors.base import ReactorsExecutor, ReactionsHandle
 
 
 class EventTypesRegistry:
-    """Interface adapter to an event bag."""
-    def __init__(self):
+    """Interface adapter to an event bag.
+
+    When supertypes are enabled, the subtypes of registered event types are
+    deemed registered as well: whether a subtype is covered is worked out
+    once from its MRO and then cached.
+
+    Args:
+        supertypes (bool, optional): shall subtypes of registered event types be deemed registered?
+
+    """
+    def __init__(self, supertypes=False):
         self.registered_types = set()
+        self.supertypes = supertypes
+        self.covered = dict()
+        self.type_ids = None
 
     def register(self, eventtype):
         """Adds an event type to this registry.
@@ -21,10 +35,11 @@ class EventTypesRegistry:
             `AssertionError`: when argument is not an :obj:`baroque.entities.eventtypes.EventType` instance or a `type` object
 
         """
-        if type(eventtype) == type:
-            eventtype = eventtype()
-        assert isinstance(eventtype, EventType)
-        self.registered_types.add(type(eventtype))
+        t = eventtype if type(eventtype) == type else type(eventtype)
+        assert issubclass(t, EventType)
+        self.registered_types.add(t)
+        self.covered = dict()
+        self.type_ids = None
 
     def count(self):
         """Tells how many event types are registered on this registry
@@ -45,19 +60,61 @@ class EventTypesRegistry:
             `AssertionError`: when argument is not an :obj:`baroque.entities.eventtypes.EventType` instance or a `type` object
 
         """
-        if type(eventtype) == type:
-            eventtype = eventtype()
-        assert isinstance(eventtype, EventType)
-        self.registered_types.discard(type(eventtype))
+        t = eventtype if type(eventtype) == type else type(eventtype)
+        assert issubclass(t, EventType)
+        self.registered_types.discard(t)
+        self.covered = dict()
+        self.type_ids = None
 
     def remove_all(self):
         """Removes all event types from this registry."""
         self.registered_types = set()
+        self.covered = dict()
+        self.type_ids = None
+
+    def with_type_id(self, type_id):
+        """Gives the registered event type class having the specified
+        ``type_id`` (see
+        :obj:`baroque.entities.eventtype.EventType.type_id`).
+
+        Args:
+            type_id (str): the ``type_id``
+
+        Returns:
+            `type` object, ``None`` if no registered class has that
+            ``type_id``
+
+        """
+        if self.type_ids is None:
+            self.type_ids = {class_type_id(t): t
+                             for t in self.registered_types
+                             if t is not EventType}
+        return self.type_ids.get(type_id)
+
+    def set_supertypes(self, enabled):
+        """Sets whether subtypes of registered event types are deemed
+        registered.
+
+        Args:
+            enabled (bool): shall subtypes be deemed registered?
+
+        """
+        self.supertypes = bool(enabled)
+        self.covered = dict()
 
     # --- magic methods ---
 
     def __contains__(self, eventtype):
-        return type(eventtype) in self.registered_types
+        t = eventtype if type(eventtype) == type else type(eventtype)
+        if t in self.registered_types:
+            return True
+        if not self.supertypes:
+            return False
+        covered = self.covered.get(t)
+        if covered is None:
+            covered = any(c in self.registered_types for c in t.__mro__)
+            self.covered[t] = covered
+        return covered
 
     def __len__(self):
         return len(self.registered_types)
@@ -76,12 +133,32 @@ class ReactorsRegistry:
     
     Some reactors must be executed upon any event firing: these are stored 
     internally into a "jolly bag".
+
+    The reactors to be run upon firing of events of each type, jolly reactors
+    included, are compiled into an immutable dispatch table entry the first
+    time they are looked up: whenever a bag changes, only the entries
+    depending on it are discarded and then lazily rebuilt. Each change bumps
+    a generation counter, and an entry is only stored if no change happened
+    while it was being built, so that a lookup racing with a change never
+    stores stale reactors.
+
+    When supertypes are enabled, reactors subscribed to an event type are
+    also run upon firing of events of its subtypes: the dispatch table entry
+    of each event type class is compiled from the bags of the classes in its
+    MRO, so the hierarchy is only walked when the entry is built.
+
+    Args:
+        supertypes (bool, optional): shall reactors subscribed to an event type be run upon firing of events of its subtypes?
        
     """
-    def __init__(self):
+    def __init__(self, supertypes=False):
         self.registered_types = dict()
-        self.jolly_bag = bags.ReactorsBag()
-        self.evttypreg = EventTypesRegistry()
+        self.dispatch_table = dict()
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.jolly_bag = bags.ReactorsBag(on_change=self._invalidate_all)
+        self.supertypes = supertypes
+        self.evttypreg = EventTypesRegistry(supertypes=supertypes)
 
     def get_event_types_registry(self):
         """Gives the encapsulated event type registry
@@ -106,14 +183,16 @@ class ReactorsRegistry:
             `AssertionError`: when the supplied event type is not a :obj:`baroque.entities.eventtype.EventType` instance or a `type` object
 
         """
-        if type(eventtype) == type:
-            eventtype = eventtype()
-        assert isinstance(eventtype, EventType)
-        t = type(eventtype)
-        if t not in self.registered_types:
-            self.registered_types[t] = bags.ReactorsBag()
-        self.evttypreg.register(eventtype)
-        return self.registered_types[t]
+        t = eventtype if type(eventtype) == type else type(eventtype)
+        assert issubclass(t, EventType)
+        bag = self.registered_types.get(t)
+        if bag is None:
+            bag = bags.ReactorsBag()
+            self.registered_types[t] = bag
+        bag.on_change = lambda: self._invalidate(t)
+        self._invalidate(t)
+        self.evttypreg.register(t)
+        return bag
 
     def get_bag(self, eventtype):
         """Gives the reactors bag associated to the specified event type.
@@ -128,13 +207,95 @@ class ReactorsRegistry:
             `AssertionError`: when the supplied event type is not a :obj:`baroque.entities.eventtype.EventType` instance or a `type` object
 
         """
-        if type(eventtype) == type:
-            eventtype = eventtype()
-        t = type(eventtype)
+        t = eventtype if type(eventtype) == type else type(eventtype)
         if t in self.registered_types:
             return self.registered_types[t]
         return bags.ReactorsBag()
 
+    def set_supertypes(self, enabled):
+        """Sets whether reactors subscribed to an event type are also run upon
+        firing of events of its subtypes.
+
+        Args:
+            enabled (bool): shall reactors be run on events of subtypes?
+
+        """
+        self.supertypes = bool(enabled)
+        self.evttypreg.set_supertypes(enabled)
+        self._invalidate_all()
+
+    def get_reactors(self, eventtype):
+        """Gives the reactors to be run upon firing of events of the specified
+        type: reactors in the jolly bag come first, followed by the reactors
+        in the bag associated to the event type. When supertypes are enabled,
+        these are followed by the reactors in the bags associated to the
+        supertypes of the event type, in MRO order and each one once.
+
+        Args:
+            eventtype (:obj:`baroque.entities.eventtype.EventType` instance or `type` object): the event type
+
+        Returns:
+            `tuple` of :obj:`baroque.entities.reactor.Reactor` items
+
+        """
+        t = eventtype if type(eventtype) == type else type(eventtype)
+        reactors = self.dispatch_table.get(t)
+        if reactors is None:
+            generation = self.generation
+            reactors = tuple(self.jolly_bag)
+            if self.supertypes:
+                subscribed = collections.OrderedDict()
+                for c in t.__mro__:
+                    bag = self.registered_types.get(c)
+                    if bag is not None:
+                        for reactor in bag:
+                            subscribed[reactor] = None
+                reactors += tuple(subscribed)
+            else:
+                bag = self.registered_types.get(t)
+                if bag is not None:
+                    reactors += tuple(bag)
+            with self.lock:
+                if self.generation == generation:
+                    self.dispatch_table[t] = reactors
+        return reactors
+
+    def get_all_reactors(self):
+        """Gives all the reactors in the encapsulated bags, jolly reactors
+        first, each one once.
+
+        Returns:
+            `list` of :obj:`baroque.entities.reactor.Reactor` items
+
+        """
+        reactors = collections.OrderedDict.fromkeys(self.jolly_bag)
+        for bag in self.registered_types.values():
+            reactors.update(collections.OrderedDict.fromkeys(bag))
+        return list(reactors)
+
+    def _invalidate(self, t):
+        """Discards the dispatch table entry for the specified event type
+        and, when supertypes are enabled, the entries for its subtypes.
+
+        Args:
+            t (`type`): the event type class
+
+        """
+        with self.lock:
+            self.generation += 1
+            if self.supertypes:
+                self.dispatch_table = {
+                    k: v for k, v in self.dispatch_table.items()
+                    if t not in k.__mro__}
+            else:
+                self.dispatch_table.pop(t, None)
+
+    def _invalidate_all(self):
+        """Discards all the dispatch table entries."""
+        with self.lock:
+            self.generation += 1
+            self.dispatch_table = dict()
+
     def get_jolly_bag(self):
         """Gives the encapsulated bag that contains reactors to be executed
         upon any event firing.
@@ -171,7 +332,8 @@ class ReactorsRegistry:
     def remove_all(self):
         """Clears the contents of all the encapsulated reactor bags."""
         self.registered_types = dict()
-        self.jolly_bag = bags.ReactorsBag()
+        self.jolly_bag = bags.ReactorsBag(on_change=self._invalidate_all)
+        self._invalidate_all()
 
     # --- magic methods ---
 
@@ -186,7 +348,7 @@ class ReactorsRegistry:
 class TopicsRegistry:
     """A tracker for reactors to be executed upong event firing of events on
     specified topics: the reactors-topics relationship is stored internally 
-    using a dict"""
+    using a dict of :obj:`baroque.datastructures.bags.ReactorsBag` objects"""
     def __init__(self):
         self.topics = dict()
 
@@ -200,7 +362,7 @@ class TopicsRegistry:
         assert topic is not None
         assert isinstance(topic, Topic)
         if topic not in self.topics:
-            self.topics[topic] = list()
+            self.topics[topic] = bags.ReactorsBag()
 
     def new(self, name, eventtypes, **kwargs):
         """Creates a new topic, adds it to the registry and returns it.
@@ -324,15 +486,88 @@ class TopicsRegistry:
         assert isinstance(topic, Topic)
         assert isinstance(reactor, Reactor)
         if topic in self.topics:
-            self.topics[topic].append(reactor)
+            self.topics[topic].run(reactor)
 
-    def publish_on_topic(self, event, topic):
+    def on_topic_run_many(self, topic, reactors):
+        """Binds the specified reactors to event firing on the specified
+        topic.
+
+        Args:
+            topic (`:obj:`baroque.entities.topic.Topic`): the topic
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects
+
+        Raises:
+            `AssertionError`: when any of the supplied args is of wrong type
+
+        """
+        assert isinstance(topic, Topic)
+        reactors = list(reactors)
+        assert all(isinstance(r, Reactor) for r in reactors)
+        if topic in self.topics:
+            self.topics[topic].run_many(reactors)
+
+    def remove_from_topic(self, topic, reactors):
+        """Unbinds the specified reactors from event firing on the specified
+        topic. Reactors that are not bound to the topic are skipped.
+
+        Args:
+            topic (`:obj:`baroque.entities.topic.Topic`): the topic
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects
+
+        Returns:
+            int: how many reactors were unbound
+
+        Raises:
+            `AssertionError`: when the supplied topic is of wrong type
+
+        """
+        assert isinstance(topic, Topic)
+        if topic not in self.topics:
+            return 0
+        return self.topics[topic].remove_many(reactors)
+
+    def get_reactors(self, topic, eventtype):
+        """Gives the reactors bound to a tracked topic that must be run upon
+        publication on the topic of events of the specified type.
+
+        Args:
+            topic (`:obj:`baroque.entities.topic.Topic`): the topic
+            eventtype (:obj:`baroque.entities.eventtype.EventType`): the event type
+
+        Returns:
+            `tuple` of :obj:`baroque.entities.reactor.Reactor` items, empty if
+            the event type is not one of the topic's
+
+        """
+        if eventtype not in topic.eventtypes:
+            return tuple()
+        return self.topics[topic].reactors
+
+    def get_all_reactors(self):
+        """Gives all the reactors bound to the tracked topics, each one once.
+
+        Returns:
+            `list` of :obj:`baroque.entities.reactor.Reactor` items
+
+        """
+        reactors = collections.OrderedDict()
+        for topic_reactors in self.topics.values():
+            reactors.update(collections.OrderedDict.fromkeys(topic_reactors))
+        return list(reactors)
+
+    def publish_on_topic(self, event, topic, executor=None, propagate=True):
         """Publishes an event on a tracked topic, executing all the reactors
          bound to that topic.
     
         Args:
             event (`:obj:`baroque.entities.event.Event`): the event to be published
             topic (`:obj:`baroque.entities.topic.Topic`): the target topic
+            executor (:obj:`baroque.executors.base.ReactorsExecutor`, optional): the executor running the reactors, if not supplied reactors are run inline
+            propagate (bool, optional): shall exceptions raised by reactors be bubbled up?
+
+        Returns:
+            the :obj:`baroque.executors.base.ReactionsHandle` given by the
+            reactors executor, if any
     
         Raises:
             `AssertionError`: when any of the supplied args is of wrong type
@@ -342,12 +577,46 @@ class TopicsRegistry:
         assert isinstance(topic, Topic)
 
         # check if the eventtype of the event is registered on the topic
-        if event.type not in topic.eventtypes:
-            return
+        if event.type_class not in topic.eventtypes:
+            return None
 
         # run all reactors associated to the topic
-        for reactor in self.topics[topic]:
-            reactor.react_conditionally(event)
+        executor = executor or ReactorsExecutor()
+        return executor.execute(self.topics[topic], event, propagate=propagate)
+
+    def publish_many_on_topic(self, events, topic, executor=None,
+                              propagate=True):
+        """Publishes a batch of events on a tracked topic, executing all the
+        reactors bound to that topic on each event having one of the event
+        types of the topic.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects to be published
+            topic (`:obj:`baroque.entities.topic.Topic`): the target topic
+            executor (:obj:`baroque.executors.base.ReactorsExecutor`, optional): the executor running the reactors, if not supplied reactors are run inline
+            propagate (bool, optional): shall exceptions raised by reactors be bubbled up?
+
+        Returns:
+            a :obj:`baroque.executors.base.ReactionsHandle` merging the
+            handles given by the reactors executor, if any
+
+        Raises:
+            `AssertionError`: when any of the supplied args is of wrong type
+
+        """
+        assert isinstance(topic, Topic)
+        executor = executor or ReactorsExecutor()
+        reactors = self.topics[topic]
+        handle = None
+        for event in events:
+            assert isinstance(event, Event)
+            if event.type_class not in topic.eventtypes:
+                continue
+            result = executor.execute(reactors, event, propagate=propagate)
+            if result is not None:
+                handle = (handle or ReactionsHandle(
+                    propagate=propagate)).merge(result)
+        return handle
 
     # --- magic methods ---
 
@@ -3,6 +3,7 @@
 DEFAULT_CONFIG = {
     'eventtypes': {
         'ignore_unregistered': True,
+        'dispatch_to_supertypes': False,
         'pre_registered': [
             'baroque.defaults.eventtypes.GenericEventType',
             'baroque.defaults.eventtypes.StateTransitionEventType',
@@ -13,10 +14,42 @@ DEFAULT_CONFIG = {
     'events': {
         'validate_schema': True,
         'persist': False,
-        'persistence_backend': 'baroque.persistence.inmemory.DictBackend'
+        'persistence_backend': 'baroque.persistence.inmemory.DictBackend',
+        'middlewares': [],
+        'rate_limits': {
+            'action': 'drop',
+            'reroute_topic': None,
+            'eventtypes': {},
+            'topics': {},
+            'owners': {}
+        },
+        'coalescing': {
+            'window': 0,
+            'mode': 'last',
+            'eventtypes': {}
+        },
+        'dispatch': {
+            'mode': 'sync',
+            'queue_size': 10000,
+            'overflow': 'block',
+            'dispatchers': 1,
+            'aging': 100,
+            'lanes': 4,
+            'partition_key': 'baroque.defaults.keys.datum_pk'
+        },
+        'instrumentation': {
+            'enabled': False,
+            'buckets': None
+        }
     },
     'reactors': {
-        'propagate_exceptions': True
+        'propagate_exceptions': True,
+        'concurrency_limit': None,
+        'executor': {
+            'mode': 'inline',
+            'workers': None,
+            'process_workers': None
+        }
     },
     'topics': {
         'register_on_binding': True
@@ -1,4 +1,4 @@
-from baroque.entities.eventtype import EventType
+from baroque.entities.eventtype import EventType, EventPriority
 
 
 class GenericEventType(EventType):
@@ -8,6 +8,8 @@ class GenericEventType(EventType):
         owner (str, optional): ID of the owner of this event type.
 
     """
+    __slots__ = ()
+
     def __init__(self, owner=None):
         EventType.__init__(self,
                            '''{
@@ -27,6 +29,10 @@ class StateTransitionEventType(EventType):
         owner (str, optional): ID of the owner of this event type.
 
     """
+    __slots__ = ()
+
+    default_priority = EventPriority.HIGH
+
     def __init__(self, owner=None):
         EventType.__init__(
             self,
@@ -77,6 +83,8 @@ class DataOperationEventType(EventType):
         owner (str, optional): ID of the owner of this event type.
 
     """
+    __slots__ = ()
+
     def __init__(self, owner=None):
         EventType.__init__(
             self,
@@ -128,6 +136,8 @@ class MetricEventType(EventType):
         owner (str, optional): ID of the owner of this event type.
 
     """
+    __slots__ = ()
+
     def __init__(self, owner=None):
         EventType.__init__(
             self,
@@ -0,0 +1,46 @@
+"""Functions extracting partition keys from events, to be used with
+key-partitioned dispatch: events having the same key are published in order.
+Functions give ``None`` when events carry no key."""
+
+
+def datum_pk(event):
+    """Gives the primary key of the datum that a data operation event is
+    about (see :obj:`baroque.defaults.eventtypes.DataOperationEventType`).
+
+    Args:
+        event (:obj:`baroque.entities.event.Event`): the event
+
+    Returns:
+        the primary key, or ``None``
+
+    """
+    try:
+        return event.payload['datum']['pk']
+    except (KeyError, TypeError):
+        return None
+
+
+def owner(event):
+    """Gives the owner of an event.
+
+    Args:
+        event (:obj:`baroque.entities.event.Event`): the event
+
+    Returns:
+        the owner, or ``None``
+
+    """
+    return event.owner
+
+
+def eventtype(event):
+    """Gives the name of the class of the type of an event.
+
+    Args:
+        event (:obj:`baroque.entities.event.Event`): the event
+
+    Returns:
+        str
+
+    """
+    return event.type_class.__name__
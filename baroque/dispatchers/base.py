@@ -0,0 +1,44 @@
+class Dispatcher:
+    """Dispatches publications synchronously, in the thread publishing the
+    events."""
+
+    def dispatch(self, function, *args):
+        """Carries out a publication.
+
+        Args:
+            function (function): the function carrying out the publication
+            *args: positional arguments for the function
+
+        Returns:
+            the outcome of the function
+
+        """
+        return function(*args)
+
+    def flush(self, timeout=None):
+        """Waits for all pending publications to be carried out.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for
+
+        Returns:
+            ``True`` if there are no pending publications, ``False`` on timeout
+
+        """
+        return True
+
+    def close(self, timeout=None):
+        """Stops accepting publications, then waits for the pending ones to be
+        carried out.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for
+
+        Returns:
+            ``True`` if there are no pending publications, ``False`` on timeout
+
+        """
+        return True
+
+    def __repr__(self):
+        return '<{}.{}>'.format(__name__, self.__class__.__name__)
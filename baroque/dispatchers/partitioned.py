@@ -0,0 +1,155 @@
+import collections
+import itertools
+from baroque.datastructures.queues import OverflowPolicy
+from baroque.entities.event import Event
+from .base import Dispatcher
+from .queued import QueuedDispatcher
+
+
+class PartitionedDispatcher(Dispatcher):
+    """Dispatches publications asynchronously on a number of lanes, each one
+    served by a single dispatcher thread.
+
+    A key is extracted from each published event and hashed to one of the
+    lanes: events having the same key are published in order, while events
+    having different keys are published in parallel. Events having no key
+    are spread on lanes in turn. A batch of events is split into one
+    sub-batch per lane, preserving the order of events within the batch.
+
+    Args:
+        key (function): function extracting the key of an event, giving
+            ``None`` when the event has no key
+        lanes (int, optional): number of lanes
+        queue_size (int, optional): max number of pending publications per
+            lane, if ``0`` or ``None`` lanes are unbounded
+        overflow (str, optional): what to do when a lane is full, one of the
+            :obj:`baroque.datastructures.queues.OverflowPolicy` values
+        propagate (bool, optional): shall exceptions be re-raised when
+            flushing or closing the dispatcher?
+
+    """
+
+    def __init__(self, key, lanes=4, queue_size=None,
+                 overflow=OverflowPolicy.BLOCK, propagate=True):
+        assert callable(key)
+        assert lanes is not None and lanes > 0
+        self.key = key
+        self.lanes = [QueuedDispatcher(queue_size=queue_size,
+                                       overflow=overflow,
+                                       dispatchers=1,
+                                       propagate=propagate)
+                      for _ in range(lanes)]
+        self._turns = itertools.count()
+
+    @property
+    def dropped(self):
+        """int: number of publications dropped so far because of overflows"""
+        return sum(lane.dropped for lane in self.lanes)
+
+    def lane_of(self, event):
+        """Tells which lane the publication of an event is dispatched on.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event
+
+        Returns:
+            int
+
+        """
+        key = self.key(event)
+        if key is None:
+            return next(self._turns) % len(self.lanes)
+        return hash(key) % len(self.lanes)
+
+    def dispatch(self, function, *args):
+        """Enqueues a publication on the lane of the published event, or splits
+        a batch publication on the lanes of the published events.
+
+        Args:
+            function (function): the function carrying out the publication
+            *args: positional arguments for the function, the first one being
+                the event or the list of events to be published
+
+        Returns:
+            ``None``
+
+        Raises:
+            :obj:`baroque.exceptions.dispatch.QueueFullError`: when a lane is full and the overflow policy is ``raise``
+            :obj:`baroque.exceptions.dispatch.QueueClosedError`: when the dispatcher is closed
+
+        """
+        published, others = args[0], args[1:]
+        if isinstance(published, Event):
+            self.lanes[self.lane_of(published)].dispatch(function, *args)
+            return None
+        batches = collections.OrderedDict()
+        for event in published:
+            batches.setdefault(self.lane_of(event), list()).append(event)
+        for lane, batch in batches.items():
+            self.lanes[lane].dispatch(function, batch, *others)
+        return None
+
+    def flush(self, timeout=None):
+        """Waits for all pending publications on all lanes to be carried out.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for
+                each lane
+
+        Returns:
+            ``True`` if there are no pending publications, ``False`` on timeout
+
+        Raises:
+            the first exception collected since the last flush, if
+            exceptions propagation is configured
+
+        """
+        return self._on_lanes(lambda lane: lane.flush(timeout))
+
+    def close(self, timeout=None):
+        """Stops accepting publications, then waits for the pending ones on all
+        lanes to be carried out and for the dispatcher threads to terminate.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for
+                each lane
+
+        Returns:
+            ``True`` if there are no pending publications, ``False`` on timeout
+
+        Raises:
+            the first exception collected since the last flush, if
+            exceptions propagation is configured
+
+        """
+        return self._on_lanes(lambda lane: lane.close(timeout))
+
+    def _on_lanes(self, action):
+        """Applies an action to all lanes, then re-raises the first exception
+        raised by the action, if any.
+
+        Args:
+            action (function): the action, taking a lane and giving a bool
+
+        Returns:
+            ``True`` if the action gave ``True`` on all lanes
+
+        """
+        done = True
+        error = None
+        for lane in self.lanes:
+            try:
+                done = action(lane) and done
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        return done
+
+    def __repr__(self):
+        return '<{}.{} - lanes: {} - dropped: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            len(self.lanes),
+            self.dropped)
@@ -0,0 +1,64 @@
+from baroque.datastructures.queues import PriorityQueue, OverflowPolicy
+from baroque.entities.event import Event
+from baroque.entities.eventtype import EventPriority
+from .queued import QueuedDispatcher
+
+
+class PriorityDispatcher(QueuedDispatcher):
+    """Dispatches publications asynchronously, serving the ones of events
+    having a higher priority first (see
+    :obj:`baroque.entities.event.Event.priority`).
+
+    Pending publications are ranked with aging (see
+    :obj:`baroque.datastructures.queues.PriorityQueue`), so that a backlog of
+    low-priority events cannot delay high-priority ones for long, while
+    low-priority events are not starved by a steady flow of high-priority
+    ones. A batch of events is ranked by the highest priority among them.
+
+    Args:
+        queue_size (int, optional): max number of pending publications, if
+            ``0`` or ``None`` the queue is unbounded
+        overflow (str, optional): what to do when the queue is full, one of
+            the :obj:`baroque.datastructures.queues.OverflowPolicy` values
+        dispatchers (int, optional): number of dispatcher threads
+        propagate (bool, optional): shall exceptions be re-raised when
+            flushing or closing the dispatcher?
+        aging (int, optional): number of publications a priority level is
+            worth, if ``0`` priorities are strict
+
+    """
+
+    def __init__(self, queue_size=None, overflow=OverflowPolicy.BLOCK,
+                 dispatchers=1, propagate=True, aging=100):
+        self.aging = aging
+        QueuedDispatcher.__init__(self, queue_size=queue_size,
+                                  overflow=overflow, dispatchers=dispatchers,
+                                  propagate=propagate)
+
+    def _new_queue(self, queue_size, overflow):
+        """Creates the priority queue holding pending publications.
+
+        Returns:
+            :obj:`baroque.datastructures.queues.PriorityQueue`
+
+        """
+        return PriorityQueue(self._priority, maxsize=queue_size,
+                             overflow=overflow, aging=self.aging)
+
+    @staticmethod
+    def _priority(job):
+        """Gives the priority of a publication, that is the priority of the
+        published event or the highest priority in the published batch.
+
+        Args:
+            job (tuple): the function carrying out the publication and its args
+
+        Returns:
+            int
+
+        """
+        published = job[1][0]
+        if isinstance(published, Event):
+            return published.priority
+        return max((event.priority for event in published),
+                   default=EventPriority.NORMAL)
@@ -0,0 +1,159 @@
+import collections
+import threading
+from baroque.datastructures.queues import BoundedQueue, OverflowPolicy
+from baroque.executors.base import ReactionsHandle
+from .base import Dispatcher
+
+
+class QueuedDispatcher(Dispatcher):
+    """Dispatches publications asynchronously: publications are put on a
+    bounded in-process queue and carried out by background dispatcher
+    threads, so that the threads publishing the events do not wait for
+    validation, reactors execution and persistence.
+
+    Exceptions raised while carrying out publications cannot reach the
+    publishing threads: they are collected and re-raised by :obj:`flush()`
+    and :obj:`close()`, if exceptions propagation is configured.
+
+    Args:
+        queue_size (int, optional): max number of pending publications, if
+            ``0`` or ``None`` the queue is unbounded
+        overflow (str, optional): what to do when the queue is full, one of
+            the :obj:`baroque.datastructures.queues.OverflowPolicy` values
+        dispatchers (int, optional): number of dispatcher threads
+        propagate (bool, optional): shall exceptions be re-raised when
+            flushing or closing the dispatcher?
+
+    """
+
+    MAX_COLLECTED_ERRORS = 100
+    """int: max number of exceptions kept for later re-raising"""
+
+    def __init__(self, queue_size=None, overflow=OverflowPolicy.BLOCK,
+                 dispatchers=1, propagate=True):
+        self.queue = self._new_queue(queue_size, overflow)
+        self.propagate = propagate
+        self.errors = collections.deque(maxlen=self.MAX_COLLECTED_ERRORS)
+        self.threads = list()
+        for i in range(dispatchers or 1):
+            t = threading.Thread(target=self._run,
+                                 name='baroque-dispatcher-{}'.format(i))
+            t.daemon = True
+            t.start()
+            self.threads.append(t)
+
+    def _new_queue(self, queue_size, overflow):
+        """Creates the queue holding pending publications.
+
+        Returns:
+            :obj:`baroque.datastructures.queues.BoundedQueue`
+
+        """
+        return BoundedQueue(maxsize=queue_size, overflow=overflow)
+
+    @property
+    def dropped(self):
+        """int: number of publications dropped so far because of overflows"""
+        return self.queue.dropped
+
+    def dispatch(self, function, *args):
+        """Enqueues a publication, applying the overflow policy if the queue is
+        full.
+
+        Args:
+            function (function): the function carrying out the publication
+            *args: positional arguments for the function
+
+        Returns:
+            ``None``
+
+        Raises:
+            :obj:`baroque.exceptions.dispatch.QueueFullError`: when the queue is full and the overflow policy is ``raise``
+            :obj:`baroque.exceptions.dispatch.QueueClosedError`: when the dispatcher is closed
+
+        """
+        self.queue.put((function, args))
+        return None
+
+    def flush(self, timeout=None):
+        """Waits for all pending publications to be carried out.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for
+
+        Returns:
+            ``True`` if there are no pending publications, ``False`` on timeout
+
+        Raises:
+            the first exception collected since the last flush, if
+            exceptions propagation is configured
+
+        """
+        done = self.queue.join(timeout)
+        self._raise_collected_errors()
+        return done
+
+    def close(self, timeout=None):
+        """Stops accepting publications, then waits for the pending ones to be
+        carried out and for the dispatcher threads to terminate.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for
+
+        Returns:
+            ``True`` if there are no pending publications, ``False`` on timeout
+
+        Raises:
+            the first exception collected since the last flush, if
+            exceptions propagation is configured
+
+        """
+        self.queue.close()
+        for t in self.threads:
+            t.join(timeout)
+        self._raise_collected_errors()
+        return len(self.queue) == 0
+
+    def _run(self):
+        """Dispatcher threads loop: carries out publications until the queue is
+        closed and drained."""
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            self._process(job)
+
+    def _process(self, job):
+        """Carries out a publication, collecting any exception it raises.
+
+        Args:
+            job (tuple): the function carrying out the publication and its args
+
+        """
+        function, args = job
+        try:
+            handle = function(*args)
+            if isinstance(handle, ReactionsHandle):
+                handle.wait()
+        except Exception as e:
+            self.errors.append(e)
+        finally:
+            self.queue.task_done()
+
+    def _raise_collected_errors(self):
+        """Re-raises the first collected exception (if exceptions propagation
+        is configured), then forgets all collected exceptions."""
+        if not self.errors:
+            return
+        error = self.errors[0]
+        self.errors.clear()
+        if self.propagate:
+            raise error
+
+    def __repr__(self):
+        return '<{}.{} - dispatchers: {} - pending: {} - dropped: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            len(self.threads),
+            len(self.queue),
+            self.dropped)
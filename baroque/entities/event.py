@@ -1,10 +1,51 @@
 import uuid
 import hashlib
-from json import dumps
-from .eventtype import EventType
+from .eventtype import EventType, EventPriority, EVENT_FIELDS, class_type_id
+from baroque.utils import serializers
 from baroque.utils import timestamp as ts
 
 
+class _Pending:
+    """Marks the event fields that are not materialized yet. Pickling and
+    copying keep the marker as it is."""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_PENDING'
+
+    def __repr__(self):
+        return '<pending>'
+
+
+_PENDING = _Pending()
+
+
+class _IdCell:
+    """Holds the ID of an event that is not generated yet, on behalf of the
+    event and of the reactors that reacted on it: the ID is generated once,
+    when first read through any of them."""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = None
+
+    def get(self):
+        if self.value is None:
+            self.value = str(uuid.uuid4())
+        return self.value
+
+
+def _resolve_id(handle):
+    """Gives the event ID a handle stands for (see
+    :obj:`baroque.entities.event.Event._id_handle()`), generating it if
+    needed."""
+    if type(handle) is _IdCell:
+        return handle.get()
+    return handle
+
+
 class EventStatus:
     """
     Represents the binary state of events publication: ``published`` or
@@ -16,54 +57,286 @@ class EventStatus:
 class Event:
     """An event that can be published.
 
+    The unique ID, the type instance (when the type is given as a class), the
+    tags set and the timestamp of the event are only materialized when they
+    are first read: events that are just published and dropped never pay for
+    them. The class of the type is available straight away as ``type_class``,
+    and the creation time as integer nanoseconds since the epoch as
+    ``timestamp_ns``.
+
+    The JSON representation of the fields other than the payload and the
+    tags is cached until any of them is set. The payload and the tags can be
+    changed in place, also through references held elsewhere, so they are
+    dumped anew each time.
+
     Args:
         eventtype (:obj:`baroque.entities.eventtype.EventType` instance or `type` object): the type of the event
         payload (dict, optional): the content of this event
         description (str, optional): the description of this event
         owner (str, optional): the owner of this event
+        priority (int, optional): the dispatch priority of this event,
+            defaults to the priority of its type (see
+            :obj:`baroque.entities.eventtype.EventPriority`)
 
     """
-    def __init__(self, eventtype, payload=None, description=None, owner=None):
+
+    __slots__ = ('_id', '_type', 'type_class', '_owner', '_status',
+                 '_description', '_payload', '_tags', '_timestamp', '_ns',
+                 'priority', '_json')
+
+    def __init__(self, eventtype, payload=None, description=None, owner=None,
+                 priority=None):
         assert eventtype is not None
         if type(eventtype) == type:
-            eventtype = eventtype()
-        assert isinstance(eventtype, EventType)
+            assert issubclass(eventtype, EventType)
+            if not _instantiable(eventtype):
+                eventtype = eventtype()
+        else:
+            assert isinstance(eventtype, EventType)
         if payload is not None:
             assert isinstance(payload, dict)
-        self.id = str(uuid.uuid4())
-        self.type = eventtype
-        self.owner = owner
-        self.status = EventStatus.UNPUBLISHED
-        self.description = description
-        self.payload = payload
-        self.tags = set()
-        self.timestamp = None
-        self.touch()
+        if priority is None:
+            priority = eventtype.priority if type(eventtype) != type else \
+                eventtype.default_priority
+        assert isinstance(priority, int)
+        self._id = _PENDING
+        self._type = eventtype
+        self.type_class = eventtype if type(eventtype) == type else \
+            type(eventtype)
+        self._owner = owner
+        self._status = EventStatus.UNPUBLISHED
+        self._description = description
+        self._payload = payload
+        self._tags = None
+        self._timestamp = None
+        self._ns = ts.now_ns()
+        self.priority = priority
+        self._json = None
+
+    @property
+    def id(self):
+        """str: the unique ID of this event, generated on first read"""
+        _id = self._id
+        if _id is _PENDING:
+            _id = self._id = str(uuid.uuid4())
+        elif type(_id) is _IdCell:
+            _id = self._id = _id.get()
+        return _id
+
+    def _id_handle(self):
+        """Gives a cheap handle on the ID of this event, not generating the ID
+        nor keeping the event alive: the ID itself if it is generated already,
+        otherwise a cell the ID is generated into when first read (see
+        :obj:`baroque.entities.event._resolve_id()`)."""
+        _id = self._id
+        if _id is _PENDING:
+            _id = self._id = _IdCell()
+        return _id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+        self._json = None
+
+    @property
+    def type(self):
+        """:obj:`baroque.entities.eventtype.EventType`: the type of this event,
+        that is the canonical instance of the type class (see
+        :obj:`baroque.entities.eventtype.EventType.canonical()`) when the
+        event was created with a type class"""
+        if type(self._type) == type:
+            self._type = self._type.canonical()
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._type = value
+        self.type_class = type(value)
+        self._json = None
+
+    @property
+    def type_id(self):
+        """str: the stable identifier of the type of this event (see
+        :obj:`baroque.entities.eventtype.EventType.type_id`), given without
+        instantiating the type"""
+        if self.type_class is EventType:
+            return self._type.type_id
+        return class_type_id(self.type_class)
+
+    @property
+    def owner(self):
+        """str: the owner of this event"""
+        return self._owner
+
+    @owner.setter
+    def owner(self, value):
+        self._owner = value
+        self._json = None
+
+    @property
+    def status(self):
+        """str: the publication status of this event (see
+        :obj:`baroque.entities.event.EventStatus`)"""
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = value
+        self._json = None
+
+    @property
+    def description(self):
+        """str: the description of this event"""
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        self._description = value
+        self._json = None
+
+    @property
+    def payload(self):
+        """dict: the content of this event"""
+        return self._payload
+
+    @payload.setter
+    def payload(self, value):
+        self._payload = value
+        self._json = None
+
+    @property
+    def tags(self):
+        """set: the tags of this event, allocated on first read"""
+        if self._tags is None:
+            self._tags = set()
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        self._tags = value
+        self._json = None
+
+    @property
+    def timestamp(self):
+        """:obj:`datetime.datetime`: the timestamp of this event, built on
+        first read from ``timestamp_ns``"""
+        if self._timestamp is None and self._ns is not None:
+            self._timestamp = ts.from_ns(self._ns)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = value
+        self._ns = None if value is None else ts.to_ns(value)
+        self._json = None
+
+    @property
+    def timestamp_ns(self):
+        """int: the timestamp of this event, as integer nanoseconds since the
+        epoch"""
+        return self._ns
+
+    @timestamp_ns.setter
+    def timestamp_ns(self, value):
+        self._timestamp = None
+        self._ns = value
+        self._json = None
 
     def set_published(self):
         """Sets the status of this event to published."""
-        self.status = EventStatus.PUBLISHED
+        self._status = EventStatus.PUBLISHED
+        self._json = None
 
     def set_unpublished(self):
         """Sets the status of this event to unpublished."""
-        self.status = EventStatus.UNPUBLISHED
+        self._status = EventStatus.UNPUBLISHED
+        self._json = None
 
     def touch(self):
         """Sets the current time as timestamp of this event"""
-        self.timestamp = ts.utc_now()
+        self._timestamp = None
+        self._ns = ts.now_ns()
+        self._json = None
+
+    def as_dict(self, fields=EVENT_FIELDS):
+        """Gives a dict view of this object, holding the same values as its
+        JSON representation but built straight from the object attributes.
+
+        Args:
+            fields (collection, optional): names of the fields to be included
+            in the view, defaults to all fields
+
+        Returns:
+            dict
+
+        """
+        return {f: _FIELD_VIEWS[f](self) for f in fields}
 
     def json(self):
-        """Dumps this object to a JSON string.
+        """Dumps this object to a JSON string, using the current serializer
+        (see :obj:`baroque.utils.serializers.use_serializer()`). The event
+        type is referenced by its ``type_id``.
+
+        All the fields but the payload and the tags are dumped once and
+        cached until any of them is set.
 
         Returns:
             str
 
         """
-        data = dict(id=self.id, type=self.type.json(),
-                    owner=self.owner, status=self.status,
-                    description=self.description, payload=self.payload,
-                    tags=list(self.tags), timestamp=ts.stringify(self.timestamp))
-        return dumps(data)
+        if self._json is None:
+            # drop the closing brace, the mutable fields are appended
+            self._json = serializers.dumps(self.as_dict(_CACHED_FIELDS))[:-1]
+        return '{},"payload":{},"tags":{}}}'.format(
+            self._json,
+            serializers.dumps(self._payload),
+            serializers.dumps(_FIELD_VIEWS['tags'](self)))
+
+    def compact(self):
+        """Gives a compact and picklable form of this object, suitable to be
+        shipped to other processes.
+
+        The event type is referenced by its class, so that its JSON schema is
+        not carried along; event types that cannot be instantiated without
+        arguments are carried as they are.
+
+        Returns:
+            tuple
+
+        """
+        eventtype = self.type_class
+        if not _instantiable(eventtype):
+            eventtype = self.type
+        tags = tuple(self._tags) if self._tags else tuple()
+        return (self.id, eventtype, self._owner, self._status,
+                self._description, self._payload, tags, self._ns,
+                self.priority)
+
+    @classmethod
+    def from_compact(cls, data):
+        """Rebuilds an event from its compact form.
+
+        Note:
+            when the event type is referenced by its class, the rebuilt event
+            has a new instance of that class as its type
+
+        Args:
+            data (tuple): the compact form, as given by :obj:`compact()`
+
+        Returns:
+            :obj:`baroque.entities.event.Event`
+
+        """
+        event_id, eventtype, owner, status, description, payload, tags, \
+            timestamp_ns, priority = data
+        event = cls(eventtype, payload=payload, description=description,
+                    owner=owner, priority=priority)
+        event._id = event_id
+        event._status = status
+        if tags:
+            event._tags = set(tags)
+        event._ns = timestamp_ns
+        return event
 
     def md5(self):
         """Returns the MD5 hash of this object.
@@ -80,7 +353,47 @@ class Event:
         return '<{}.{} - type: {} - id: {}>'.format(
             __name__,
             self.__class__.__name__,
-            self.type.__class__.__name__,
+            self.type_class.__name__,
             self.id
         )
 
+
+_INSTANTIABLE_EVENTTYPES = dict()
+
+
+def _instantiable(eventtype_class):
+    """Tells whether an event type class can be instantiated without
+    arguments, that is whether it has a canonical instance. The outcome is
+    cached per class.
+
+    Args:
+        eventtype_class (`type`): the event type class
+
+    Returns:
+        bool
+
+    """
+    result = _INSTANTIABLE_EVENTTYPES.get(eventtype_class)
+    if result is None:
+        try:
+            eventtype_class.canonical()
+            result = True
+        except TypeError:
+            result = False
+        _INSTANTIABLE_EVENTTYPES[eventtype_class] = result
+    return result
+
+
+_FIELD_VIEWS = {
+    'id': lambda evt: evt.id,
+    'type': lambda evt: evt.type_id,
+    'owner': lambda evt: evt._owner,
+    'status': lambda evt: evt._status,
+    'description': lambda evt: evt._description,
+    'payload': lambda evt: evt._payload,
+    'tags': lambda evt: list(evt._tags) if evt._tags else list(),
+    'timestamp': lambda evt: ts.stringify_ns(evt._ns)
+    if evt._ns is not None else ts.stringify(evt.timestamp)
+}
+
+_CACHED_FIELDS = tuple(f for f in EVENT_FIELDS if f not in ('payload', 'tags'))
@@ -1,36 +1,239 @@
 import hashlib
 from json import dumps, loads
-from jsonschema import ValidationError
-from jsonschema import validate as check
+from jsonschema.validators import validator_for
+from baroque.utils import serializers
+
+EVENT_FIELDS = ('id', 'type', 'owner', 'status', 'description', 'payload',
+                'tags', 'timestamp')
+"""tuple: names of the fields of the JSON representation of events"""
+
+PLAIN_SCHEMA_KEYWORDS = frozenset(['$schema', 'id', '$id', 'title',
+                                   'description', '$comment', 'default',
+                                   'examples', 'definitions', 'type',
+                                   'properties', 'required'])
+"""frozenset: top-level JSON schema keywords that only constrain the
+properties the schema explicitly names"""
+
+
+class EventPriority:
+    """
+    Represents how urgently events must be dispatched: events having a higher
+    priority are served first by priority-aware dispatchers"""
+    LOW = -10
+    NORMAL = 0
+    HIGH = 10
+
+
+class SchemaValidator:
+    """A compiled JSON schema, reusable to validate any number of events.
+
+    Events are validated against a dict view carrying only the event fields
+    that the schema actually covers; when the schema uses keywords that
+    constrain the event as a whole (eg. ``additionalProperties``), the view
+    carries all the event fields.
+
+    Views made of JSON types only are validated as they are. Other views are
+    validated as they read once dumped to JSON and loaded back, so that eg.
+    tuples are validated as arrays and non-string dict keys as strings, and
+    values that cannot be dumped to JSON (eg. datetimes) raise `TypeError`.
+
+    Args:
+        jsonschema (str): the JSON schema string
+
+    Raises:
+        `jsonschema.SchemaError`: when the schema itself is invalid
+
+    """
+
+    def __init__(self, jsonschema):
+        schema = loads(jsonschema)
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        self.jsonschema = jsonschema
+        self.schema = schema
+        self.validator = validator_class(schema)
+        self.fields = self._covered_fields(schema)
+
+    @staticmethod
+    def _covered_fields(schema):
+        """Tells which event fields are covered by a JSON schema.
+
+        Args:
+            schema (dict): the parsed JSON schema
+
+        Returns:
+            tuple of str
+
+        """
+        if not isinstance(schema, dict) or \
+                not PLAIN_SCHEMA_KEYWORDS.issuperset(schema):
+            return EVENT_FIELDS
+        named = set(schema.get('properties', dict()))
+        named.update(schema.get('required', list()))
+        return tuple(f for f in EVENT_FIELDS if f in named)
+
+    def is_valid(self, event):
+        """Validates an event against this schema.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be validated
+
+        Returns:
+            ``True`` if validation is OK, ``False`` otherwise
+
+        """
+        view = event.as_dict(self.fields)
+        if not _is_plain_json(view):
+            view = loads(dumps(view))
+        return self.validator.is_valid(view)
+
+
+def _is_plain_json(value):
+    """Tells whether a value is made of JSON types only (dicts with string
+    keys, lists, strings, numbers, booleans and ``None``), so that dumping it
+    to JSON and loading it back gives an equal value."""
+    t = type(value)
+    if t is str or t is int or t is float or t is bool or value is None:
+        return True
+    if t is dict:
+        return all(type(k) is str and _is_plain_json(v)
+                   for k, v in value.items())
+    if t is list:
+        return all(_is_plain_json(v) for v in value)
+    return False
 
 
 class EventType:
     """The type of an event, describing its semantics and content.
 
+    Events and registries handed an event type class share its canonical
+    instance (see :obj:`canonical()`). Each distinct JSON schema is parsed
+    and compiled into a validator once per process, and then shared by all
+    the event types having that schema (see :obj:`validator`).
+
     Args:
         jsonschema (str): the JSON schema string describing the content of the
          events having this type
         description (str, optional): the description of this event type
         owner (str, optional): the owner of this event type
+        priority (int, optional): the default priority of the events having
+         this type, overrides the class-level default
 
     """
 
-    def __init__(self, jsonschema, description=None, owner=None):
+    __slots__ = ('jsonschema', 'owner', 'description', '_tags', '_priority')
+
+    default_priority = EventPriority.NORMAL
+    """int: class-level default priority of the events having this type"""
+
+    def __init__(self, jsonschema, description=None, owner=None,
+                 priority=None):
         assert jsonschema is not None
         assert isinstance(jsonschema, str)
         self.jsonschema = jsonschema
         self.owner = owner
         self.description = description
-        self.tags = set()
+        self._tags = None
+        if priority is not None:
+            assert isinstance(priority, int)
+        self._priority = priority
+
+    @classmethod
+    def canonical(cls):
+        """Gives the canonical instance of this event type class, which is
+        created without arguments on first request and then shared by all
+        the events and registries that are handed the class.
+
+        Note:
+            the canonical instance is shared, so it should not be modified:
+            use an instance of your own to customize an event type
+
+        Returns:
+            :obj:`baroque.entities.eventtype.EventType`
+
+        Raises:
+            `TypeError`: when the class cannot be instantiated without arguments
+
+        """
+        result = _CANONICAL_EVENTTYPES.get(cls)
+        if result is None:
+            result = _CANONICAL_EVENTTYPES.setdefault(cls, cls())
+        return result
+
+    @property
+    def priority(self):
+        """int: the default priority of the events having this type"""
+        if self._priority is None:
+            return self.default_priority
+        return self._priority
+
+    @priority.setter
+    def priority(self, value):
+        assert value is None or isinstance(value, int)
+        self._priority = value
+
+    @property
+    def tags(self):
+        """set: the tags of this event type, allocated on first read"""
+        if self._tags is None:
+            self._tags = set()
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        self._tags = value
+
+    @property
+    def type_id(self):
+        """str: a stable identifier of this event type, by which events
+        reference their type in their JSON representation. It is the dotted
+        path of the class; instances of the plain :obj:`EventType` class,
+        which carry arbitrary schemas, get the MD5 hash of their schema
+        appended"""
+        if type(self) is EventType:
+            return schema_type_id(self.jsonschema)
+        return class_type_id(type(self))
+
+    @property
+    def validator(self):
+        """:obj:`SchemaValidator`: the compiled JSON schema of this event
+        type, shared by all the event types having the same schema"""
+        return compiled_schema(self.jsonschema)
+
+    @property
+    def schema(self):
+        """dict: the parsed JSON schema of this event type, shared by all the
+        event types having the same schema"""
+        return self.validator.schema
+
+    @staticmethod
+    def compile_schema(jsonschema):
+        """Parses and checks a JSON schema string, then builds a validator
+        for it. The validator can be reused to validate any number of events.
+
+        Args:
+            jsonschema (str): the JSON schema string
+
+        Returns:
+            :obj:`baroque.entities.eventtype.SchemaValidator`
+
+        Raises:
+            `jsonschema.SchemaError`: when the schema itself is invalid
+
+        """
+        return SchemaValidator(jsonschema)
 
     @staticmethod
-    def validate(evt, evttype):
+    def validate(evt, evttype, validator=None):
         """Validates the content of an event against the JSON schema of its type.
 
         Args:
             evt (:obj:`baroque.entities.event.Event`): the event to be validated
             evttype (:obj:`baroque.entities.eventtype.EventType`): the type of
             the event that needs to be validated
+            validator (:obj:`SchemaValidator`, optional): a precompiled
+            validator for the event type schema (see :obj:`compile_schema`).
+            If not supplied, the validator of the event type is used
 
         Returns:
             ``True`` if validation is OK, ``False`` otherwise
@@ -38,9 +241,10 @@ class EventType:
         """
         try:
             assert evt.type == evttype
-            check(loads(evt.json()), loads(evttype.jsonschema))
-            return True
-        except (AssertionError, ValidationError):
+            if validator is None:
+                validator = evttype.validator
+            return validator.is_valid(evt)
+        except AssertionError:
             return False
 
     def json(self):
@@ -51,8 +255,9 @@ class EventType:
 
         """
         data = dict(jsonschema=self.jsonschema, owner=self.owner,
-                    description=self.description, tags=list(self.tags))
-        return dumps(data)
+                    description=self.description,
+                    tags=list(self._tags) if self._tags else list())
+        return serializers.dumps(data)
 
     def md5(self):
         """Returns the MD5 hash of this object.
@@ -71,3 +276,69 @@ class EventType:
             self.__class__.__name__,
             self.description or 'None'
         )
+
+
+_CANONICAL_EVENTTYPES = dict()
+
+_COMPILED_SCHEMAS = dict()
+
+
+def compiled_schema(jsonschema):
+    """Gives the validator of a JSON schema, compiling it once per process.
+
+    Args:
+        jsonschema (str): the JSON schema string
+
+    Returns:
+        :obj:`baroque.entities.eventtype.SchemaValidator`
+
+    Raises:
+        `jsonschema.SchemaError`: when the schema itself is invalid
+
+    """
+    result = _COMPILED_SCHEMAS.get(jsonschema)
+    if result is None:
+        result = _COMPILED_SCHEMAS.setdefault(
+            jsonschema, EventType.compile_schema(jsonschema))
+    return result
+
+
+_TYPE_IDS = dict()
+
+
+def class_type_id(eventtype_class):
+    """Gives the stable identifier of the event types having the specified
+    class, that is the dotted path of the class. The outcome is cached per
+    class.
+
+    Args:
+        eventtype_class (`type`): the event type class
+
+    Returns:
+        str
+
+    """
+    result = _TYPE_IDS.get(eventtype_class)
+    if result is None:
+        result = _TYPE_IDS[eventtype_class] = '{}.{}'.format(
+            eventtype_class.__module__, eventtype_class.__qualname__)
+    return result
+
+
+def schema_type_id(jsonschema):
+    """Gives the stable identifier of a plain :obj:`EventType` having the
+    specified JSON schema. The outcome is cached per schema.
+
+    Args:
+        jsonschema (str): the JSON schema string
+
+    Returns:
+        str
+
+    """
+    result = _TYPE_IDS.get(jsonschema)
+    if result is None:
+        digest = hashlib.md5(jsonschema.encode('utf-8')).hexdigest()
+        result = _TYPE_IDS[jsonschema] = '{}:{}'.format(
+            class_type_id(EventType), digest)
+    return result
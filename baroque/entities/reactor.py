@@ -1,3 +1,6 @@
+import inspect
+import threading
+from .event import _resolve_id
 from baroque.utils import timestamp as ts
 
 
@@ -7,24 +10,38 @@ class Reactor:
     set, this is checked out and if the outcome is ``True`` then the action
     is executed. If no condition is set, then the action is always executed.
 
+    Reactors performing CPU-intensive work can be marked as CPU-bound: their
+    action is then executed on a pool of worker processes, which is fed with a
+    compact copy of the triggering event (see
+    :obj:`baroque.entities.event.Event.compact()`). In this case, the action
+    must be a picklable function (eg. a module-level function).
+
     Args:
         reaction (function): the action to be executed
         condition (function, optional): the boolean condition to be satisfied
+        cpu_bound (bool, optional): shall the action be executed on a pool of worker processes?
 
     Raises:
         `AssertionError`: when the supplied reaction is `None` or is not a callable, or (when supplied) when the condition is not a callable
 
     """
-    def __init__(self, reaction, condition=None):
+
+    __slots__ = ('reaction_function', 'condition_function', 'cpu_bound',
+                 'last_reaction_ns', '_last_event_id', 'reactions_count',
+                 'lock', '__weakref__')
+
+    def __init__(self, reaction, condition=None, cpu_bound=False):
         assert reaction is not None
         assert callable(reaction)
         self.reaction_function = reaction
         if condition is not None:
             assert callable(condition)
         self.condition_function = condition
-        self.last_reaction_timestamp = None
-        self.id_last_event_reacted = None
+        self.cpu_bound = cpu_bound
+        self.last_reaction_ns = None
+        self._last_event_id = None
         self.reactions_count = 0
+        self.lock = threading.Lock()
 
     def react(self, event):
         """Execute the action of this reactor.
@@ -39,9 +56,65 @@ class Reactor:
 
         """
         self.reaction_function(event)
-        self.reactions_count += 1
-        self.last_reaction_timestamp = ts.utc_now()
-        self.id_last_event_reacted = event.id
+        self._track_reaction(event)
+
+    async def react_async(self, event):
+        """Execute the action of this reactor, awaiting it in case the
+        reaction function is a coroutine function (or anyway returns an
+        awaitable object).
+
+        Note:
+            the condition of this reactor is out of the scope of this method
+            (please see method :obj:``react_conditionally_async()``)
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        """
+        result = self.reaction_function(event)
+        if inspect.isawaitable(result):
+            await result
+        self._track_reaction(event)
+
+    def _track_reaction(self, event):
+        """Updates the bookkeeping of this reactor after it reacted on an
+        event.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        """
+        with self.lock:
+            self.reactions_count += 1
+            self.last_reaction_ns = ts.now_ns()
+            self._last_event_id = event._id_handle()
+
+    @property
+    def id_last_event_reacted(self):
+        """str: the ID of the last event this reactor reacted on. The ID is
+        only generated when asked for, either here or through the event"""
+        return _resolve_id(self._last_event_id)
+
+    @id_last_event_reacted.setter
+    def id_last_event_reacted(self, value):
+        self._last_event_id = value
+
+    @property
+    def last_reaction_timestamp(self):
+        """:obj:`datetime.datetime`: the timestamp of the last reaction, built
+        from ``last_reaction_ns`` when asked for"""
+        if self.last_reaction_ns is None:
+            return None
+        return ts.from_ns(self.last_reaction_ns)
+
+    @last_reaction_timestamp.setter
+    def last_reaction_timestamp(self, value):
+        self.last_reaction_ns = None if value is None else ts.to_ns(value)
+
+    def flush(self):
+        """Executes the action on the events this reactor is holding, if any.
+        Plain reactors do not hold events."""
+        pass
 
     def only_if(self, condition):
         """Sets the boolean condition for this reactor.
@@ -80,6 +153,17 @@ class Reactor:
         if self._condition_met(event):
             self.react(event)
 
+    async def react_conditionally_async(self, event):
+        """Asynchronous version of :obj:``react_conditionally()``: the
+        condition is checked synchronously, then the action is awaited.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        """
+        if self._condition_met(event):
+            await self.react_async(event)
+
     def count_reactions(self):
         """Gives the number of times this reactor's action has been executed
 
@@ -97,9 +181,9 @@ class Reactor:
             str if reactor reacted at least once, ``None`` otherwise
 
         """
-        if self.last_reaction_timestamp is None:
+        if self.last_reaction_ns is None:
             return None
-        return ts.stringify(self.last_reaction_timestamp)
+        return ts.stringify_ns(self.last_reaction_ns)
 
     def last_event_reacted(self):
         """Gives the ID of the last event this reactor reacted on
@@ -110,6 +194,19 @@ class Reactor:
         """
         return self.id_last_event_reacted
 
+    def __getstate__(self):
+        state = dict()
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if name not in ('lock', '__weakref__') and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.lock = threading.Lock()
+
     def __repr__(self):
         return '<{}.{} - reaction function: {}> - ' \
                'condition function: {} - ' \
@@ -120,3 +217,178 @@ class Reactor:
                     self.condition_function or 'None',
                     self.last_reacted_on() or 'Never'
                 )
+
+
+class BatchingReactor(Reactor):
+    """A reactor whose action is executed on micro-batches of events: the
+    reaction function receives a list of events.
+
+    Events meeting the condition are held until either ``max_size`` events
+    are held, or ``max_delay_ms`` milliseconds have passed since the first
+    of them arrived, or the reactor is flushed (eg. when the broker is
+    flushed or closed). The bookkeeping is batch-aware: the reactions count
+    is the number of events delivered to the action, while the number of
+    executions of the action is given by :obj:`count_batches()`.
+
+    Exceptions raised by the action when the batch is delivered because the
+    delay expired are re-raised by the next call to :obj:`flush()`.
+
+    Note:
+        Batching reactors cannot be CPU-bound, and coroutine reaction functions
+        are only supported without a max delay.
+
+    Args:
+        reaction (function): the action to be executed, taking a list of events
+        condition (function, optional): the boolean condition to be satisfied by each event
+        max_size (int, optional): number of held events triggering the action
+        max_delay_ms (int, optional): max number of milliseconds events are held for, if ``None`` events are held until the batch is full or flushed
+
+    Raises:
+        `AssertionError`: when the supplied reaction is `None` or is not a callable, or (when supplied) when the condition is not a callable
+
+    """
+
+    __slots__ = ('max_size', 'max_delay_ms', 'batches_count', 'batch',
+                 'errors', 'timer')
+
+    def __init__(self, reaction, condition=None, max_size=100,
+                 max_delay_ms=None):
+        Reactor.__init__(self, reaction, condition=condition)
+        assert max_size is not None and max_size > 0
+        if max_delay_ms is not None:
+            assert max_delay_ms > 0
+            assert not inspect.iscoroutinefunction(reaction)
+        self.max_size = max_size
+        self.max_delay_ms = max_delay_ms
+        self.batches_count = 0
+        self.batch = list()
+        self.errors = list()
+        self.timer = None
+
+    def _hold(self, event):
+        """Holds an event, starting the delay timer on the first event of a
+        batch.
+
+        Returns:
+            the batch to be delivered if it is full, ``None`` otherwise
+
+        """
+        with self.lock:
+            self.batch.append(event)
+            if len(self.batch) >= self.max_size:
+                return self._take()
+            if self.timer is None and self.max_delay_ms is not None:
+                self.timer = threading.Timer(self.max_delay_ms / 1000.0,
+                                             self._expire)
+                self.timer.daemon = True
+                self.timer.start()
+            return None
+
+    def _take(self):
+        """Takes the held events and stops the delay timer, to be called
+        holding the lock.
+
+        Returns:
+            list
+
+        """
+        batch, self.batch = self.batch, list()
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        return batch
+
+    def react(self, event):
+        """Holds the event, then executes the action if the batch is full.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        """
+        batch = self._hold(event)
+        if batch:
+            self._deliver(batch)
+
+    async def react_async(self, event):
+        """Holds the event, then executes the action if the batch is full,
+        awaiting it in case the reaction function is a coroutine function.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        """
+        batch = self._hold(event)
+        if batch:
+            result = self.reaction_function(batch)
+            if inspect.isawaitable(result):
+                await result
+            self._track_batch(batch)
+
+    def _deliver(self, batch):
+        """Executes the action on a batch of events.
+
+        Args:
+            batch (list): the :obj:`baroque.entities.event.Event` objects
+
+        """
+        self.reaction_function(batch)
+        self._track_batch(batch)
+
+    def _expire(self):
+        """Delivers the held events when the max delay expires, collecting any
+        exception raised by the action."""
+        with self.lock:
+            self.timer = None
+            batch, self.batch = self.batch, list()
+        if batch:
+            try:
+                self._deliver(batch)
+            except Exception as e:
+                self.errors.append(e)
+
+    def _track_batch(self, batch):
+        """Updates the bookkeeping of this reactor after it reacted on a batch
+        of events.
+
+        Args:
+            batch (list): the :obj:`baroque.entities.event.Event` objects
+
+        """
+        with self.lock:
+            self.batches_count += 1
+            self.reactions_count += len(batch)
+            self.last_reaction_ns = ts.now_ns()
+            self._last_event_id = batch[-1]._id_handle()
+
+    def flush(self):
+        """Executes the action on the held events right away.
+
+        Raises:
+            the first exception raised by the action when delivering batches
+            because the max delay expired, if any
+        """
+        with self.lock:
+            batch = self._take()
+            errors, self.errors = self.errors, list()
+        if batch:
+            self._deliver(batch)
+        if errors:
+            raise errors[0]
+
+    def count_pending(self):
+        """Gives the number of events held by this reactor
+
+        Returns:
+            int
+
+        """
+        return len(self.batch)
+
+    def count_batches(self):
+        """Gives the number of times this reactor's action has been executed
+
+        Returns:
+            int
+
+        """
+        return self.batches_count
@@ -1,8 +1,8 @@
 import uuid
 import hashlib
 import collections
-from json import dumps
 from baroque.datastructures.bags import EventTypesBag
+from baroque.utils import serializers
 from baroque.utils import timestamp as ts
 
 
@@ -24,6 +24,9 @@ class Topic:
 
     """
 
+    __slots__ = ('name', 'types', 'description', 'owner', '_tags', 'id',
+                 '_timestamp', '_ns')
+
     def __init__(self, name, eventtypes, description=None, owner=None,
                  tags=None):
         assert name is not None
@@ -39,11 +42,12 @@ class Topic:
         if tags is not None:
             assert not isinstance(tags, str)
             assert isinstance(tags, collections.Iterable)
-            self.tags = set(tags)
+            self._tags = set(tags)
         else:
-            self.tags = set()
+            self._tags = None
         self.id = str(uuid.uuid4())
-        self.timestamp = None
+        self._timestamp = None
+        self._ns = None
         self.touch()
 
     @property
@@ -52,9 +56,45 @@ class Topic:
          event types of this topic"""
         return self.types
 
+    @property
+    def tags(self):
+        """set: the tags of this topic, allocated on first read"""
+        if self._tags is None:
+            self._tags = set()
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        self._tags = value
+
+    @property
+    def timestamp(self):
+        """:obj:`datetime.datetime`: the timestamp of this topic, built on first
+        read from ``timestamp_ns``"""
+        if self._timestamp is None and self._ns is not None:
+            self._timestamp = ts.from_ns(self._ns)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = value
+        self._ns = None if value is None else ts.to_ns(value)
+
+    @property
+    def timestamp_ns(self):
+        """int: the timestamp of this topic, as integer nanoseconds since the
+        epoch"""
+        return self._ns
+
+    @timestamp_ns.setter
+    def timestamp_ns(self, value):
+        self._timestamp = None
+        self._ns = value
+
     def touch(self):
         """Sets the current time as timestamp of this topic"""
-        self.timestamp = ts.utc_now()
+        self._timestamp = None
+        self._ns = ts.now_ns()
 
     def json(self):
         """Dumps this object to a JSON string.
@@ -65,8 +105,8 @@ class Topic:
         """
         data = dict(id=self.id, owner=self.owner, description=self.description,
                     eventtypes=[str(et) for et in self.types],
-                    tags=list(self.tags), timestamp=ts.stringify(self.timestamp))
-        return dumps(data)
+                    tags=list(self.tags), timestamp=ts.stringify_ns(self._ns))
+        return serializers.dumps(data)
 
     def md5(self):
         """Returns the MD5 hash of this object.
@@ -0,0 +1,3 @@
+class EventDecodeError(Exception):
+    """Raised when binary data cannot be decoded into events"""
+    pass
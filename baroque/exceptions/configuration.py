@@ -6,3 +6,8 @@ class ConfigurationNotFoundError(Exception):
 class ConfigurationParseError(Exception):
     """Raised on failures in parsing configuration data"""
     pass
+
+
+class InvalidConfigurationError(Exception):
+    """Raised when a configuration switch has an unsupported value"""
+    pass
@@ -0,0 +1,8 @@
+class QueueFullError(Exception):
+    """Raised when attempting to enqueue events on a full events queue"""
+    pass
+
+
+class QueueClosedError(Exception):
+    """Raised when attempting to enqueue events on a closed events queue"""
+    pass
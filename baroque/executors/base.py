@@ -0,0 +1,199 @@
+import asyncio
+import time
+
+
+class ReactionsHandle:
+    """A handle on the reactions triggered by a publication, aggregating the
+    futures of reactors that are run asynchronously.
+
+    Args:
+        futures (list, optional): the :obj:`concurrent.futures.Future` objects of the reactions
+        propagate (bool, optional): shall exceptions raised by reactors be
+            re-raised when waiting on this handle?
+
+    """
+
+    def __init__(self, futures=None, propagate=True):
+        self.futures = list(futures) if futures is not None else list()
+        self.propagate = propagate
+
+    def merge(self, handle):
+        """Adds to this handle the futures of another handle.
+
+        Args:
+            handle (:obj:`baroque.executors.base.ReactionsHandle`): the handle to be merged, can be ``None``
+
+        Returns:
+            :obj:`baroque.executors.base.ReactionsHandle`: this handle
+
+        """
+        if handle is not None:
+            self.futures.extend(handle.futures)
+        return self
+
+    def done(self):
+        """Tells whether all the reactions are over.
+
+        Returns:
+            bool
+
+        """
+        return all(f.done() for f in self.futures)
+
+    def wait(self, timeout=None):
+        """Waits for all the reactions to be over.
+
+        Args:
+            timeout (float, optional): max number of seconds to wait for all the reactions overall
+
+        Raises:
+            `concurrent.futures.TimeoutError`: when reactions are not over in time
+            the first exception raised by any reactor, if exceptions
+            propagation is configured
+
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for f in self.futures:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0, deadline - time.monotonic())
+            error = f.exception(timeout=remaining)
+            if error is not None and self.propagate:
+                raise error
+
+    def exceptions(self):
+        """Gives the exceptions raised by the reactions that are over.
+
+        Returns:
+            list
+
+        """
+        return [f.exception() for f in self.futures
+                if f.done() and f.exception() is not None]
+
+    def __len__(self):
+        return len(self.futures)
+
+    def __repr__(self):
+        return '<{}.{} - reactions: {} - done: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            len(self.futures),
+            self.done())
+
+
+class ReactorsExecutor:
+    """Executes reactors inline, in the thread publishing the events.
+
+    Reactors marked as CPU-bound are executed on a pool of worker processes,
+    which is created on first use (see
+    :obj:`baroque.executors.processes.ProcessPoolReactorsExecutor`).
+
+    Args:
+        process_workers (int, optional): number of worker processes for
+            CPU-bound reactors, defaults to the number of available cores
+
+    """
+
+    def __init__(self, process_workers=None):
+        self.process_workers = process_workers
+        self.processes = None
+
+    def execute(self, reactors, event, propagate=True):
+        """Runs reactors on an event.
+
+        Args:
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be run
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+            propagate (bool, optional): shall exceptions raised by reactors be
+                bubbled up?
+
+        Note:
+            CPU-bound reactors run on the pool of worker processes. When
+            exceptions are propagated, they are waited for before returning,
+            so that their exceptions are bubbled up right away.
+
+        Returns:
+            a :obj:`baroque.executors.base.ReactionsHandle` when CPU-bound
+            reactors are run and exceptions are not propagated, ``None`` when
+            all reactors are over already
+
+        """
+        handle = None
+        for r in reactors:
+            if r.cpu_bound:
+                handle = self._execute_cpu_bound(r, event, propagate,
+                                                 handle=handle)
+                continue
+            try:
+                r.react_conditionally(event)
+            except:
+                if propagate:
+                    raise
+        if handle is not None and propagate:
+            handle.wait()
+            return None
+        return handle
+
+    def react_async(self, reactor, event):
+        """Gives an awaitable running a reactor on an event, to be used by
+        asyncio brokers.
+
+        Args:
+            reactor (:obj:`baroque.entities.reactor.Reactor`): the reactor
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        Returns:
+            an awaitable object
+
+        """
+        if reactor.cpu_bound:
+            return self._react_cpu_bound_async(reactor, event)
+        return reactor.react_conditionally_async(event)
+
+    async def _react_cpu_bound_async(self, reactor, event):
+        """Runs a CPU-bound reactor on an event on the pool of worker
+        processes, from the running event loop."""
+        handle = self._execute_cpu_bound(reactor, event, True)
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *[asyncio.wrap_future(f, loop=loop) for f in handle.futures])
+
+    def _execute_cpu_bound(self, reactor, event, propagate, handle=None):
+        """Submits a CPU-bound reactor to the pool of worker processes,
+        creating the pool if needed.
+
+        Args:
+            reactor (:obj:`baroque.entities.reactor.Reactor`): the reactor
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+            propagate (bool): shall exceptions raised by the reactor be
+                bubbled up when waiting on the returned handle?
+            handle (:obj:`baroque.executors.base.ReactionsHandle`, optional):
+                a handle to merge the reaction into
+
+        Returns:
+            :obj:`baroque.executors.base.ReactionsHandle`
+
+        """
+        if self.processes is None:
+            from .processes import ProcessPoolReactorsExecutor
+            self.processes = ProcessPoolReactorsExecutor(
+                workers=self.process_workers)
+        result = self.processes.execute((reactor,), event, propagate=propagate)
+        if handle is None:
+            return result
+        return handle.merge(result)
+
+    def shutdown(self, wait=True):
+        """Releases the resources held by this executor.
+
+        Args:
+            wait (bool, optional): shall pending reactions be waited for?
+
+        """
+        if self.processes is not None:
+            self.processes.shutdown(wait=wait)
+            self.processes = None
+
+    def __repr__(self):
+        return '<{}.{}>'.format(__name__, self.__class__.__name__)
@@ -0,0 +1,87 @@
+from concurrent.futures import ProcessPoolExecutor
+from baroque.entities.event import Event
+from .base import ReactionsHandle
+
+
+def react_in_worker(reaction_function, compact_event):
+    """Executes a reaction function in a worker process.
+
+    Args:
+        reaction_function (function): the picklable reaction function
+        compact_event (tuple): the compact form of the triggering event
+
+    Returns:
+        the outcome of the reaction function
+
+    """
+    return reaction_function(Event.from_compact(compact_event))
+
+
+class ProcessPoolReactorsExecutor:
+    """Executes CPU-bound reactors on a pool of worker processes, so that
+    their execution can scale across all the available cores.
+
+    Conditions are checked in the publishing process; worker processes are
+    fed with the reaction function and the compact form of the triggering
+    event, and give back the reaction outcome or error. Reactors bookkeeping
+    happens in the publishing process as soon as each reaction is over.
+
+    Args:
+        workers (int, optional): number of worker processes of the pool,
+            defaults to the number of available cores
+
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    def execute(self, reactors, event, propagate=True):
+        """Submits reactors to the process pool, to be run on an event.
+
+        Args:
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be run
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+            propagate (bool, optional): shall exceptions raised by reactors be
+                bubbled up when waiting on the returned handle?
+
+        Returns:
+            :obj:`baroque.executors.base.ReactionsHandle`
+
+        """
+        compact_event = None
+        futures = list()
+        for r in reactors:
+            if not r._condition_met(event):
+                continue
+            if compact_event is None:
+                compact_event = event.compact()
+            future = self.pool.submit(react_in_worker, r.reaction_function,
+                                      compact_event)
+            future.add_done_callback(_bookkeeper(r, event))
+            futures.append(future)
+        return ReactionsHandle(futures, propagate=propagate)
+
+    def shutdown(self, wait=True):
+        """Shuts the process pool down.
+
+        Args:
+            wait (bool, optional): shall pending reactions be waited for?
+
+        """
+        self.pool.shutdown(wait=wait)
+
+    def __repr__(self):
+        return '<{}.{} - workers: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.workers or 'default')
+
+
+def _bookkeeper(reactor, event):
+    """Gives a future callback that updates the bookkeeping of a reactor once
+    its reaction on an event is successfully over."""
+    def callback(future):
+        if not future.cancelled() and future.exception() is None:
+            reactor._track_reaction(event)
+    return callback
@@ -0,0 +1,88 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .base import ReactorsExecutor, ReactionsHandle
+
+
+class ThreadPoolReactorsExecutor(ReactorsExecutor):
+    """Executes reactors on a pool of worker threads, so that slow I/O-bound
+    reactors do not hold up the thread publishing the events.
+
+    Note:
+        Reactors that are triggered by many events might run concurrently on
+        different worker threads.
+
+    Args:
+        workers (int, optional): number of worker threads of the pool
+        process_workers (int, optional): number of worker processes for
+            CPU-bound reactors, defaults to the number of available cores
+
+    """
+
+    def __init__(self, workers=None, process_workers=None):
+        ReactorsExecutor.__init__(self, process_workers=process_workers)
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def execute(self, reactors, event, propagate=True):
+        """Submits reactors to the thread pool, to be run on an event.
+
+        Args:
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be run
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+            propagate (bool, optional): shall exceptions raised by reactors be
+                bubbled up when waiting on the returned handle?
+
+        Returns:
+            :obj:`baroque.executors.base.ReactionsHandle`
+
+        """
+        submit = self.pool.submit
+        handle = ReactionsHandle(propagate=propagate)
+        for r in reactors:
+            if r.cpu_bound:
+                self._execute_cpu_bound(r, event, propagate, handle=handle)
+            else:
+                handle.futures.append(submit(r.react_conditionally, event))
+        return handle
+
+    def react_async(self, reactor, event):
+        """Gives an awaitable running a reactor on an event, to be used by
+        asyncio brokers: reactors whose reaction function is a coroutine
+        function are run on the event loop, CPU-bound reactors on the process
+        pool, the others on the thread pool.
+
+        Args:
+            reactor (:obj:`baroque.entities.reactor.Reactor`): the reactor
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+
+        Returns:
+            an awaitable object
+
+        """
+        if reactor.cpu_bound or \
+                asyncio.iscoroutinefunction(reactor.reaction_function):
+            return ReactorsExecutor.react_async(self, reactor, event)
+        return self._react_on_pool(reactor, event)
+
+    async def _react_on_pool(self, reactor, event):
+        """Runs a reactor on an event on the thread pool, from the running
+        event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool,
+                                          reactor.react_conditionally, event)
+
+    def shutdown(self, wait=True):
+        """Shuts the thread pool down, along with the process pool if any.
+
+        Args:
+            wait (bool, optional): shall pending reactions be waited for?
+
+        """
+        self.pool.shutdown(wait=wait)
+        ReactorsExecutor.shutdown(self, wait=wait)
+
+    def __repr__(self):
+        return '<{}.{} - workers: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.workers or 'default')
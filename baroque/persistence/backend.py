@@ -9,6 +9,20 @@ class PersistenceBackend:
         """
         pass
 
+    def create_many(self, events):
+        """Persists a batch of events.
+
+        Note:
+            The default implementation persists events one by one: backends
+            supporting bulk writes should override it.
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects to be persisted
+
+        """
+        for event in events:
+            self.create(event)
+
     def read(self, event_id):
         """Loads an event.
 
@@ -38,3 +52,62 @@ class PersistenceBackend:
 
         """
         pass
+
+
+class AsyncPersistenceBackend:
+    """Persistence backend whose operations are coroutines, to be used by the
+    :obj:`baroque.asyncbaroque.AsyncBaroque` broker without blocking the
+    event loop."""
+
+    async def create(self, event):
+        """Persists an event.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be persisted
+
+        """
+        pass
+
+    async def create_many(self, events):
+        """Persists a batch of events.
+
+        Note:
+            The default implementation persists events one by one: backends
+            supporting bulk writes should override it.
+
+        Args:
+            events (iterable): the :obj:`baroque.entities.event.Event` objects to be persisted
+
+        """
+        for event in events:
+            await self.create(event)
+
+    async def read(self, event_id):
+        """Loads an event.
+
+        Args:
+            event_id (str): the identifier of the event to be loaded
+
+        Returns:
+            :obj:`baroque.entities.event.Event`
+
+        """
+        pass
+
+    async def update(self, event):
+        """Updates the event.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event to be updated
+
+        """
+        pass
+
+    async def delete(self, event_id):
+        """Deletes an event.
+
+        Args:
+            event_id (str): the identifier of the event to be deleted
+
+        """
+        pass
@@ -16,6 +16,13 @@ class DictBackend(PersistenceBackend):
             return
         self._db.setdefault(event.id, event)
 
+    def create_many(self, events):
+        db = self._db
+        for event in events:
+            assert event is not None
+            if event.id is not None:
+                db.setdefault(event.id, event)
+
     def read(self, event_id):
         return self._db.get(event_id, None)
 
@@ -0,0 +1,196 @@
+import functools
+
+
+class Stage:
+    """A stage of the publication pipeline of a broker.
+
+    Stages are chained: each stage gets the event being published along with
+    the next step of the chain (``proceed``), and decides whether, when and
+    how to carry on with the publication. A stage can act before proceeding
+    (eg. enrich or validate the event), after proceeding (eg. persist the
+    event once reactors are run) or not proceed at all (eg. filter the event
+    out). The outcome of the chain is the
+    :obj:`baroque.executors.base.ReactionsHandle` given by the reactors
+    executor, if any.
+
+    Subclasses override :obj:`process()` and, when they need to act on
+    whole batches of events, :obj:`process_many()`.
+
+    """
+
+    name = None
+    """str: the name latencies of the stage are recorded under when the
+    pipeline is instrumented, defaults to the class name"""
+
+    on_topics = True
+    """bool: shall the stage be part of the chains publishing events on
+    topics?"""
+
+    def enabled(self, config):
+        """Tells whether the stage is part of the pipeline, according to the
+        broker configuration. Disabled stages are left out of the pipeline
+        when it is compiled.
+
+        Args:
+            config (dict): the broker configuration
+
+        Returns:
+            bool
+
+        """
+        return True
+
+    def process(self, event, topic, proceed):
+        """Processes the publication of an event.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event being published
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the event is being published, ``None`` if published on the broker
+            proceed (function): the next step of the chain, accepting the same ``event`` and ``topic`` arguments
+
+        Returns:
+            the outcome of the next step, or ``None``
+
+        """
+        return proceed(event, topic)
+
+    def process_many(self, events, topic, proceed):
+        """Processes the publication of a batch of events.
+
+        By default, :obj:`process()` is applied to each event of the batch and
+        the events it proceeds with are passed on to the next step as a batch:
+        this suits stages acting before proceeding.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects being published
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the events are being published, ``None`` if published on the broker
+            proceed (function): the next step of the chain, accepting the same ``events`` and ``topic`` arguments
+
+        Returns:
+            the outcome of the next step, or ``None``
+
+        """
+        kept = list()
+
+        def collect(event, topic):
+            kept.append(event)
+
+        for event in events:
+            self.process(event, topic, collect)
+        if not kept:
+            return None
+        return proceed(kept, topic)
+
+    def flush(self):
+        """Carries on with the publication of the events held by the stage,
+        if any."""
+        pass
+
+    def close(self):
+        """Carries on with the publication of the events held by the stage,
+        then releases the resources held by the stage."""
+        self.flush()
+
+    def __repr__(self):
+        return '<{}.{}>'.format(__name__, self.__class__.__name__)
+
+
+class Pipeline:
+    """The publication pipeline of a broker, compiled into flat call chains.
+
+    The enabled stages are bound one to the other once and for all, ending
+    with the terminal stage (the one running reactors), so that publishing
+    an event is a single call to the head of a chain and disabled stages
+    cost nothing. One chain is compiled for each combination of single
+    events vs batches and broker vs topic publishing.
+
+    Args:
+        stages (list): the :obj:`baroque.pipelines.base.Stage` objects, in order
+        terminal (object): the terminal stage, exposing ``process(event, topic)`` and ``process_many(events, topic)`` methods
+        config (dict): the broker configuration
+        histograms (:obj:`baroque.datastructures.histograms.LatencyHistograms`, optional): when supplied, the chains are compiled with the stages wrapped into instrumentation recording their latencies into these histograms (see :obj:`baroque.pipelines.instrumentation`); otherwise stages are bound as they are, at no extra cost
+
+    """
+
+    def __init__(self, stages, terminal, config, histograms=None):
+        self.stages = [stage for stage in stages if stage.enabled(config)]
+        self.terminal = terminal
+        self.histograms = histograms
+        chained = self.stages
+        if histograms is not None:
+            from .instrumentation import InstrumentedStage, \
+                InstrumentedReactorsStage
+            chained = [InstrumentedStage(stage, histograms)
+                       for stage in chained]
+            terminal = InstrumentedReactorsStage(terminal, histograms)
+        self.publish = self._compile(chained, terminal, 'process', False)
+        self.publish_many = self._compile(chained, terminal, 'process_many',
+                                          False)
+        self.publish_on_topic = self._compile(chained, terminal, 'process',
+                                              True)
+        self.publish_many_on_topic = self._compile(chained, terminal,
+                                                   'process_many', True)
+
+    @staticmethod
+    def _compile(stages, terminal, method, on_topics):
+        """Binds the stages into a call chain.
+
+        Args:
+            stages (list): the stages to be chained, in order
+            terminal (object): the terminal stage
+            method (str): name of the stage method to be chained
+            on_topics (bool): is the chain meant to publish on topics?
+
+        Returns:
+            function, accepting an event (or batch of events) and a topic
+
+        """
+        chain = getattr(terminal, method)
+        for stage in reversed(stages):
+            if on_topics and not stage.on_topics:
+                continue
+            chain = functools.partial(getattr(stage, method), proceed=chain)
+        return chain
+
+    def flush(self):
+        """Flushes all the stages of the pipeline, in order.
+
+        Raises:
+            the first exception raised while flushing stages
+        """
+        self._on_stages(lambda stage: stage.flush())
+
+    def close(self):
+        """Closes all the stages of the pipeline, in order.
+
+        Raises:
+            the first exception raised while closing stages
+        """
+        self._on_stages(lambda stage: stage.close())
+
+    def _on_stages(self, action):
+        """Applies an action to all stages, then re-raises the first exception
+        raised by the action, if any.
+
+        Args:
+            action (function): the action, taking a stage
+
+        """
+        error = None
+        for stage in self.stages:
+            try:
+                action(stage)
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+
+    def __len__(self):
+        return len(self.stages)
+
+    def __repr__(self):
+        return '<{}.{} - stages: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            ', '.join(type(stage).__name__ for stage in self.stages))
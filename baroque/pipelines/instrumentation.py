@@ -0,0 +1,212 @@
+import time
+from .base import Stage
+
+REACTORS = 'reactors'
+"""str: name latencies of reactors runs on events published on the broker are
+recorded under, by event type class"""
+
+FANOUT = 'fanout'
+"""str: name latencies of reactors runs on events published on topics are
+recorded under, by topic"""
+
+REACTOR = 'reactor'
+"""str: name latencies of single reactors are recorded under, by reactor"""
+
+
+class InstrumentedStage(Stage):
+    """Wraps a stage of the publication pipeline, recording the latency of
+    the stage on each event into histograms keyed by event type class.
+
+    Only the time spent in the stage itself is recorded: the time spent in
+    the next steps of the chain is left out. The latency of a batch of events
+    is evenly split among its events.
+
+    Args:
+        stage (:obj:`baroque.pipelines.base.Stage`): the wrapped stage
+        histograms (:obj:`baroque.datastructures.histograms.LatencyHistograms`): the histograms latencies are recorded into
+        clock (function, optional): the clock giving the current time, in seconds
+
+    """
+
+    def __init__(self, stage, histograms, clock=time.perf_counter):
+        assert isinstance(stage, Stage)
+        self.stage = stage
+        self.histograms = histograms
+        self.clock = clock
+        self.name = stage.name or type(stage).__name__
+        self.on_topics = stage.on_topics
+
+    def process(self, event, topic, proceed):
+        clock = self.clock
+        downstream = [0.]
+
+        def timed(event, topic):
+            start = clock()
+            try:
+                return proceed(event, topic)
+            finally:
+                downstream[0] += clock() - start
+
+        start = clock()
+        try:
+            return self.stage.process(event, topic, timed)
+        finally:
+            self.histograms.record(self.name, event.type_class,
+                                   clock() - start - downstream[0])
+
+    def process_many(self, events, topic, proceed):
+        clock = self.clock
+        downstream = [0.]
+
+        def timed(events, topic):
+            start = clock()
+            try:
+                return proceed(events, topic)
+            finally:
+                downstream[0] += clock() - start
+
+        start = clock()
+        try:
+            return self.stage.process_many(events, topic, timed)
+        finally:
+            _record_many(self.histograms, self.name, events,
+                         clock() - start - downstream[0])
+
+    def flush(self):
+        self.stage.flush()
+
+    def close(self):
+        self.stage.close()
+
+    def __repr__(self):
+        return '<{}.{} - stage: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.name)
+
+
+class InstrumentedReactorsStage:
+    """Wraps the terminal stage of the publication pipeline, recording the
+    latency of reactors runs into histograms: by event type class for
+    events published on the broker, by topic for events published on
+    topics.
+
+    Args:
+        terminal (:obj:`baroque.pipelines.stages.ReactorsStage`): the wrapped terminal stage
+        histograms (:obj:`baroque.datastructures.histograms.LatencyHistograms`): the histograms latencies are recorded into
+        clock (function, optional): the clock giving the current time, in seconds
+
+    """
+
+    def __init__(self, terminal, histograms, clock=time.perf_counter):
+        self.terminal = terminal
+        self.histograms = histograms
+        self.clock = clock
+
+    def process(self, event, topic):
+        start = self.clock()
+        try:
+            return self.terminal.process(event, topic)
+        finally:
+            elapsed = self.clock() - start
+            if topic is None:
+                self.histograms.record(REACTORS, event.type_class, elapsed)
+            else:
+                self.histograms.record(FANOUT, topic, elapsed)
+
+    def process_many(self, events, topic):
+        start = self.clock()
+        try:
+            return self.terminal.process_many(events, topic)
+        finally:
+            elapsed = self.clock() - start
+            if topic is None:
+                _record_many(self.histograms, REACTORS, events, elapsed)
+            else:
+                self.histograms.record(FANOUT, topic, elapsed)
+
+    def __repr__(self):
+        return '<{}.{}>'.format(__name__, self.__class__.__name__)
+
+
+class InstrumentedExecutor:
+    """Wraps a reactors executor, recording the latency of each reactor run
+    into histograms keyed weakly by reactor, so that the histogram of a
+    reactor goes away along with it. Reactions are timed where they run, so
+    the latencies of reactors run on a thread pool leave out the time spent
+    in the pool queue; CPU-bound reactors, which run on worker processes,
+    are not timed.
+
+    Args:
+        executor (:obj:`baroque.executors.base.ReactorsExecutor`): the wrapped executor
+        histograms (:obj:`baroque.datastructures.histograms.LatencyHistograms`): the histograms latencies are recorded into
+        clock (function, optional): the clock giving the current time, in seconds
+
+    """
+
+    def __init__(self, executor, histograms, clock=time.perf_counter):
+        self.executor = executor
+        self.histograms = histograms
+        self.clock = clock
+        histograms.key_weakly(REACTOR)
+
+    def execute(self, reactors, event, propagate=True):
+        """Runs reactors on an event, timing each one of them.
+
+        Args:
+            reactors (collection): the :obj:`baroque.entities.reactor.Reactor` objects to be run
+            event (:obj:`baroque.entities.event.Event`): the triggering event
+            propagate (bool, optional): shall exceptions raised by reactors be
+                bubbled up?
+
+        Returns:
+            the outcome of the wrapped executor
+
+        """
+        timed = [r if r.cpu_bound else _TimedReactor(r, self)
+                 for r in reactors]
+        return self.executor.execute(timed, event, propagate=propagate)
+
+    def __repr__(self):
+        return '<{}.{} - executor: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.executor)
+
+
+class _TimedReactor:
+    """Stands in for a reactor when it is submitted to an executor, timing
+    its reactions."""
+
+    cpu_bound = False
+
+    def __init__(self, reactor, instrumented):
+        self.reactor = reactor
+        self.instrumented = instrumented
+
+    def react_conditionally(self, event):
+        clock = self.instrumented.clock
+        start = clock()
+        try:
+            return self.reactor.react_conditionally(event)
+        finally:
+            self.instrumented.histograms.record(REACTOR, self.reactor,
+                                                clock() - start)
+
+
+def _record_many(histograms, stage, events, elapsed):
+    """Records the latency of a batch of events, evenly split among the
+    events, by event type class.
+
+    Args:
+        histograms (:obj:`baroque.datastructures.histograms.LatencyHistograms`): the histograms
+        stage (str): the stage name
+        events (list): the :obj:`baroque.entities.event.Event` objects
+        elapsed (float): the latency of the whole batch, in seconds
+
+    """
+    if not events:
+        return
+    share = elapsed / len(events)
+    for event in events:
+        histograms.record(stage, event.type_class, share)
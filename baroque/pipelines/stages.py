@@ -0,0 +1,517 @@
+import collections
+import threading
+import time
+from baroque.datastructures.coalescers import Coalescer, CoalescingMode
+from baroque.datastructures.limiters import LimitAction, RateLimiter
+from baroque.executors.base import ReactionsHandle
+from baroque.exceptions.configuration import InvalidConfigurationError
+from baroque.exceptions.eventtypes import UnregisteredEventTypeError
+from baroque.utils import importer
+from .base import Stage
+
+
+class FilterStage(Stage):
+    """Lets only the events meeting a condition go through: the other ones
+    are not published.
+
+    Args:
+        condition (function): function taking an event and giving a bool
+
+    """
+
+    name = 'filter'
+
+    def __init__(self, condition):
+        assert callable(condition)
+        self.condition = condition
+
+    def process(self, event, topic, proceed):
+        if self.condition(event):
+            return proceed(event, topic)
+        return None
+
+    def process_many(self, events, topic, proceed):
+        condition = self.condition
+        kept = [event for event in events if condition(event)]
+        if not kept:
+            return None
+        return proceed(kept, topic)
+
+
+class EnrichmentStage(Stage):
+    """Enriches events before they are published, eg. by adding tags or
+    payload fields.
+
+    Args:
+        enrich (function): function taking an event and modifying it in place
+
+    """
+
+    name = 'enrichment'
+
+    def __init__(self, enrich):
+        assert callable(enrich)
+        self.enrich = enrich
+
+    def process(self, event, topic, proceed):
+        self.enrich(event)
+        return proceed(event, topic)
+
+    def process_many(self, events, topic, proceed):
+        enrich = self.enrich
+        for event in events:
+            enrich(event)
+        return proceed(events, topic)
+
+
+class RateLimitStage(Stage):
+    """Enforces the token-bucket rate limits defined in the
+    ``events.rate_limits`` configuration section, by event type class, by
+    topic and by owner. Events exceeding the limits are dropped, delayed
+    (blocking the publishing thread until the limits allow them) or rerouted
+    to a dedicated topic, and are counted on the events counter of the
+    broker. As topics can be registered after the pipeline is compiled, the
+    rerouting topic is looked up when events are rerouted: while it is not
+    registered, events are dropped and counted as such. Enabled when any
+    limit is defined.
+
+    Args:
+        broker (:obj:`baroque.baroque.Baroque`): the broker
+        previous (:obj:`RateLimitStage`, optional): the stage this one replaces, whose token buckets are carried over for the limits that are not changed
+
+    Raises:
+        :obj:`baroque.exceptions.configuration.InvalidConfigurationError`: when the action is not supported, or when no topic is provided to reroute events to
+
+    """
+
+    name = 'rate_limit'
+
+    def __init__(self, broker, previous=None):
+        self.broker = broker
+        limits_config = broker.config['events'].get('rate_limits') or dict()
+        self.action = limits_config.get('action') or LimitAction.DROP
+        if self.action not in LimitAction.ALL:
+            raise InvalidConfigurationError(
+                'Unsupported rate limit action: {}'.format(self.action))
+        self.reroute_topic = limits_config.get('reroute_topic')
+        if self.action == LimitAction.REROUTE and not self.reroute_topic:
+            raise InvalidConfigurationError(
+                'No topic provided to reroute rate-limited events to')
+        eventtypes = {importer.class_from_dotted_path(path): limit
+                      for path, limit in self._limits(limits_config,
+                                                      'eventtypes').items()}
+        self.limiter = RateLimiter(
+            eventtypes=eventtypes,
+            topics=self._limits(limits_config, 'topics'),
+            owners=self._limits(limits_config, 'owners'))
+        if previous is not None:
+            self.limiter.carry_over(previous.limiter)
+
+    @staticmethod
+    def _limits(limits_config, kind):
+        """Gives the limits of a kind as ``(rate, burst)`` tuples.
+
+        Args:
+            limits_config (dict): the ``rate_limits`` configuration section
+            kind (str): ``eventtypes``, ``topics`` or ``owners``
+
+        Returns:
+            dict
+
+        """
+        return {key: (limit['rate'], limit.get('burst'))
+                for key, limit in (limits_config.get(kind) or dict()).items()}
+
+    def enabled(self, config):
+        return len(self.limiter) > 0
+
+    def _admit(self, event, topic):
+        """Tells where an event must be published, according to the limits.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event
+            topic (:obj:`baroque.entities.topic.Topic`): the target topic, ``None`` if published on the broker
+
+        Returns:
+            a tuple ``(admitted, topic)``
+
+        """
+        wait = self.limiter.acquire(event, topic)
+        if not wait:
+            return True, topic
+        counter = self.broker.events
+        if self.action == LimitAction.DELAY:
+            counter.increment_limited(event, LimitAction.DELAY)
+            while wait:
+                time.sleep(wait)
+                wait = self.limiter.acquire(event, topic)
+            return True, topic
+        if self.action == LimitAction.REROUTE:
+            reroute_topic = self.broker.topics.with_name(self.reroute_topic)
+            if reroute_topic is not None:
+                counter.increment_limited(event, LimitAction.REROUTE)
+                return True, reroute_topic
+        counter.increment_limited(event, LimitAction.DROP)
+        return False, topic
+
+    def process(self, event, topic, proceed):
+        admitted, topic = self._admit(event, topic)
+        if not admitted:
+            return None
+        return proceed(event, topic)
+
+    def process_many(self, events, topic, proceed):
+        batches = collections.OrderedDict()
+        for event in events:
+            admitted, target = self._admit(event, topic)
+            if admitted:
+                batches.setdefault(target, list()).append(event)
+        handle = None
+        for target, batch in batches.items():
+            result = proceed(batch, target)
+            if result is not None:
+                handle = (handle or ReactionsHandle(
+                    propagate=result.propagate)).merge(result)
+        return handle
+
+
+class CoalescingStage(Stage):
+    """Coalesces the events sharing a key within a time window, according to
+    the ``events.coalescing`` configuration section: only the last event of
+    each window is published, possibly with the content of the previous ones
+    merged in (see :obj:`baroque.datastructures.coalescers.Coalescer`).
+    Enabled when a window is set and keys are defined for any event type.
+
+    Held events are published by a background thread when their window
+    closes, or by :obj:`flush()`. Exceptions raised while publishing them
+    from the background thread are re-raised by :obj:`flush()`, if
+    exceptions propagation is configured. Coalesced events are counted on
+    the events counter of the broker.
+
+    Args:
+        broker (:obj:`baroque.baroque.Baroque`): the broker
+
+    Raises:
+        :obj:`baroque.exceptions.configuration.InvalidConfigurationError`: when the coalescing mode is not supported
+
+    """
+
+    name = 'coalescing'
+
+    MAX_COLLECTED_ERRORS = 100
+    """int: max number of exceptions kept for later re-raising"""
+
+    def __init__(self, broker):
+        self.broker = broker
+        coalescing_config = broker.config['events'].get('coalescing') or dict()
+        self.window = coalescing_config.get('window') or 0
+        mode = coalescing_config.get('mode') or CoalescingMode.LAST
+        if mode not in CoalescingMode.ALL:
+            raise InvalidConfigurationError(
+                'Unsupported coalescing mode: {}'.format(mode))
+        self.keys = {
+            importer.class_from_dotted_path(path):
+                importer.class_from_dotted_path(key_path)
+            for path, key_path in (coalescing_config.get('eventtypes') or
+                                   dict()).items()}
+        self.propagate = broker.config['reactors']['propagate_exceptions']
+        self.coalescer = Coalescer(self.window, mode) if self.window else None
+        self.condition = threading.Condition()
+        self.errors = collections.deque(maxlen=self.MAX_COLLECTED_ERRORS)
+        self.thread = None
+        self.closed = False
+
+    def enabled(self, config):
+        return self.coalescer is not None and len(self.keys) > 0
+
+    def _hold(self, event, topic, proceed, batch):
+        """Holds an event if it has a coalescing key.
+
+        Returns:
+            ``True`` if the event is held, ``False`` otherwise
+
+        """
+        t = event.type_class
+        key_function = self.keys.get(t)
+        if key_function is None:
+            return False
+        key = key_function(event)
+        if key is None:
+            return False
+        with self.condition:
+            if self.coalescer.add((t, key, topic), event,
+                                  (topic, proceed, batch)):
+                if self.thread is None:
+                    self.thread = threading.Thread(
+                        target=self._run, name='baroque-coalescer')
+                    self.thread.daemon = True
+                    self.thread.start()
+                self.condition.notify()
+            else:
+                self.broker.events.increment_coalesced(event)
+        return True
+
+    def process(self, event, topic, proceed):
+        if self._hold(event, topic, proceed, False):
+            return None
+        return proceed(event, topic)
+
+    def process_many(self, events, topic, proceed):
+        kept = [event for event in events
+                if not self._hold(event, topic, proceed, True)]
+        if not kept:
+            return None
+        return proceed(kept, topic)
+
+    def _run(self):
+        """Background thread loop: publishes held events as their windows
+        close."""
+        clock = self.coalescer.clock
+        while True:
+            with self.condition:
+                if self.closed:
+                    return
+                deadline = self.coalescer.next_deadline()
+                if deadline is None:
+                    self.condition.wait()
+                    continue
+                delay = deadline - clock()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                due = self.coalescer.due()
+            self._release(due)
+
+    def _release(self, entries):
+        """Carries on with the publication of held events, collecting any
+        exception raised.
+
+        Args:
+            entries (list): ``(event, context)`` tuples
+
+        """
+        for event, (topic, proceed, batch) in entries:
+            try:
+                handle = proceed([event] if batch else event, topic)
+                if isinstance(handle, ReactionsHandle):
+                    handle.wait()
+            except Exception as e:
+                self.errors.append(e)
+
+    def flush(self):
+        """Publishes all held events right away.
+
+        Raises:
+            the first exception collected since the last flush, if
+            exceptions propagation is configured
+
+        """
+        with self.condition:
+            entries = self.coalescer.drain()
+        self._release(entries)
+        if not self.errors:
+            return
+        error = self.errors[0]
+        self.errors.clear()
+        if self.propagate:
+            raise error
+
+    def close(self):
+        """Publishes all held events right away, then stops the background
+        thread."""
+        try:
+            self.flush()
+        finally:
+            with self.condition:
+                self.closed = True
+                self.condition.notify()
+            if self.thread is not None:
+                self.thread.join()
+
+
+class ValidationStage(Stage):
+    """Validates events against the JSON schema of their types. Enabled by the
+    ``events.validate_schema`` configuration switch. Events published on
+    topics are not validated.
+
+    Args:
+        broker (:obj:`baroque.baroque.Baroque`): the broker
+
+    """
+
+    name = 'validation'
+    on_topics = False
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def enabled(self, config):
+        return config['events']['validate_schema']
+
+    def process(self, event, topic, proceed):
+        self.broker._validate_event_schema(event)
+        return proceed(event, topic)
+
+    def process_many(self, events, topic, proceed):
+        self.broker._validate_events_schema(events)
+        return proceed(events, topic)
+
+
+class CountingStage(Stage):
+    """Counts events on the events counter of the broker.
+
+    Args:
+        broker (:obj:`baroque.baroque.Baroque`): the broker
+
+    """
+
+    name = 'counting'
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def process(self, event, topic, proceed):
+        self.broker._count_event(event)
+        return proceed(event, topic)
+
+    def process_many(self, events, topic, proceed):
+        self.broker._count_events(events)
+        return proceed(events, topic)
+
+
+class StatusStage(Stage):
+    """Marks events as published, once reactors are run.
+
+    Args:
+        broker (:obj:`baroque.baroque.Baroque`): the broker
+
+    """
+
+    name = 'status'
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def process(self, event, topic, proceed):
+        handle = proceed(event, topic)
+        self.broker._update_event_status(event)
+        return handle
+
+    def process_many(self, events, topic, proceed):
+        handle = proceed(events, topic)
+        self.broker._update_events_status(events)
+        return handle
+
+
+class PersistenceStage(Stage):
+    """Persists events on the persistence backend of the broker, once they are
+    published. Enabled by the ``events.persist`` configuration switch.
+
+    Args:
+        broker (:obj:`baroque.baroque.Baroque`): the broker
+
+    """
+
+    name = 'persistence'
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def enabled(self, config):
+        return config['events']['persist']
+
+    def process(self, event, topic, proceed):
+        handle = proceed(event, topic)
+        self.broker._persist_event(event)
+        return handle
+
+    def process_many(self, events, topic, proceed):
+        handle = proceed(events, topic)
+        self.broker._persist_events(events)
+        return handle
+
+
+class ReactorsStage:
+    """The terminal stage of the pipeline: runs on events the reactors that
+    subscribed to their types, or to the topic they are published on.
+
+    Configuration switches are read once, when the stage is created.
+
+    Args:
+        broker (:obj:`baroque.baroque.Baroque`): the broker
+        executor (:obj:`baroque.executors.base.ReactorsExecutor`, optional): the executor running reactors, defaults to the one of the broker
+
+    """
+
+    def __init__(self, broker, executor=None):
+        self.reactreg = broker.reactreg
+        self.topics = broker.topics
+        self.eventtypes = broker.eventtypes
+        self.executor = executor or broker.executor
+        self.propagate = broker.config['reactors']['propagate_exceptions']
+        self.ignore = broker.config['eventtypes']['ignore_unregistered']
+
+    def process(self, event, topic):
+        """Runs reactors on an event.
+
+        Args:
+            event (:obj:`baroque.entities.event.Event`): the event
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the event is published, ``None`` if published on the broker
+
+        Returns:
+            the :obj:`baroque.executors.base.ReactionsHandle` given by the
+            reactors executor, if any
+
+        Raises
+            :obj:`baroque.exceptions.eventtypes.UnregisteredEventTypeError`: when the type of the event is not registered on the broker
+
+        """
+        if topic is not None:
+            return self.topics.publish_on_topic(
+                event, topic, executor=self.executor, propagate=self.propagate)
+        if not self.ignore and event.type_class not in self.eventtypes:
+            raise UnregisteredEventTypeError(event.type)
+        return self.executor.execute(
+            self.reactreg.get_reactors(event.type_class), event,
+            propagate=self.propagate)
+
+    def process_many(self, events, topic):
+        """Runs reactors on each event of a batch. Reactors are looked up once
+        for each event type in the batch.
+
+        Args:
+            events (list): the :obj:`baroque.entities.event.Event` objects
+            topic (:obj:`baroque.entities.topic.Topic`): the topic on which the events are published, ``None`` if published on the broker
+
+        Returns:
+            a :obj:`baroque.executors.base.ReactionsHandle` merging the
+            handles given by the reactors executor, if any
+
+        Raises
+            :obj:`baroque.exceptions.eventtypes.UnregisteredEventTypeError`: when the type of any event is not registered on the broker
+
+        """
+        if topic is not None:
+            return self.topics.publish_many_on_topic(
+                events, topic, executor=self.executor,
+                propagate=self.propagate)
+        propagate = self.propagate
+        execute = self.executor.execute
+        reactors_by_type = dict()
+        handle = None
+        for event in events:
+            t = event.type_class
+            reactors = reactors_by_type.get(t)
+            if reactors is None:
+                if not self.ignore and t not in self.eventtypes:
+                    raise UnregisteredEventTypeError(event.type)
+                reactors = self.reactreg.get_reactors(t)
+                reactors_by_type[t] = reactors
+            result = execute(reactors, event, propagate=propagate)
+            if result is not None:
+                handle = (handle or ReactionsHandle(
+                    propagate=propagate)).merge(result)
+        return handle
+
+    def __repr__(self):
+        return '<{}.{}>'.format(__name__, self.__class__.__name__)
@@ -0,0 +1,139 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONSerializer:
+    """Dumps objects to JSON strings and loads them back, using the
+    :mod:`json` module of the standard library.
+
+    Output is compact (no whitespace between tokens) and not ASCII-escaped,
+    so that it matches the output of the faster serializers.
+
+    """
+
+    name = 'json'
+
+    def dumps(self, obj):
+        """Dumps an object to a JSON string.
+
+        Args:
+            obj (object): the object to be dumped
+
+        Returns:
+            str
+
+        """
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+    def loads(self, text):
+        """Loads an object from a JSON string.
+
+        Args:
+            text (str): the JSON string
+
+        Returns:
+            object
+
+        """
+        return json.loads(text)
+
+    def __repr__(self):
+        return '<{}.{} - name: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.name)
+
+
+class OrjsonSerializer(JSONSerializer):
+    """Dumps objects to JSON strings and loads them back, using the `orjson`
+    package. Non-string dict keys are turned into strings, as the standard
+    library does. Objects that `orjson` cannot dump (eg. integers exceeding
+    64 bits) are dumped by the standard library instead.
+
+    Note:
+        output may differ from the one of :obj:`JSONSerializer` in corner
+        cases, such as the formatting of floats in exponent notation or
+        non-finite floats
+
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        assert orjson is not None, 'orjson is not installed'
+
+    def dumps(self, obj):
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().dumps(obj)
+        return data.decode('utf-8')
+
+    def loads(self, text):
+        return orjson.loads(text)
+
+
+def default_serializer():
+    """Gives the fastest serializer available: :obj:`OrjsonSerializer` if
+    `orjson` is installed, :obj:`JSONSerializer` otherwise.
+
+    Returns:
+        :obj:`JSONSerializer`
+
+    """
+    if orjson is not None:
+        return OrjsonSerializer()
+    return JSONSerializer()
+
+
+serializer = default_serializer()
+""":obj:`JSONSerializer`: the serializer used to dump Baroque entities to
+JSON, it can be swapped (see :obj:`use_serializer()`)"""
+
+
+def use_serializer(new_serializer=None):
+    """Sets the serializer used to dump Baroque entities to JSON.
+
+    Args:
+        new_serializer (:obj:`JSONSerializer`, optional): the serializer, if ``None`` the fastest one available is used
+
+    Returns:
+        the previous serializer
+
+    """
+    global serializer
+    if new_serializer is not None:
+        assert isinstance(new_serializer, JSONSerializer)
+    previous = serializer
+    serializer = new_serializer or default_serializer()
+    return previous
+
+
+def dumps(obj):
+    """Dumps an object to a JSON string, using the current serializer.
+
+    Args:
+        obj (object): the object to be dumped
+
+    Returns:
+        str
+
+    """
+    return serializer.dumps(obj)
+
+
+def loads(text):
+    """Loads an object from a JSON string, using the current serializer.
+
+    Args:
+        text (str): the JSON string
+
+    Returns:
+        object
+
+    """
+    return serializer.loads(text)
@@ -1,9 +1,101 @@
+import functools
+import threading
+import time
 import pytz
 import datetime
 
 TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 """str: ISO-8601 time format used for timestamp printing"""
 
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc)
+"""`datetime.datetime`: the POSIX epoch, as a UTC time-aware timestamp"""
+
+now_ns = time.time_ns
+"""function: gives the current time as integer nanoseconds since the epoch.
+This is the clock used to timestamp events, topics and reactions, and it can
+be swapped with a cheaper one (see :obj:`use_clock()`)"""
+
+
+def use_clock(clock=None):
+    """Sets the clock giving the current time to Baroque entities.
+
+    Args:
+        clock (function, optional): function taking no arguments and giving integer nanoseconds since the epoch, if ``None`` the system clock is used
+
+    Returns:
+        the previous clock
+
+    """
+    global now_ns
+    previous = now_ns
+    now_ns = clock or time.time_ns
+    return previous
+
+
+class CoarseClock:
+    """A clock caching the current time, which is refreshed by a background
+    thread every ``resolution_ms`` milliseconds: reading it costs an
+    attribute lookup rather than a system call, at the price of precision.
+
+    Meant for hot loops creating lots of events: use it as a context manager
+    to have Baroque entities timestamped by this clock while in the block.
+
+    Args:
+        resolution_ms (float, optional): how often the cached time is refreshed
+
+    """
+
+    def __init__(self, resolution_ms=1):
+        assert resolution_ms > 0
+        self.resolution = resolution_ms / 1000.
+        self.now = time.time_ns()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.previous = None
+
+    def __call__(self):
+        return self.now
+
+    def _tick(self):
+        """Refreshes the cached time until the clock is stopped."""
+        while not self.stopped.wait(self.resolution):
+            self.now = time.time_ns()
+
+    def start(self):
+        """Starts refreshing the cached time."""
+        if self.thread is not None:
+            return
+        self.now = time.time_ns()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._tick,
+                                       name='baroque-coarse-clock',
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops refreshing the cached time."""
+        if self.thread is None:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        self.previous = use_clock(functools.partial(getattr, self, 'now'))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        use_clock(self.previous)
+        self.stop()
+
+    def __repr__(self):
+        return '<{}.{} - resolution: {} ms - running: {}>'.format(
+            __name__,
+            self.__class__.__name__,
+            self.resolution * 1000.,
+            self.thread is not None)
+
 
 def utc_now():
     """Gives the current UTC time-aware timestamp.
@@ -16,6 +108,37 @@ def utc_now():
     return ts.replace(tzinfo=pytz.utc)
 
 
+def from_ns(ns):
+    """Gives the UTC time-aware timestamp of a time expressed in integer
+    nanoseconds since the epoch. Precision is cut down to microseconds.
+
+    Args:
+        ns (int): nanoseconds since the epoch
+
+    Returns:
+        `datetime.datetime`: The UTC timestamp
+
+    """
+    return EPOCH + datetime.timedelta(microseconds=ns // 1000)
+
+
+def to_ns(timestamp):
+    """Gives the integer nanoseconds since the epoch of a timestamp.
+
+    Args:
+        timestamp (:obj:`datetime.datetime`): the timestamp, taken as UTC if it is not time-aware
+
+    Returns:
+        int
+
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=pytz.utc)
+    delta = timestamp - EPOCH
+    return ((delta.days * 86400 + delta.seconds) * 1000000 +
+            delta.microseconds) * 1000
+
+
 def stringify(timestamp):
     """Turns a timestamp into its ISO-8601 string representation.
 
@@ -30,3 +153,20 @@ def stringify(timestamp):
 
     """
     return timestamp.strftime(TIME_FORMAT)
+
+
+def stringify_ns(ns):
+    """Turns a time expressed in integer nanoseconds since the epoch into its
+    ISO-8601 string representation, without building a datetime.
+
+    Note:
+        refer to the `TIME_FORMAT` template string
+
+    Args:
+        ns (int): nanoseconds since the epoch
+
+    Returns:
+        str: The ISO-8601 time formatted string
+
+    """
+    return time.strftime(TIME_FORMAT, time.gmtime(ns // 1000000000))
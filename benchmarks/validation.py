@@ -0,0 +1,52 @@
+"""
+Measures the per-event cost of validating events against the JSON schema of
+their type, for all the built-in event types.
+
+The "before" figures compile the schema on every event with
+``EventType.compile_schema``, as publishing used to do; the "after" figures
+reuse the validator the schema is compiled into once per process (see
+``EventType.validator``), as publishing does now.
+
+Run with: ``python benchmarks/validation.py [iterations]``
+"""
+import sys
+import timeit
+from baroque import Event, EventType, GenericEventType, \
+    StateTransitionEventType, DataOperationEventType, MetricEventType
+
+PAYLOADS = {
+    GenericEventType: dict(foo='bar'),
+    StateTransitionEventType: dict(from_status='idle', to_status='running',
+                                   trigger='start'),
+    DataOperationEventType: dict(datum=dict(table='friends', pk='abc'),
+                                 operation='update', timestamp=1487166969),
+    MetricEventType: dict(metric='temperature', value=56.7793,
+                          timestamp='2017-02-15T13:56:09Z')
+}
+
+
+def per_event_usecs(func, iterations):
+    return timeit.timeit(func, number=iterations) * 1e6 / iterations
+
+
+def main(iterations):
+    print('{:<28}{:>16}{:>16}{:>10}'.format(
+        'event type', 'before (us)', 'after (us)', 'speedup'))
+    for eventtype_class, payload in PAYLOADS.items():
+        eventtype = eventtype_class()
+        event = Event(eventtype, payload=payload)
+        assert EventType.validate(event, eventtype)
+
+        before = per_event_usecs(
+            lambda: EventType.validate(
+                event, eventtype,
+                validator=EventType.compile_schema(eventtype.jsonschema)),
+            iterations)
+        after = per_event_usecs(
+            lambda: EventType.validate(event, eventtype), iterations)
+        print('{:<28}{:>16.2f}{:>16.2f}{:>9.1f}x'.format(
+            eventtype_class.__name__, before, after, before / after))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
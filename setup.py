@@ -9,12 +9,16 @@ setup(
     version='0.0.3',
     packages=find_packages(),
     include_package_data=True,
+    python_requires='>=3.7',
     install_requires=[
         'jsonschema==2.6.0,<3.0',
         'pytz==2016.10',
         'PyYAML==3.12,<4.0',
         'requests==2.9.1,<3.0'
     ],
+    extras_require={
+        'orjson': ['orjson']
+    },
     test_suite='tests',
     license='MIT License',
     description='Baroque is an event brokering framework with a honey-sweet '
@@ -25,6 +29,11 @@ setup(
     classifiers=[
       "License :: OSI Approved :: MIT License",
       'Programming Language :: Python :: 3 :: Only',
+      'Programming Language :: Python :: 3.7',
+      'Programming Language :: Python :: 3.8',
+      'Programming Language :: Python :: 3.9',
+      'Programming Language :: Python :: 3.10',
+      'Programming Language :: Python :: 3.11',
       "Natural Language :: English",
       "Operating System :: OS Independent",
       "Development Status :: 3 - Alpha",
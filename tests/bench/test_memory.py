@@ -0,0 +1,41 @@
+import json
+import pytest
+from baroque.bench.memory import MemoryBenchmark, MemoryResult, \
+    MEMORY_BENCHMARKS
+from baroque.bench.__main__ import main
+
+
+def test_result():
+    r = MemoryResult('test', 4, 1000)
+    assert r.bytes_per_item() == 250.
+    assert r.as_dict() == dict(name='test', count=4, bytes=1000,
+                               bytes_per_item=250.)
+    with pytest.raises(AssertionError):
+        MemoryResult('test', 0, 1000)
+        pytest.fail()
+
+
+def test_benchmark():
+    b = MemoryBenchmark('test', lambda n: [bytearray(1000) for _ in range(n)],
+                        100)
+    result = b.run(scale=0.5)
+    assert result.count == 50
+    assert result.bytes_per_item() >= 1000
+    with pytest.raises(AssertionError):
+        MemoryBenchmark('test', None, 100)
+        pytest.fail()
+
+
+def test_benchmarks_run():
+    for benchmark in MEMORY_BENCHMARKS:
+        result = benchmark.run(scale=0.01)
+        assert result.bytes_per_item() > 0
+
+
+def test_main(tmpdir):
+    path = str(tmpdir.join('results.json'))
+    assert main(['-m', '-s', '0.001', '-o', path, 'publish_1_reactor']) == 0
+    with open(path) as f:
+        document = json.load(f)
+    assert [r['name'] for r in document['memory']] == \
+        [b.name for b in MEMORY_BENCHMARKS]
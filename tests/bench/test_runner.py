@@ -0,0 +1,76 @@
+import json
+import pytest
+from baroque.bench.runner import Benchmark, BenchmarkResult, run_all, \
+    to_document, save, load, compare
+
+
+def test_result():
+    r = BenchmarkResult('test', [0.000004, 0.000001, 0.000002, 0.000003])
+    assert r.iterations == 4
+    assert r.samples == [0.000001, 0.000002, 0.000003, 0.000004]
+    assert r.ops_per_sec() == pytest.approx(400000.)
+    assert r.percentile(50) == pytest.approx(2.)
+    assert r.percentile(0) == pytest.approx(1.)
+    assert r.percentile(100) == pytest.approx(4.)
+    data = r.as_dict()
+    assert data['name'] == 'test'
+    assert data['iterations'] == 4
+    assert data['mean_us'] == pytest.approx(2.5)
+    assert data['max_us'] == pytest.approx(4.)
+    assert data['p50_us'] == pytest.approx(2.)
+    assert data['p99_us'] == pytest.approx(4.)
+    with pytest.raises(AssertionError):
+        BenchmarkResult('test', [])
+        pytest.fail()
+
+
+def test_benchmark():
+    setups = list()
+    calls = list()
+
+    def setup(n):
+        setups.append(n)
+        return lambda: calls.append(1)
+
+    b = Benchmark('test', setup, 100)
+    result = b.run(scale=0.5, warmup=0.2)
+    assert setups == [60]
+    assert len(calls) == 60
+    assert result.iterations == 50
+    assert b.run(scale=0.).iterations == 1
+    with pytest.raises(AssertionError):
+        Benchmark('test', None, 100)
+        pytest.fail()
+    with pytest.raises(AssertionError):
+        Benchmark('test', setup, 0)
+        pytest.fail()
+
+
+def test_run_all():
+    reported = list()
+    benchmarks = [Benchmark(name, lambda n: lambda: None, 10)
+                  for name in ('a', 'b')]
+    results = run_all(benchmarks, report=reported.append)
+    assert [r.name for r in results] == ['a', 'b']
+    assert reported == results
+
+
+def test_save_load_compare(tmpdir):
+    baseline = [BenchmarkResult('a', [0.001] * 10),
+                BenchmarkResult('b', [0.001] * 10)]
+    current = [BenchmarkResult('a', [0.002] * 10),
+               BenchmarkResult('c', [0.001] * 10)]
+    path = str(tmpdir.join('results.json'))
+    save(baseline, path)
+    with open(path) as f:
+        assert json.load(f)['results'][0]['name'] == 'a'
+    document = load(path)
+    assert 'python' in document
+    assert 'baroque_version' in document
+    comparison = compare(document, to_document(current))
+    assert len(comparison) == 1
+    name, before, after, ratio = comparison[0]
+    assert name == 'a'
+    assert before == pytest.approx(1000.)
+    assert after == pytest.approx(500.)
+    assert ratio == pytest.approx(0.5)
@@ -0,0 +1,24 @@
+from baroque.bench.suites import BENCHMARKS
+from baroque.bench.__main__ import main
+from baroque.defaults.config import DEFAULT_CONFIG
+
+
+def test_benchmarks_run():
+    names = [b.name for b in BENCHMARKS]
+    assert len(names) == len(set(names))
+    for benchmark in BENCHMARKS:
+        result = benchmark.run(scale=0.001, warmup=0.)
+        assert result.iterations >= 1
+        assert result.ops_per_sec() > 0
+    # benchmarks do not alter the default configuration
+    assert DEFAULT_CONFIG['events']['persist'] is False
+
+
+def test_main(tmpdir, capsys):
+    path = str(tmpdir.join('results.json'))
+    assert main(['-s', '0.001', '-o', path, 'publish_1_reactor']) == 0
+    assert main(['-s', '0.001', '-c', path, 'publish_1_reactor']) == 0
+    out = capsys.readouterr().out
+    assert out.count('publish_1_reactor') == 3
+    assert main(['-l']) == 0
+    assert main(['no-such-benchmark']) == 2
@@ -0,0 +1,220 @@
+import io
+import pytest
+from baroque.codecs.binary import EventCodec
+from baroque.datastructures.registries import EventTypesRegistry
+from baroque.entities.event import Event, EventStatus
+from baroque.entities.eventtype import EventType, EventPriority, EVENT_FIELDS
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType
+from baroque.exceptions.codecs import EventDecodeError
+from baroque.exceptions.eventtypes import UnregisteredEventTypeError
+
+
+def make_event():
+    e = Event(MetricEventType,
+              payload=dict(metric='temperature', value=21.5, timestamp=123,
+                           meta=dict(ok=True, nothing=None, neg=-3,
+                                     seq=[1, 'a', 1.5], nested=[dict(x=[])],
+                                     city='città')),
+              description='hello', owner='me',
+              priority=EventPriority.LOW)
+    e.tags.update(['a', 'b'])
+    e.set_published()
+    return e
+
+
+def make_codec(**kwargs):
+    codec = EventCodec(**kwargs)
+    codec.register(GenericEventType)
+    codec.register(MetricEventType)
+    return codec
+
+
+def assert_same(result, e):
+    fields = tuple(f for f in EVENT_FIELDS if f != 'tags')
+    assert result.as_dict(fields) == e.as_dict(fields)
+    assert result.tags == e.tags
+    assert result.type_class == e.type_class
+    assert result.timestamp_ns == e.timestamp_ns
+    assert result.priority == e.priority
+
+
+def test_encode_and_decode():
+    codec = make_codec()
+    e = make_event()
+    data = codec.encode(e)
+    assert isinstance(data, bytes)
+    assert len(data) < len(e.json())
+    result = codec.decode(data)
+    assert_same(result, e)
+    assert result.status == EventStatus.PUBLISHED
+
+    # minimal event, ID not being a UUID
+    e = Event(GenericEventType)
+    e.id = 'my-id'
+    e.timestamp_ns = None
+    result = codec.decode(codec.encode(e))
+    assert result.id == 'my-id'
+    assert result.payload is None
+    assert result.timestamp_ns is None
+    assert result.status == EventStatus.UNPUBLISHED
+
+
+def test_encode_and_decode_values():
+    codec = make_codec()
+    payload = {1: 'one', 'big': -2 ** 70, 'raw': b'\x00\x01', 'seq': (1, 2),
+               'flags': [True, False]}
+    result = codec.decode(codec.encode(Event(GenericEventType,
+                                             payload=payload)))
+    assert result.payload == {1: 'one', 'big': -2 ** 70, 'raw': b'\x00\x01',
+                              'seq': [1, 2], 'flags': [True, False]}
+
+
+def test_encode_unsupported_values():
+    codec = make_codec()
+    with pytest.raises(TypeError):
+        codec.encode(Event(GenericEventType, payload=dict(a=object())))
+
+
+def test_register():
+    codec = make_codec()
+    codec.register(MetricEventType, code=1)
+    e = make_event()
+    data = codec.encode(e)
+    assert len(data) < len(make_codec().encode(e))
+    assert_same(codec.decode(data), e)
+    # other codecs must register the same code
+    with pytest.raises(UnregisteredEventTypeError):
+        make_codec().decode(data)
+    with pytest.raises(AssertionError):
+        codec.register(GenericEventType, code=1)
+    with pytest.raises(AssertionError):
+        codec.register(EventType)
+
+
+def test_plain_eventtypes_must_be_registered():
+    et = EventType('{"type": "object"}')
+    e = Event(et, payload=dict(a=1))
+    codec = make_codec()
+    data = codec.encode(e)
+    with pytest.raises(UnregisteredEventTypeError):
+        codec.decode(data)
+    codec.register(et)
+    assert codec.decode(data).type is et
+
+
+def test_unregistered_type_ids_are_not_imported():
+    e = make_event()
+    data = make_codec().encode(e)
+    with pytest.raises(UnregisteredEventTypeError):
+        EventCodec().decode(data)
+
+    # event types registered on a registry are resolved
+    registry = EventTypesRegistry()
+    codec = EventCodec(eventtypes=registry)
+    with pytest.raises(UnregisteredEventTypeError):
+        codec.decode(data)
+    registry.register(MetricEventType)
+    assert_same(codec.decode(data), e)
+    registry.remove(MetricEventType)
+    with pytest.raises(UnregisteredEventTypeError):
+        codec.decode(data)
+
+    # importing must be enabled explicitly
+    assert_same(EventCodec(import_types=True).decode(data), e)
+
+
+def test_unresolvable_type_ids():
+    codec = EventCodec(import_types=True)
+    for ref in ['nowhere.Nothing', 'baroque.entities.event.Event',
+                'baroque.entities.event.nothing', 7]:
+        with pytest.raises(UnregisteredEventTypeError):
+            codec.eventtype_of(ref)
+
+
+def test_decode_failures():
+    codec = make_codec()
+    data = codec.encode(make_event())
+    with pytest.raises(EventDecodeError):
+        codec.decode(data[:-3])
+    with pytest.raises(EventDecodeError):
+        codec.decode(data + b'\x00')
+    with pytest.raises(EventDecodeError):
+        codec.decode(b'')
+
+
+def test_encode_many_and_decode_many():
+    codec = make_codec()
+    events = [make_event() for _ in range(5)]
+    data = codec.encode_many(events)
+    results = list(codec.decode_many(data))
+    assert len(results) == 5
+    for result, e in zip(results, events):
+        assert_same(result, e)
+    assert list(codec.decode_many(b'')) == []
+    with pytest.raises(EventDecodeError):
+        list(codec.decode_many(data[:-1]))
+
+
+def test_dump_and_load():
+    codec = make_codec()
+    events = [make_event() for _ in range(5)]
+    stream = io.BytesIO()
+    assert codec.dump(events, stream) == 5
+    assert stream.getvalue() == codec.encode_many(events)
+    stream.seek(0)
+    results = codec.load(stream)
+    assert_same(next(results), events[0])
+    assert len(list(results)) == 4
+
+    with pytest.raises(EventDecodeError):
+        list(codec.load(io.BytesIO(stream.getvalue()[:-1])))
+    with pytest.raises(EventDecodeError):
+        list(codec.load(io.BytesIO(b'\xff')))
+
+
+def test_payload_layouts():
+    codec = make_codec()
+    e = make_event()
+    laid_out = codec.encode(e)
+    assert len(laid_out) < len(make_codec(layouts=False).encode(e))
+    assert_same(codec.decode(laid_out), e)
+    assert make_codec(layouts=False).decode(laid_out).payload == e.payload
+
+    # payloads not fitting the layout are written as they are
+    e = Event(MetricEventType, payload=dict(metric='temperature'))
+    assert codec.decode(codec.encode(e)).payload == e.payload
+    e = Event(MetricEventType, payload=None)
+    assert codec.decode(codec.encode(e)).payload is None
+
+
+def test_metric_streams():
+    codec = make_codec()
+    codec.register(MetricEventType, code=1)
+    events = [Event(MetricEventType,
+                    payload=dict(metric='temperature', value=20. + i,
+                                 timestamp=1700000000 + i))
+              for i in range(100)]
+    data = codec.encode_many(events)
+    # flags, ID, type code, timestamp, priority, owner, description and
+    # payload: selectors, 2 packed numbers, interned metric, no meta
+    assert len(data) < 1 + 100 * (1 + 1 + 16 + 1 + 8 + 3 + 1 + 16 + 1 + 1 + 1)
+    assert len(data) * 5 < sum(len(e.json()) for e in events)
+    for result, e in zip(codec.decode_many(data), events):
+        assert_same(result, e)
+
+
+def test_streams_can_be_concatenated():
+    codec = make_codec()
+    first = [make_event() for _ in range(3)]
+    second = [make_event() for _ in range(2)]
+    data = codec.encode_many(first) + codec.encode_many(second)
+    results = list(codec.decode_many(data))
+    assert len(results) == 5
+    for result, e in zip(results, first + second):
+        assert_same(result, e)
+
+    stream = io.BytesIO()
+    codec.dump(first, stream)
+    codec.dump(second, stream)
+    stream.seek(0)
+    assert len(list(codec.load(stream))) == 5
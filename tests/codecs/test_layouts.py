@@ -0,0 +1,85 @@
+import struct
+from baroque.codecs.layouts import PayloadLayout, INT64, DOUBLE, STRING, ANY
+from baroque.codecs.values import StringTable
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType, \
+    StateTransitionEventType, DataOperationEventType
+
+
+def roundtrip(layout, payload):
+    kinds = layout.kinds_of(payload)
+    assert kinds is not None
+    buf = bytearray()
+    layout.write(buf, payload, kinds, StringTable())
+    result, pos = layout.read(buf, 0, StringTable())
+    assert pos == len(buf)
+    return result, buf
+
+
+def test_from_schema():
+    layout = PayloadLayout.from_schema(MetricEventType().jsonschema)
+    assert layout.fields == (('metric', (STRING, INT64, DOUBLE)),
+                             ('value', (STRING, INT64, DOUBLE)),
+                             ('timestamp', (STRING, INT64, DOUBLE)))
+    layout = PayloadLayout.from_schema(StateTransitionEventType().jsonschema)
+    assert [name for name, _ in layout.fields] == \
+        ['from_status', 'to_status', 'trigger']
+    layout = PayloadLayout.from_schema(DataOperationEventType().jsonschema)
+    assert layout.fields == (('datum', (ANY,)), ('operation', (STRING,)),
+                             ('timestamp', (INT64, DOUBLE, STRING)))
+    assert PayloadLayout.from_schema(GenericEventType().jsonschema) is None
+    assert PayloadLayout.from_schema('not json') is None
+    assert PayloadLayout.from_schema('''{"properties": {"payload": {
+        "required": []}}}''') is None
+    layout = PayloadLayout.from_schema('''{"properties": {"payload": {
+        "required": ["a"]}}}''')
+    assert layout.fields == (('a', (ANY,)),)
+
+
+def test_kinds_of():
+    layout = PayloadLayout.from_schema(DataOperationEventType().jsonschema)
+    assert layout.kinds_of(dict(datum=dict(pk=1), operation='insert',
+                                timestamp=12)) == (ANY, STRING, INT64)
+    assert layout.kinds_of(dict(datum=1, operation='insert',
+                                timestamp=1.5)) == (ANY, STRING, DOUBLE)
+    assert layout.kinds_of(dict(datum=1, operation='insert',
+                                timestamp=2 ** 64)) is None
+    assert layout.kinds_of(dict(datum=1, operation=1, timestamp=1)) is None
+    assert layout.kinds_of(dict(datum=1, operation='insert')) is None
+    assert layout.kinds_of(None) is None
+
+
+def test_write_and_read():
+    layout = PayloadLayout.from_schema(MetricEventType().jsonschema)
+    payload = dict(metric='temperature', value=21.5, timestamp=1700000000,
+                   meta=dict(unit='C'))
+    result, buf = roundtrip(layout, payload)
+    assert result == payload
+    assert type(result['timestamp']) == int
+    # 1 selectors byte, 2 packed numbers, 1 string, 1 dict of other fields
+    assert buf[0] == (0 | 2 << 2 | 1 << 4)
+    assert struct.unpack_from('<dq', buf, 1) == (21.5, 1700000000)
+
+    payload = dict(metric=3, value='high', timestamp='yesterday')
+    result, buf = roundtrip(layout, payload)
+    assert result == payload
+
+    layout = PayloadLayout.from_schema(DataOperationEventType().jsonschema)
+    payload = dict(datum=dict(pk=3, name='x'), operation='update',
+                   timestamp=12.5)
+    assert roundtrip(layout, payload)[0] == payload
+
+
+def test_strings_are_interned():
+    layout = PayloadLayout.from_schema(StateTransitionEventType().jsonschema)
+    payload = dict(from_status='running', to_status='stopped',
+                   trigger='user')
+    strings = StringTable()
+    first = bytearray()
+    layout.write(first, payload, layout.kinds_of(payload), strings)
+    second = bytearray()
+    layout.write(second, payload, layout.kinds_of(payload), strings)
+    assert len(second) < len(first)
+    assert len(second) == 1 + 3 + 1
+    strings = StringTable()
+    assert layout.read(first, 0, strings)[0] == payload
+    assert layout.read(second, 0, strings)[0] == payload
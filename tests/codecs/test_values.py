@@ -0,0 +1,69 @@
+import pytest
+from baroque.codecs import values
+
+
+def test_zigzag():
+    for n in [0, 1, -1, 63, -64, 2 ** 70, -2 ** 70]:
+        assert values.zigzag(n) >= 0
+        assert values.unzigzag(values.zigzag(n)) == n
+    assert values.zigzag(-1) == 1
+    assert values.zigzag(1) == 2
+
+
+def test_uvarint():
+    buf = bytearray()
+    for n in [0, 127, 128, 300, 2 ** 64]:
+        values.write_uvarint(buf, n)
+    assert buf[:2] == b'\x00\x7f'
+    pos = 0
+    for n in [0, 127, 128, 300, 2 ** 64]:
+        result, pos = values.read_uvarint(buf, pos)
+        assert result == n
+    assert pos == len(buf)
+
+
+def test_values():
+    data = [None, True, False, 0, -5, 2 ** 80, 1.5, 'città', b'\x00',
+            [1, [2]], {1: 'a', 'b': dict(c=None)}]
+    buf = bytearray()
+    for value in data:
+        values.write_value(buf, value)
+    pos = 0
+    for value in data:
+        result, pos = values.read_value(buf, pos)
+        assert result == value
+        assert type(result) == type(value)
+    assert pos == len(buf)
+
+    buf = bytearray()
+    values.write_value(buf, (1, 2))
+    assert values.read_value(buf, 0)[0] == [1, 2]
+    with pytest.raises(TypeError):
+        values.write_value(bytearray(), set())
+    with pytest.raises(ValueError):
+        values.read_value(b'\xff', 0)
+    with pytest.raises(IndexError):
+        values.read_value(b'\x05\x09ab', 0)
+
+
+def test_string_table():
+    writer = values.StringTable()
+    buf = bytearray()
+    for s in ['temperature', 'humidity', 'temperature', 'temperature']:
+        writer.write(buf, s)
+    assert len(writer) == 2
+    assert len(buf) == 2 * 1 + len('temperature') + len('humidity') + 2
+
+    reader = values.StringTable()
+    pos = 0
+    result = list()
+    for _ in range(4):
+        s, pos = reader.read(buf, pos)
+        result.append(s)
+    assert result == ['temperature', 'humidity', 'temperature', 'temperature']
+    assert len(reader) == 2
+    # references to strings never seen
+    with pytest.raises(IndexError):
+        values.StringTable().read(buf, len(buf) - 1)
+    reader.clear()
+    assert len(reader) == 0
@@ -0,0 +1,108 @@
+import threading
+import pytest
+from baroque.datastructures.queues import BoundedQueue, OverflowPolicy
+from baroque.exceptions.dispatch import QueueFullError, QueueClosedError
+
+
+def test_constructor():
+    q = BoundedQueue(maxsize=3)
+    assert q.maxsize == 3
+    assert q.overflow == OverflowPolicy.BLOCK
+    assert len(q) == 0
+    assert q.dropped == 0
+    assert not q.closed
+    assert BoundedQueue(maxsize=None).maxsize == 0
+    with pytest.raises(AssertionError):
+        BoundedQueue(overflow='unknown')
+        pytest.fail()
+
+
+def test_put_and_get():
+    q = BoundedQueue(maxsize=3)
+    for i in range(3):
+        assert q.put(i)
+    assert len(q) == 3
+    assert [q.get() for _ in range(3)] == [0, 1, 2]
+    assert len(q) == 0
+
+
+def test_unbounded_queue():
+    q = BoundedQueue()
+    for i in range(1000):
+        assert q.put(i)
+    assert len(q) == 1000
+
+
+def test_overflow_drop_newest():
+    q = BoundedQueue(maxsize=2, overflow=OverflowPolicy.DROP_NEWEST)
+    assert q.put(1)
+    assert q.put(2)
+    assert not q.put(3)
+    assert q.dropped == 1
+    assert [q.get(), q.get()] == [1, 2]
+
+
+def test_overflow_drop_oldest():
+    q = BoundedQueue(maxsize=2, overflow=OverflowPolicy.DROP_OLDEST)
+    assert q.put(1)
+    assert q.put(2)
+    assert q.put(3)
+    assert q.dropped == 1
+    assert [q.get(), q.get()] == [2, 3]
+    q.task_done()
+    q.task_done()
+    assert q.join(timeout=1)
+
+
+def test_overflow_raise():
+    q = BoundedQueue(maxsize=1, overflow=OverflowPolicy.RAISE)
+    q.put(1)
+    with pytest.raises(QueueFullError):
+        q.put(2)
+        pytest.fail()
+    assert len(q) == 1
+
+
+def test_overflow_block():
+    q = BoundedQueue(maxsize=1)
+    q.put(1)
+    with pytest.raises(QueueFullError):
+        q.put(2, timeout=0.01)
+        pytest.fail()
+
+    t = threading.Timer(0.05, q.get)
+    t.start()
+    assert q.put(2, timeout=5)
+    t.join()
+    assert q.get() == 2
+
+
+def test_join():
+    q = BoundedQueue()
+    assert q.join(timeout=0.01)
+    q.put(1)
+    assert not q.join(timeout=0.01)
+    q.get()
+    q.task_done()
+    assert q.join(timeout=0.01)
+
+
+def test_close():
+    q = BoundedQueue()
+    q.put(1)
+    q.close()
+    with pytest.raises(QueueClosedError):
+        q.put(2)
+        pytest.fail()
+    assert q.get() == 1
+    assert q.get() is None
+
+
+def test_close_wakes_up_consumers():
+    q = BoundedQueue()
+    got = list()
+    t = threading.Thread(target=lambda: got.append(q.get()))
+    t.start()
+    q.close()
+    t.join(timeout=5)
+    assert got == [None]
@@ -0,0 +1,85 @@
+import pytest
+from baroque.datastructures.coalescers import Coalescer, CoalescingMode
+from baroque.entities.event import Event
+from baroque.defaults.eventtypes import GenericEventType
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_constructor():
+    c = Coalescer(1.5, mode=CoalescingMode.MERGE)
+    assert c.window == 1.5
+    assert c.mode == CoalescingMode.MERGE
+    assert len(c) == 0
+    with pytest.raises(AssertionError):
+        Coalescer(0)
+        pytest.fail()
+    with pytest.raises(AssertionError):
+        Coalescer(1, mode='unknown')
+        pytest.fail()
+
+
+def test_keep_last():
+    clock = Clock()
+    c = Coalescer(1, clock=clock)
+    e1 = Event(GenericEventType(), payload=dict(a=1))
+    e2 = Event(GenericEventType(), payload=dict(b=2))
+    e3 = Event(GenericEventType())
+    assert c.add('k', e1, 'ctx1')
+    assert not c.add('k', e2, 'ctx2')
+    assert c.add('other', e3)
+    assert len(c) == 2
+    assert c.next_deadline() == 1
+    assert c.due() == []
+    clock.now = 1
+    assert c.due() == [(e2, 'ctx2'), (e3, None)]
+    assert e2.payload == dict(b=2)
+    assert len(c) == 0
+    assert c.next_deadline() is None
+
+
+def test_merge():
+    c = Coalescer(1, mode=CoalescingMode.MERGE, clock=Clock())
+    e1 = Event(GenericEventType(), payload=dict(a=1, b=1))
+    e1.tags.add('x')
+    e2 = Event(GenericEventType(), payload=dict(b=2))
+    e2.tags.add('y')
+    c.add('k', e1)
+    c.add('k', e2)
+    assert c.drain() == [(e2, None)]
+    assert e2.payload == dict(a=1, b=2)
+    assert e2.tags == {'x', 'y'}
+
+
+def test_window_is_not_extended():
+    clock = Clock()
+    c = Coalescer(1, clock=clock)
+    c.add('k', Event(GenericEventType()))
+    clock.now = 0.9
+    e = Event(GenericEventType())
+    c.add('k', e)
+    clock.now = 1
+    assert c.due() == [(e, None)]
+
+
+def test_windows_close_in_order():
+    clock = Clock()
+    c = Coalescer(1, clock=clock)
+    events = list()
+    for i in range(5):
+        clock.now = i * 0.1
+        events.append(Event(GenericEventType()))
+        c.add(i, events[-1])
+    c.add(0, events[0])   # coalescing does not reorder windows
+    assert c.next_deadline() == 1
+    clock.now = 1.25
+    assert c.due() == [(e, None) for e in events[:3]]
+    assert c.next_deadline() == pytest.approx(1.3)
+    assert c.due() == []
+    assert len(c) == 2
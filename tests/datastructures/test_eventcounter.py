@@ -51,3 +51,44 @@ def test_dont_count_twice_eventtypes():
 
 def test_print():
     print(EventCounter())
+
+
+def test_increment_counting_many():
+    eventtype1 = GenericEventType()
+    eventtype2 = MetricEventType()
+    c = EventCounter()
+    c.increment_counting_many([Event(eventtype1), Event(eventtype2),
+                               Event(eventtype1)])
+    assert c.count_all() == 3
+    assert c.count(eventtype1) == 2
+    assert c.count(eventtype2) == 1
+
+    c.increment_counting_many([])
+    assert c.count_all() == 3
+
+    with pytest.raises(AssertionError):
+        c.increment_counting_many(['not-an-event'])
+
+
+def test_limited_counting():
+    c = EventCounter()
+    assert c.count_limited() == 0
+    c.increment_limited(Event(GenericEventType()), 'drop')
+    c.increment_limited(Event(GenericEventType()), 'drop')
+    c.increment_limited(Event(MetricEventType()), 'delay')
+    assert c.count_limited() == 3
+    assert c.count_limited('drop') == 2
+    assert c.count_limited('delay') == 1
+    assert c.count_limited('reroute') == 0
+    assert c.count_all() == 0
+    with pytest.raises(AssertionError):
+        c.increment_limited('not-an-event', 'drop')
+        pytest.fail()
+
+
+def test_coalesced_counting():
+    c = EventCounter()
+    assert c.count_coalesced() == 0
+    c.increment_coalesced(Event(GenericEventType()))
+    assert c.count_coalesced() == 1
+    assert c.count_all() == 0
@@ -37,6 +37,8 @@ def test_magic_methods():
     bag.add([et])
     assert len(bag) == 1
     assert et in bag
+    assert GenericEventType in bag
+    assert MetricEventType not in bag
     for _ in bag:
         pass
 
@@ -18,6 +18,22 @@ def test_register():
         pytest.fail()
 
 
+def test_register_does_not_instantiate_types():
+    class CountingEventType(GenericEventType):
+        instances = 0
+
+        def __init__(self):
+            CountingEventType.instances += 1
+            GenericEventType.__init__(self)
+
+    reg = EventTypesRegistry()
+    reg.register(CountingEventType)
+    assert CountingEventType in reg
+    reg.remove(CountingEventType)
+    assert CountingEventType not in reg
+    assert CountingEventType.instances == 0
+
+
 def test_remove():
     reg = EventTypesRegistry()
     reg.register(GenericEventType())
@@ -45,6 +61,36 @@ def test_remove_all():
     assert reg.count() == 0
 
 
+def test_supertypes():
+    class TemperatureEventType(MetricEventType):
+        pass
+
+    reg = EventTypesRegistry(supertypes=True)
+    reg.register(MetricEventType)
+    assert TemperatureEventType in reg
+    assert TemperatureEventType() in reg
+    assert GenericEventType not in reg
+    # subtypes are not registered themselves
+    assert reg.count() == 1
+    reg.remove(MetricEventType)
+    assert TemperatureEventType not in reg
+    reg.register(MetricEventType)
+    reg.set_supertypes(False)
+    assert TemperatureEventType not in reg
+
+
+def test_with_type_id():
+    reg = EventTypesRegistry()
+    type_id = 'baroque.defaults.eventtypes.MetricEventType'
+    assert reg.with_type_id(type_id) is None
+    reg.register(MetricEventType)
+    reg.register(GenericEventType)
+    assert reg.with_type_id(type_id) is MetricEventType
+    assert reg.with_type_id('nowhere.Nothing') is None
+    reg.remove(MetricEventType)
+    assert reg.with_type_id(type_id) is None
+
+
 def test_magic_len():
     reg = EventTypesRegistry()
     reg.register(GenericEventType())
@@ -56,6 +102,8 @@ def test_magic_contains():
     reg.register(GenericEventType())
     assert GenericEventType() in reg
     assert MetricEventType() not in reg
+    assert GenericEventType in reg
+    assert MetricEventType not in reg
 
 
 def test_print():
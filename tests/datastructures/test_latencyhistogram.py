@@ -0,0 +1,94 @@
+import gc
+import pytest
+from baroque.datastructures.histograms import LatencyHistogram, \
+    LatencyHistograms, DEFAULT_BUCKETS
+
+
+def test_constructor():
+    h = LatencyHistogram()
+    assert h.bounds == DEFAULT_BUCKETS
+    assert h.count() == 0
+    assert h.mean() is None
+    assert h.percentile(50) is None
+    with pytest.raises(AssertionError):
+        LatencyHistogram([])
+        pytest.fail()
+    with pytest.raises(AssertionError):
+        LatencyHistogram([1, 1, 2])
+        pytest.fail()
+
+
+def test_record():
+    h = LatencyHistogram([1, 10, 100])
+    h.record(0.0005)  # 0.5 ms
+    h.record(0.001)   # 1 ms, on the bound
+    h.record(0.005)
+    h.record(2.)      # above the highest bound
+    assert h.count() == 4
+    assert len(h) == 4
+    assert h.buckets() == [(1, 2), (10, 1), (100, 0), (float('inf'), 1)]
+    assert h.max == pytest.approx(2000.)
+    assert h.mean() == pytest.approx((0.5 + 1 + 5 + 2000) / 4)
+
+
+def test_percentile():
+    h = LatencyHistogram([1, 10, 100])
+    for _ in range(90):
+        h.record(0.0005)
+    for _ in range(9):
+        h.record(0.05)
+    h.record(0.5)
+    assert h.percentile(0) == 1
+    assert h.percentile(50) == 1
+    assert h.percentile(90) == 1
+    assert h.percentile(99) == 100
+    assert h.percentile(100) == pytest.approx(500.)
+    with pytest.raises(AssertionError):
+        h.percentile(101)
+        pytest.fail()
+
+
+def test_percentile_capped_by_max():
+    h = LatencyHistogram([1, 10, 100])
+    h.record(0.002)
+    assert h.percentile(50) == pytest.approx(2.)
+
+
+def test_histograms():
+    hs = LatencyHistograms([1, 10])
+    assert len(hs) == 0
+    assert hs.get('validation', int) is None
+    hs.record('validation', int, 0.0005)
+    hs.record('validation', int, 0.005)
+    hs.record('validation', str, 0.0005)
+    hs.record('counting', int, 0.0005)
+    assert len(hs) == 3
+    assert 'validation' in hs
+    assert 'persistence' not in hs
+    assert sorted(hs.stages()) == ['counting', 'validation']
+    assert hs.get('validation', int).count() == 2
+    assert hs.get('validation', int).bounds == (1, 10)
+    assert set(hs.of('validation')) == {int, str}
+    assert hs.of('persistence') == dict()
+    hs.clear()
+    assert len(hs) == 0
+
+
+def test_histograms_keyed_weakly():
+    class Key:
+        pass
+
+    hs = LatencyHistograms()
+    kept, dropped = Key(), Key()
+    hs.record('reactor', kept, 0.001)
+    hs.key_weakly('reactor')
+    hs.record('reactor', dropped, 0.001)
+    assert len(hs) == 2
+    del dropped
+    gc.collect()
+    assert list(hs.of('reactor')) == [kept]
+    hs.clear()
+    hs.record('reactor', kept, 0.001)
+    del kept
+    gc.collect()
+    assert len(hs) == 0
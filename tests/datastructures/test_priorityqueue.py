@@ -0,0 +1,57 @@
+import pytest
+from baroque.datastructures.queues import PriorityQueue, OverflowPolicy
+
+
+def priority(item):
+    return item[0]
+
+
+def test_constructor():
+    q = PriorityQueue(priority, maxsize=3, aging=10)
+    assert q.maxsize == 3
+    assert q.aging == 10
+    assert len(q) == 0
+    with pytest.raises(AssertionError):
+        PriorityQueue(priority, aging=-1)
+        pytest.fail()
+
+
+def test_strict_priorities():
+    q = PriorityQueue(priority, aging=0)
+    for item in [(0, 'a'), (1, 'b'), (0, 'c'), (2, 'd'), (1, 'e')]:
+        q.put(item)
+    result = [q.get()[1] for _ in range(5)]
+    assert result == ['d', 'b', 'e', 'a', 'c']
+
+
+def test_aging():
+    q = PriorityQueue(priority, aging=3)
+    for i in range(5):
+        q.put((0, i))
+    q.put((1, 'high'))
+    # the high priority item overtakes the items put less than 3 insertions
+    # before it only
+    result = [q.get()[1] for _ in range(6)]
+    assert result == [0, 1, 2, 'high', 3, 4]
+
+
+def test_no_starvation():
+    q = PriorityQueue(priority, aging=10)
+    q.put((0, 'low'))
+    served = list()
+    for i in range(100):
+        q.put((1, i))
+        served.append(q.get()[1])
+        if 'low' in served:
+            break
+    assert 'low' in served
+
+
+def test_overflow_drop_oldest():
+    q = PriorityQueue(priority, maxsize=3, aging=0,
+                      overflow=OverflowPolicy.DROP_OLDEST)
+    for item in [(2, 'a'), (0, 'b'), (1, 'c'), (3, 'd')]:
+        q.put(item)
+    # the item that would be served last is discarded
+    assert q.dropped == 1
+    assert [q.get()[1] for _ in range(3)] == ['d', 'a', 'c']
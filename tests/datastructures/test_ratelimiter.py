@@ -0,0 +1,91 @@
+from baroque.datastructures.limiters import RateLimiter
+from baroque.entities.event import Event
+from baroque.entities.topic import Topic
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_constructor():
+    l = RateLimiter(eventtypes={GenericEventType: (1, None)},
+                    topics={'t': (1, 2)}, owners={'me': (1, 1)})
+    assert len(l) == 3
+    assert len(RateLimiter()) == 0
+
+
+def test_eventtype_limits():
+    l = RateLimiter(eventtypes={GenericEventType: (1, 2)}, clock=Clock())
+    assert l.acquire(Event(GenericEventType())) == 0
+    assert l.acquire(Event(GenericEventType())) == 0
+    assert l.acquire(Event(GenericEventType())) > 0
+    assert l.acquire(Event(MetricEventType())) == 0  # no limit
+
+
+def test_owner_limits():
+    clock = Clock()
+    l = RateLimiter(owners={'me': (1, 1), '*': (1, 2)}, clock=clock)
+    assert l.acquire(Event(GenericEventType(), owner='me')) == 0
+    assert l.acquire(Event(GenericEventType(), owner='me')) > 0
+    # each other owner has its own bucket
+    for owner in ['a', 'b']:
+        assert l.acquire(Event(GenericEventType(), owner=owner)) == 0
+        assert l.acquire(Event(GenericEventType(), owner=owner)) == 0
+        assert l.acquire(Event(GenericEventType(), owner=owner)) > 0
+    assert l.acquire(Event(GenericEventType())) == 0  # no owner
+    clock.now = 1
+    assert l.acquire(Event(GenericEventType(), owner='me')) == 0
+
+
+def test_topic_limits():
+    l = RateLimiter(topics={'t': (1, 1)}, clock=Clock())
+    t = Topic('t', [GenericEventType()])
+    assert l.acquire(Event(GenericEventType()), t) == 0
+    assert l.acquire(Event(GenericEventType()), t) > 0
+    assert l.acquire(Event(GenericEventType())) == 0
+
+
+def test_all_limits_must_allow():
+    l = RateLimiter(eventtypes={GenericEventType: (1, 2)},
+                    owners={'me': (1, 1)}, clock=Clock())
+    assert l.acquire(Event(GenericEventType(), owner='me')) == 0
+    # denied by the owner limit: no token is taken from the type limit
+    assert l.acquire(Event(GenericEventType(), owner='me')) > 0
+    assert l.acquire(Event(GenericEventType())) == 0
+    assert l.acquire(Event(GenericEventType())) > 0
+
+
+def test_carry_over():
+    clock = Clock()
+    l = RateLimiter(owners={'me': (1, 1), '*': (1, 1)}, clock=clock)
+    for owner in ['me', 'a']:
+        assert l.acquire(Event(GenericEventType(), owner=owner)) == 0
+    # unchanged limits keep their buckets, changed ones start afresh
+    new = RateLimiter(owners={'me': (1, 1), '*': (2, 2)}, clock=clock)
+    new.carry_over(l)
+    assert new.acquire(Event(GenericEventType(), owner='me')) > 0
+    assert new.acquire(Event(GenericEventType(), owner='a')) == 0
+
+
+def test_idle_buckets_are_dropped():
+    clock = Clock()
+    l = RateLimiter(owners={'*': (1, 1)}, clock=clock)
+    l.SWEEP_THRESHOLD = l.sweep_at = 4
+    for i in range(4):
+        assert l.acquire(Event(GenericEventType(), owner=str(i))) == 0
+    assert len(l.buckets) == 4
+
+    # buckets still refilling are kept, full ones are dropped
+    clock.now = 1
+    assert l.acquire(Event(GenericEventType(), owner='0')) == 0
+    for i in range(4, 8):
+        l.acquire(Event(GenericEventType(), owner=str(i)))
+    assert ('owner', '0') in l.buckets
+    assert ('owner', '1') not in l.buckets
+    assert len(l.buckets) == 5
+    assert l.acquire(Event(GenericEventType(), owner='0')) > 0
@@ -1,3 +1,4 @@
+import collections
 import pytest
 from baroque.entities.reactor import Reactor
 from baroque.datastructures.bags import ReactorsBag
@@ -55,6 +56,22 @@ def test_remove_all():
     assert bag.count() == 0
 
 
+def test_on_change():
+    changes = list()
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    bag = ReactorsBag(on_change=lambda: changes.append(1))
+    bag.run(r1)
+    assert len(changes) == 1
+    bag.run(r1)  # no actual change
+    assert len(changes) == 1
+    bag.run(r2)
+    bag.remove(r1)
+    assert len(changes) == 3
+    bag.remove_all()
+    assert len(changes) == 4
+
+
 def test_magic_iter():
     r1 = ReactorFactory.stdout()
     r2 = ReactorFactory.stdout()
@@ -67,6 +84,32 @@ def test_magic_iter():
         assert isinstance(item, Reactor)
 
 
+class RacingDict(collections.OrderedDict):
+    """Runs a change right after its keys are read, as a concurrent thread
+    could."""
+    race = None
+
+    def __iter__(self):
+        keys = list(collections.OrderedDict.__iter__(self))
+        race, self.race = self.race, None
+        if race is not None:
+            race()
+        return iter(keys)
+
+
+def test_snapshot_racing_with_changes():
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    bag = ReactorsBag()
+    bag._reactors = RacingDict()
+    bag.run_many([r1, r2])
+    bag._reactors.race = lambda: bag.remove(r2)
+
+    # the snapshot taken while racing is not kept
+    assert bag.reactors == (r1, r2)
+    assert bag.reactors == (r1,)
+
+
 def test_magic_len():
     r1 = ReactorFactory.stdout()
     r2 = ReactorFactory.stdout()
@@ -92,3 +135,61 @@ def test_magic_contains():
 
 def test_print():
     print(ReactorsBag())
+
+
+def test_run_many():
+    changes = list()
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    bag = ReactorsBag(on_change=lambda: changes.append(1))
+    result = bag.run_many([r1, r2, r1])
+    assert result == [r1, r2, r1]
+    assert bag.reactors == (r1, r2)
+    assert len(changes) == 1
+    bag.run_many([r2])  # no actual change
+    assert len(changes) == 1
+    with pytest.raises(AssertionError):
+        bag.run_many([r1, 'not-a-reactor'])
+        pytest.fail()
+
+
+def test_remove_many():
+    changes = list()
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    r3 = ReactorFactory.stdout()
+    bag = ReactorsBag(on_change=lambda: changes.append(1))
+    bag.run_many([r1, r2, r3])
+    assert bag.remove_many([r3, r1, ReactorFactory.stdout()]) == 2
+    assert bag.reactors == (r2,)
+    assert len(changes) == 2
+    assert bag.remove_many([r1]) == 0
+    assert len(changes) == 2
+
+
+def test_remove_missing():
+    bag = ReactorsBag()
+    with pytest.raises(ValueError):
+        bag.remove(ReactorFactory.stdout())
+        pytest.fail()
+
+
+def test_insertion_order():
+    reactors = [ReactorFactory.stdout() for _ in range(10)]
+    bag = ReactorsBag()
+    bag.run_many(reactors)
+    bag.remove(reactors[3])
+    bag.run(reactors[3])
+    assert list(bag) == reactors[:3] + reactors[4:] + [reactors[3]]
+
+
+def test_unsubscribe_while_iterating():
+    reactors = [ReactorFactory.stdout() for _ in range(3)]
+    bag = ReactorsBag()
+    bag.run_many(reactors)
+    seen = list()
+    for r in bag:
+        seen.append(r)
+        bag.remove_all()
+    assert seen == reactors
+    assert len(bag) == 0
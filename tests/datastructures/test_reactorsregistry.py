@@ -52,6 +52,136 @@ def test_get_bag():
     assert result == reg.registered_types[type(et)]
 
 
+def test_get_reactors():
+    reg = ReactorsRegistry()
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    r3 = ReactorFactory.stdout()
+
+    # no reactors at all
+    result = reg.get_reactors(MetricEventType())
+    assert result == tuple()
+
+    # jolly reactors come first
+    reg.get_or_create_bag(MetricEventType).run(r1)
+    reg.get_jolly_bag().run(r2)
+    result = reg.get_reactors(MetricEventType())
+    assert result == (r2, r1)
+    assert reg.get_reactors(MetricEventType) is result  # with a type object
+    assert reg.get_reactors(GenericEventType()) == (r2,)
+
+    # subscriptions only rebuild the affected entries
+    generic_entry = reg.get_reactors(GenericEventType)
+    reg.get_bag(MetricEventType).run(r3)
+    assert reg.get_reactors(MetricEventType) == (r2, r1, r3)
+    assert reg.get_reactors(GenericEventType) is generic_entry
+
+    # unsubscriptions too
+    reg.get_bag(MetricEventType).remove(r1)
+    assert reg.get_reactors(MetricEventType) == (r2, r3)
+
+    # changes to the jolly bag affect all entries
+    reg.get_jolly_bag().remove(r2)
+    assert reg.get_reactors(MetricEventType) == (r3,)
+    assert reg.get_reactors(GenericEventType) == tuple()
+
+    reg.remove_all()
+    assert reg.get_reactors(MetricEventType) == tuple()
+
+
+class RacingBag(ReactorsBag):
+    """Runs a change right after its contents are read, as a concurrent
+    thread could."""
+    race = None
+
+    def __iter__(self):
+        reactors = self.reactors
+        race, self.race = self.race, None
+        if race is not None:
+            race()
+        return iter(reactors)
+
+
+def test_get_reactors_racing_with_changes():
+    reg = ReactorsRegistry()
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    reg.jolly_bag = RacingBag(on_change=reg._invalidate_all)
+    reg.get_or_create_bag(MetricEventType).run(r1)
+    reg.get_jolly_bag().run(r2)
+    reg.jolly_bag.race = lambda: reg.get_jolly_bag().remove(r2)
+
+    # the lookup racing with the change is not stored
+    assert reg.get_reactors(MetricEventType) == (r2, r1)
+    assert MetricEventType not in reg.dispatch_table
+    assert reg.get_reactors(MetricEventType) == (r1,)
+    assert reg.get_reactors(MetricEventType) is \
+        reg.dispatch_table[MetricEventType]
+
+
+def test_get_all_reactors():
+    reg = ReactorsRegistry()
+    assert reg.get_all_reactors() == []
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    r3 = ReactorFactory.stdout()
+    reg.get_or_create_bag(MetricEventType()).run(r2)
+    reg.get_or_create_bag(GenericEventType()).run(r2)
+    reg.get_or_create_bag(GenericEventType()).run(r3)
+    reg.to_any_event().run(r1)
+    assert reg.get_all_reactors() == [r1, r2, r3]
+
+
+class TemperatureEventType(MetricEventType):
+    pass
+
+
+class IndoorTemperatureEventType(TemperatureEventType):
+    pass
+
+
+def test_get_reactors_with_supertypes():
+    reg = ReactorsRegistry(supertypes=True)
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    r3 = ReactorFactory.stdout()
+    jolly = ReactorFactory.stdout()
+    reg.get_or_create_bag(MetricEventType).run(r1)
+    reg.get_or_create_bag(IndoorTemperatureEventType).run(r2)
+    reg.get_or_create_bag(IndoorTemperatureEventType).run(r1)
+    reg.to_any_event().run(jolly)
+
+    # most specific subscriptions first, each reactor once
+    assert reg.get_reactors(IndoorTemperatureEventType) == (jolly, r2, r1)
+    assert reg.get_reactors(TemperatureEventType()) == (jolly, r1)
+    assert reg.get_reactors(MetricEventType) == (jolly, r1)
+    assert reg.get_reactors(GenericEventType) == (jolly,)
+    assert IndoorTemperatureEventType in reg.get_event_types_registry()
+
+    # entries are cached per class...
+    assert reg.get_reactors(IndoorTemperatureEventType) is \
+        reg.get_reactors(IndoorTemperatureEventType)
+    # ... and rebuilt when the bag of a supertype changes
+    reg.to(MetricEventType).run(r3)
+    assert reg.get_reactors(IndoorTemperatureEventType) == (jolly, r2, r1, r3)
+    assert reg.get_reactors(TemperatureEventType) == (jolly, r1, r3)
+    reg.to(IndoorTemperatureEventType).remove(r2)
+    assert reg.get_reactors(IndoorTemperatureEventType) == (jolly, r1, r3)
+
+
+def test_set_supertypes():
+    reg = ReactorsRegistry()
+    r = ReactorFactory.stdout()
+    reg.get_or_create_bag(MetricEventType).run(r)
+    assert reg.get_reactors(TemperatureEventType) == tuple()
+    assert TemperatureEventType not in reg.get_event_types_registry()
+    reg.set_supertypes(True)
+    assert reg.get_reactors(TemperatureEventType) == (r,)
+    assert TemperatureEventType in reg.get_event_types_registry()
+    reg.set_supertypes(False)
+    assert reg.get_reactors(TemperatureEventType) == tuple()
+
+
 def test_to():
     reg = ReactorsRegistry()
     et = MetricEventType()
@@ -0,0 +1,36 @@
+import pytest
+from baroque.datastructures.limiters import TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_constructor():
+    b = TokenBucket(10, burst=20)
+    assert b.rate == 10
+    assert b.capacity == 20
+    assert b.tokens == 20
+    assert TokenBucket(10).capacity == 10
+    assert TokenBucket(0.5).capacity == 1
+    with pytest.raises(AssertionError):
+        TokenBucket(0)
+        pytest.fail()
+
+
+def test_consume_and_refill():
+    clock = Clock()
+    b = TokenBucket(2, burst=3, clock=clock)
+    assert all(b.consume() for _ in range(3))
+    assert not b.consume()
+    assert b.wait_time() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert b.consume()
+    assert not b.consume()
+    clock.now = 100
+    b.refill()
+    assert b.tokens == 3  # capped at capacity
@@ -1,6 +1,7 @@
 import pytest
 from baroque.entities.event import Event
 from baroque.entities.topic import Topic
+from baroque.entities.reactor import Reactor
 from baroque.defaults.eventtypes import MetricEventType, GenericEventType
 from baroque.defaults.reactors import ReactorFactory
 from baroque.datastructures.registries import TopicsRegistry
@@ -282,3 +283,83 @@ def test_magic_methods():
 
 def test_print():
     print(TopicsRegistry())
+
+
+def test_publish_many_on_topic():
+    reg = TopicsRegistry()
+    t = Topic('aaa', [MetricEventType()])
+    evts = [Event(MetricEventType()), Event(GenericEventType()),
+            Event(MetricEventType())]
+    reacted_on = list()
+    reg.register(t)
+    reg.on_topic_run(t, Reactor(lambda evt: reacted_on.append(evt)))
+    reg.publish_many_on_topic(evts, t)
+    assert reacted_on == [evts[0], evts[2]]
+
+    # failures
+    with pytest.raises(AssertionError):
+        reg.publish_many_on_topic([123], t)
+    with pytest.raises(AssertionError):
+        reg.publish_many_on_topic(evts, None)
+
+
+def test_get_reactors():
+    reg = TopicsRegistry()
+    t = Topic('aaa', [MetricEventType()])
+    r = ReactorFactory.stdout()
+    reg.register(t)
+    reg.on_topic_run(t, r)
+    assert reg.get_reactors(t, MetricEventType()) == (r,)
+    assert reg.get_reactors(t, GenericEventType()) == tuple()
+
+
+def test_get_all_reactors():
+    reg = TopicsRegistry()
+    assert reg.get_all_reactors() == []
+    t1 = Topic('aaa', [MetricEventType()])
+    t2 = Topic('bbb', [GenericEventType()])
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+    reg.register(t1)
+    reg.register(t2)
+    reg.on_topic_run(t1, r1)
+    reg.on_topic_run(t2, r1)
+    reg.on_topic_run(t2, r2)
+    assert reg.get_all_reactors() == [r1, r2]
+
+
+def test_on_topic_run_many():
+    reg = TopicsRegistry()
+    t = Topic('aaa', [MetricEventType()])
+    r1 = ReactorFactory.stdout()
+    r2 = ReactorFactory.stdout()
+
+    # failures
+    with pytest.raises(AssertionError):
+        reg.on_topic_run_many(None, [r1])
+    with pytest.raises(AssertionError):
+        reg.on_topic_run_many(t, [r1, 123])
+
+    # binding to a topic that is not yet registered is idempotent
+    reg.on_topic_run_many(t, [r1, r2])
+    assert len(reg.topics) == 0
+
+    reg.register(t)
+    reg.on_topic_run_many(t, [r1, r2, r1])
+    assert reg.get_reactors(t, MetricEventType()) == (r1, r2)
+
+
+def test_remove_from_topic():
+    reg = TopicsRegistry()
+    t = Topic('aaa', [MetricEventType()])
+    reactors = [ReactorFactory.stdout() for _ in range(5)]
+    with pytest.raises(AssertionError):
+        reg.remove_from_topic(None, reactors)
+    assert reg.remove_from_topic(t, reactors) == 0
+
+    reg.register(t)
+    reg.on_topic_run_many(t, reactors)
+    assert reg.remove_from_topic(t, reactors[1:4]) == 3
+    assert reg.get_reactors(t, MetricEventType()) == (reactors[0],
+                                                      reactors[4])
+    assert reg.remove_from_topic(t, reactors[1:4]) == 0
@@ -0,0 +1,22 @@
+from baroque.defaults import keys
+from baroque.entities.event import Event
+from baroque.defaults.eventtypes import GenericEventType, \
+    DataOperationEventType
+
+
+def test_datum_pk():
+    e = Event(DataOperationEventType(),
+              payload=dict(datum=dict(table='t', data_type='row', pk='123'),
+                           operation='update', meta=dict()))
+    assert keys.datum_pk(e) == '123'
+    assert keys.datum_pk(Event(GenericEventType())) is None
+    assert keys.datum_pk(Event(GenericEventType(), payload=dict())) is None
+
+
+def test_owner():
+    assert keys.owner(Event(GenericEventType(), owner='me')) == 'me'
+    assert keys.owner(Event(GenericEventType())) is None
+
+
+def test_eventtype():
+    assert keys.eventtype(Event(GenericEventType())) == 'GenericEventType'
@@ -0,0 +1,12 @@
+from baroque.dispatchers.base import Dispatcher
+
+
+def test_dispatch():
+    d = Dispatcher()
+    assert d.dispatch(lambda x, y: x + y, 1, 2) == 3
+
+
+def test_flush_and_close():
+    d = Dispatcher()
+    assert d.flush()
+    assert d.close()
@@ -0,0 +1,122 @@
+import threading
+import pytest
+from baroque.dispatchers.partitioned import PartitionedDispatcher
+from baroque.dispatchers.queued import QueuedDispatcher
+from baroque.entities.event import Event, _PENDING
+from baroque.defaults.eventtypes import GenericEventType
+from baroque.exceptions.dispatch import QueueClosedError
+
+
+def key(event):
+    return event.payload['key'] if event.payload else None
+
+
+def new_event(k, i=None):
+    return Event(GenericEventType(), payload=dict(key=k, i=i))
+
+
+def test_constructor():
+    d = PartitionedDispatcher(key, lanes=3, queue_size=10)
+    try:
+        assert len(d.lanes) == 3
+        assert all(isinstance(lane, QueuedDispatcher) for lane in d.lanes)
+        assert all(len(lane.threads) == 1 for lane in d.lanes)
+        assert d.dropped == 0
+    finally:
+        d.close()
+    with pytest.raises(AssertionError):
+        PartitionedDispatcher(key, lanes=0)
+        pytest.fail()
+    with pytest.raises(AssertionError):
+        PartitionedDispatcher('key')
+        pytest.fail()
+
+
+def test_lane_of():
+    d = PartitionedDispatcher(key, lanes=4)
+    try:
+        assert d.lane_of(new_event('a')) == d.lane_of(new_event('a'))
+        assert 0 <= d.lane_of(new_event('b')) < 4
+        assert 0 <= d.lane_of(Event(GenericEventType())) < 4
+
+        # events with no key are spread on lanes in turn, without their IDs
+        events = [Event(GenericEventType()) for _ in range(8)]
+        assert sorted(d.lane_of(e) for e in events) == [0, 0, 1, 1, 2, 2, 3, 3]
+        assert all(e._id is _PENDING for e in events)
+    finally:
+        d.close()
+
+
+def test_per_key_ordering():
+    seen = dict()
+    lock = threading.Lock()
+
+    def publish(event):
+        with lock:
+            seen.setdefault(event.payload['key'], list()).append(
+                event.payload['i'])
+
+    d = PartitionedDispatcher(key, lanes=4)
+    try:
+        for i in range(50):
+            for k in 'abcdef':
+                d.dispatch(publish, new_event(k, i))
+        assert d.flush(timeout=5)
+        assert sorted(seen) == list('abcdef')
+        assert all(seen[k] == list(range(50)) for k in seen)
+    finally:
+        d.close()
+
+
+def test_different_keys_in_parallel():
+    barrier = threading.Barrier(2, timeout=5)
+    d = PartitionedDispatcher(key, lanes=8)
+    try:
+        keys = list()
+        k = 0
+        while len(keys) < 2:  # two keys hashed to different lanes
+            if d.lane_of(new_event(k)) not in [d.lane_of(new_event(x))
+                                               for x in keys]:
+                keys.append(k)
+            k += 1
+        for k in keys:
+            d.dispatch(lambda e: barrier.wait(), new_event(k))
+        assert d.flush(timeout=5)
+    finally:
+        d.close()
+
+
+def test_batches_are_split_on_lanes():
+    batches = list()
+    lock = threading.Lock()
+
+    def publish_many(events, extra):
+        with lock:
+            batches.append(([e.payload['key'] for e in events], extra))
+
+    d = PartitionedDispatcher(key, lanes=4)
+    try:
+        events = [new_event(k) for k in 'abcabc']
+        d.dispatch(publish_many, events, 'extra')
+        assert d.flush(timeout=5)
+        assert sum(len(b[0]) for b in batches) == 6
+        assert all(extra == 'extra' for _, extra in batches)
+        for b, _ in batches:
+            assert len(set(d.lane_of(new_event(k)) for k in b)) == 1
+    finally:
+        d.close()
+
+
+def test_errors_and_close():
+    def fail(event):
+        raise FileNotFoundError()
+
+    d = PartitionedDispatcher(key, lanes=2)
+    d.dispatch(fail, new_event('a'))
+    with pytest.raises(FileNotFoundError):
+        d.flush(timeout=5)
+        pytest.fail()
+    assert d.close(timeout=5)
+    with pytest.raises(QueueClosedError):
+        d.dispatch(fail, new_event('a'))
+        pytest.fail()
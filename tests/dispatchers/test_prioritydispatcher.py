@@ -0,0 +1,46 @@
+import threading
+from baroque.dispatchers.priority import PriorityDispatcher
+from baroque.datastructures.queues import PriorityQueue
+from baroque.entities.event import Event
+from baroque.entities.eventtype import EventPriority
+from baroque.defaults.eventtypes import GenericEventType, \
+    StateTransitionEventType
+
+
+def test_constructor():
+    d = PriorityDispatcher(queue_size=10, aging=5)
+    try:
+        assert isinstance(d.queue, PriorityQueue)
+        assert d.queue.aging == 5
+    finally:
+        d.close()
+
+
+def test_priority():
+    low = Event(GenericEventType(), priority=EventPriority.LOW)
+    high = Event(StateTransitionEventType())
+    assert PriorityDispatcher._priority((None, (low,))) == EventPriority.LOW
+    assert PriorityDispatcher._priority((None, ([low, high],))) == \
+        EventPriority.HIGH
+    assert PriorityDispatcher._priority((None, ([],))) == \
+        EventPriority.NORMAL
+
+
+def test_high_priority_events_are_served_first():
+    gate = threading.Event()
+    served = list()
+    d = PriorityDispatcher(aging=0)
+    try:
+        d.dispatch(lambda e: gate.wait(5), Event(GenericEventType()))
+        while len(d.queue):  # the dispatcher thread is now busy
+            pass
+        bulk = [Event(GenericEventType()) for _ in range(10)]
+        for event in bulk:
+            d.dispatch(served.append, event)
+        alert = Event(StateTransitionEventType())
+        d.dispatch(served.append, alert)
+        gate.set()
+        assert d.flush(timeout=5)
+        assert served == [alert] + bulk
+    finally:
+        d.close()
@@ -0,0 +1,118 @@
+import threading
+import pytest
+from baroque.dispatchers.queued import QueuedDispatcher
+from baroque.datastructures.queues import OverflowPolicy
+from baroque.exceptions.dispatch import QueueFullError, QueueClosedError
+from baroque.executors.base import ReactionsHandle
+
+
+def test_constructor():
+    d = QueuedDispatcher(queue_size=10, dispatchers=2)
+    try:
+        assert d.queue.maxsize == 10
+        assert len(d.threads) == 2
+        assert all(t.is_alive() for t in d.threads)
+        assert d.dropped == 0
+    finally:
+        d.close()
+
+
+def test_dispatch_and_flush():
+    results = list()
+    d = QueuedDispatcher()
+    try:
+        for i in range(100):
+            assert d.dispatch(results.append, i) is None
+        assert d.flush(timeout=5)
+        assert results == list(range(100))  # single dispatcher keeps order
+    finally:
+        d.close()
+
+
+def test_dispatch_in_background():
+    threads = list()
+    d = QueuedDispatcher()
+    try:
+        d.dispatch(lambda: threads.append(threading.current_thread()))
+        d.flush(timeout=5)
+        assert threads[0] in d.threads
+    finally:
+        d.close()
+
+
+def test_handles_are_waited_on():
+    waited = list()
+
+    class FakeHandle(ReactionsHandle):
+        def wait(self, timeout=None):
+            waited.append(True)
+
+    d = QueuedDispatcher()
+    try:
+        d.dispatch(lambda: FakeHandle())
+        d.flush(timeout=5)
+        assert waited == [True]
+    finally:
+        d.close()
+
+
+def test_errors_are_raised_on_flush():
+    def fail():
+        raise FileNotFoundError()
+
+    d = QueuedDispatcher()
+    try:
+        d.dispatch(fail)
+        with pytest.raises(FileNotFoundError):
+            d.flush(timeout=5)
+            pytest.fail()
+        assert d.flush(timeout=5)  # errors are raised once
+    finally:
+        d.close()
+
+    d = QueuedDispatcher(propagate=False)
+    d.dispatch(fail)
+    assert d.flush(timeout=5)
+    d.close()
+
+
+def test_overflow():
+    gate = threading.Event()
+    d = QueuedDispatcher(queue_size=1, overflow=OverflowPolicy.DROP_NEWEST)
+    try:
+        d.dispatch(gate.wait, 5)   # taken by the dispatcher thread
+        while len(d.queue):
+            pass
+        d.dispatch(gate.wait, 5)   # fills the queue
+        d.dispatch(gate.wait, 5)   # dropped
+        assert d.dropped == 1
+        gate.set()
+    finally:
+        d.close()
+
+    gate = threading.Event()
+    d = QueuedDispatcher(queue_size=1, overflow=OverflowPolicy.RAISE)
+    try:
+        d.dispatch(gate.wait, 5)
+        while len(d.queue):
+            pass
+        d.dispatch(gate.wait, 5)
+        with pytest.raises(QueueFullError):
+            d.dispatch(gate.wait, 5)
+            pytest.fail()
+        gate.set()
+    finally:
+        d.close()
+
+
+def test_close_drains_the_queue():
+    results = list()
+    d = QueuedDispatcher()
+    for i in range(10):
+        d.dispatch(results.append, i)
+    assert d.close(timeout=5)
+    assert results == list(range(10))
+    assert not any(t.is_alive() for t in d.threads)
+    with pytest.raises(QueueClosedError):
+        d.dispatch(results.append, 10)
+        pytest.fail()
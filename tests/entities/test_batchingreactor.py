@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import pytest
+from baroque.entities.reactor import Reactor, BatchingReactor
+from baroque.entities.event import Event
+from baroque.defaults.eventtypes import GenericEventType
+
+
+def test_constructor():
+    r = BatchingReactor(lambda events: None, max_size=10, max_delay_ms=50)
+    assert isinstance(r, Reactor)
+    assert r.max_size == 10
+    assert r.max_delay_ms == 50
+    assert r.count_pending() == 0
+    assert r.count_batches() == 0
+    with pytest.raises(AssertionError):
+        BatchingReactor(lambda events: None, max_size=0)
+        pytest.fail()
+    with pytest.raises(AssertionError):
+        BatchingReactor(lambda events: None, max_delay_ms=0)
+        pytest.fail()
+
+    async def coro(events):
+        pass
+
+    with pytest.raises(AssertionError):
+        BatchingReactor(coro, max_delay_ms=10)
+        pytest.fail()
+
+
+def test_flush_on_size():
+    batches = list()
+    r = BatchingReactor(batches.append, max_size=3)
+    evts = [Event(GenericEventType()) for _ in range(7)]
+    for evt in evts:
+        r.react(evt)
+    assert batches == [evts[:3], evts[3:6]]
+    assert r.count_pending() == 1
+    assert r.count_batches() == 2
+    assert r.count_reactions() == 6
+    assert r.last_event_reacted() == evts[5].id
+    assert r.last_reacted_on() is not None
+
+
+def test_flush():
+    batches = list()
+    r = BatchingReactor(batches.append, max_size=100)
+    evts = [Event(GenericEventType()) for _ in range(2)]
+    for evt in evts:
+        r.react(evt)
+    r.flush()
+    assert batches == [evts]
+    r.flush()  # nothing held
+    assert len(batches) == 1
+    assert r.count_reactions() == 2
+
+
+def test_flush_on_delay():
+    delivered = threading.Event()
+    batches = list()
+
+    def reaction(events):
+        batches.append(events)
+        delivered.set()
+
+    r = BatchingReactor(reaction, max_size=100, max_delay_ms=20)
+    evts = [Event(GenericEventType()) for _ in range(3)]
+    for evt in evts:
+        r.react(evt)
+    assert delivered.wait(timeout=5)
+    assert batches == [evts]
+    assert r.count_pending() == 0
+
+
+def test_errors_on_delay_are_raised_on_flush():
+    failed = threading.Event()
+
+    def reaction(events):
+        failed.set()
+        raise FileNotFoundError()
+
+    r = BatchingReactor(reaction, max_delay_ms=10)
+    r.react(Event(GenericEventType()))
+    assert failed.wait(timeout=5)
+    while r.timer is not None:
+        pass
+    with pytest.raises(FileNotFoundError):
+        r.flush()
+        pytest.fail()
+    r.flush()
+
+
+def test_react_conditionally():
+    batches = list()
+    r = BatchingReactor(batches.append, condition=lambda e: e.owner == 'me',
+                        max_size=2)
+    r.react_conditionally(Event(GenericEventType(), owner='you'))
+    assert r.count_pending() == 0
+    r.react_conditionally(Event(GenericEventType(), owner='me'))
+    r.react_conditionally(Event(GenericEventType(), owner='me'))
+    assert len(batches) == 1
+
+
+def test_react_async():
+    batches = list()
+
+    async def reaction(events):
+        batches.append(events)
+
+    r = BatchingReactor(reaction, max_size=2)
+    evts = [Event(GenericEventType()) for _ in range(2)]
+    loop = asyncio.new_event_loop()
+    try:
+        for evt in evts:
+            loop.run_until_complete(r.react_async(evt))
+    finally:
+        loop.close()
+    assert batches == [evts]
+    assert r.count_batches() == 1
@@ -1,6 +1,13 @@
+import datetime
+import json
+import pickle
 import pytest
+import pytz
 from baroque.entities.event import Event, EventStatus
-from baroque.defaults.eventtypes import GenericEventType
+from baroque.utils import timestamp as ts
+from baroque.entities.eventtype import EventType, EventPriority, EVENT_FIELDS
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType, \
+    StateTransitionEventType
 
 
 def test_constructor_failures():
@@ -37,6 +44,80 @@ def test_constructor_with_type_objects():
     assert isinstance(e2.type, GenericEventType)
 
 
+def test_lazy_fields():
+    e = Event(GenericEventType)
+    assert e._id is not None and not isinstance(e._id, str)
+    assert e._type is GenericEventType
+    assert e._tags is None
+    assert e._timestamp is None
+
+    # the type class is given without instantiating the type
+    assert e.type_class is GenericEventType
+    assert e._type is GenericEventType
+    assert repr(e)  # gives the ID
+
+    # fields are materialized once, on first read
+    event_id = e.id
+    assert isinstance(event_id, str)
+    assert e.id == event_id
+    t = e.type
+    assert isinstance(t, GenericEventType)
+    assert e.type is t
+    # ... sharing the canonical instance of the type class
+    assert t is GenericEventType.canonical()
+    assert Event(GenericEventType).type is t
+    assert e.type_class is GenericEventType
+    tags = e.tags
+    assert tags == set()
+    assert e.tags is tags
+    timestamp = e.timestamp
+    assert timestamp.tzinfo is not None
+    assert e.timestamp is timestamp
+
+
+def test_lazy_fields_setters():
+    e = Event(GenericEventType)
+    e.id = None
+    assert e.id is None
+    e.id = 'abc'
+    assert e.id == 'abc'
+    e.type = MetricEventType()
+    assert e.type_class is MetricEventType
+    e.tags = {'a'}
+    assert e.tags == {'a'}
+    e.timestamp = None
+    assert e.timestamp is None
+    e.touch()
+    assert e.timestamp is not None
+
+
+def test_constructor_with_non_instantiable_type_objects():
+    class NeedsArgs(EventType):
+        def __init__(self, description):
+            EventType.__init__(self, '{}', description=description)
+
+    with pytest.raises(TypeError):
+        Event(NeedsArgs)
+        pytest.fail()
+    with pytest.raises(AssertionError):
+        Event(int)
+        pytest.fail()
+
+
+def test_priority():
+    e = Event(GenericEventType())
+    assert e.priority == EventPriority.NORMAL
+    e = Event(StateTransitionEventType)
+    assert e.priority == EventPriority.HIGH
+    e = Event(StateTransitionEventType, priority=EventPriority.LOW)
+    assert e.priority == EventPriority.LOW
+    e = Event(EventType('{}', priority=3))
+    assert e.priority == 3
+    with pytest.raises(AssertionError):
+        Event(GenericEventType(), priority='high')
+        pytest.fail()
+
+
 def test_touch():
     e = Event(GenericEventType(), payload=dict(a=1, b=2), description='hello',
               owner=1234)
@@ -47,6 +128,111 @@ def test_touch():
     assert ts2 > ts1
 
 
+def test_timestamp_ns():
+    e = Event(GenericEventType())
+    ns = e.timestamp_ns
+    assert isinstance(ns, int)
+    assert e._timestamp is None
+    assert e.as_dict(fields=('timestamp',))['timestamp'] == \
+        ts.stringify(e.timestamp)
+    assert ts.to_ns(e.timestamp) == ns - ns % 1000
+
+    e.timestamp = datetime.datetime(1983, 7, 3, 9, 0, 0, tzinfo=pytz.utc)
+    assert e.timestamp_ns == 426070800000000000
+    e.timestamp_ns = 0
+    assert e.timestamp == ts.EPOCH
+    assert e.as_dict(fields=('timestamp',)) == \
+        dict(timestamp='1970-01-01T00:00:00Z')
+
+    with ts.CoarseClock(resolution_ms=1000) as clock:
+        assert Event(GenericEventType()).timestamp_ns == clock.now
+
+
+def test_as_dict():
+    e = Event(GenericEventType(), payload=dict(a=1, b=2), description='hello',
+              owner=1234)
+    e.tags.add('x')
+    result = e.as_dict()
+    assert result == json.loads(e.json())
+    result = e.as_dict(fields=('payload', 'owner'))
+    assert result == dict(payload=dict(a=1, b=2), owner=1234)
+
+
+def test_json():
+    e = Event(MetricEventType, payload=dict(a=1), owner=1234)
+    result = json.loads(e.json())
+    assert result['type'] == 'baroque.defaults.eventtypes.MetricEventType'
+    assert e.type_id == result['type']
+    assert result['payload'] == dict(a=1)
+    assert type(e._type) == type   # no need to instantiate the type
+    et = EventType('{}')
+    assert json.loads(Event(et).json())['type'] == et.type_id
+
+
+def test_json_is_cached():
+    e = Event(GenericEventType(), payload=dict(a=1), owner=1234)
+    result = e.json()
+    cached = e._json
+    assert cached is not None
+    assert e.json() == result
+    assert e._json is cached
+    assert e.md5() == e.md5()
+
+    e.owner = 'me'
+    assert json.loads(e.json())['owner'] == 'me'
+    e.set_published()
+    assert json.loads(e.json())['status'] == EventStatus.PUBLISHED
+    e.description = 'hello'
+    assert json.loads(e.json())['description'] == 'hello'
+    e.timestamp_ns = 0
+    assert json.loads(e.json())['timestamp'] == '1970-01-01T00:00:00Z'
+
+    # payload and tags may be changed in place
+    e.json()
+    e.payload['b'] = 2
+    assert json.loads(e.json())['payload'] == dict(a=1, b=2)
+    e.tags.add('x')
+    assert json.loads(e.json())['tags'] == ['x']
+
+    # ... also through references held elsewhere
+    d = dict()
+    e = Event(GenericEventType, payload=d)
+    tags = e.tags
+    md5 = e.md5()
+    d['a'] = 1
+    tags.add('y')
+    result = json.loads(e.json())
+    assert result['payload'] == dict(a=1)
+    assert result['tags'] == ['y']
+    assert e.md5() != md5
+
+
+def test_compact():
+    e = Event(MetricEventType(), payload=dict(a=1, b=2), description='hello',
+              owner=1234)
+    e.tags.add('x')
+    e.set_published()
+    e.priority = EventPriority.HIGH
+    data = e.compact()
+    # the event type schema is not carried along
+    assert MetricEventType in data
+    assert e.type.jsonschema not in pickle.dumps(data).decode('latin-1')
+
+    result = Event.from_compact(pickle.loads(pickle.dumps(data)))
+    assert isinstance(result.type, MetricEventType)
+    assert result.as_dict(fields=EVENT_FIELDS[2:]) == \
+        e.as_dict(fields=EVENT_FIELDS[2:])
+    assert result.id == e.id
+    assert result.timestamp_ns == e.timestamp_ns
+    assert result.priority == EventPriority.HIGH
+
+    # event types that need arguments are carried as they are
+    e = Event(EventType('{}'))
+    data = e.compact()
+    assert data[1] is e.type
+    assert Event.from_compact(data).type is e.type
+
+
 def test_md5():
     e = Event(GenericEventType(), payload=dict(a=1, b=2), description='hello',
               owner=1234)
@@ -55,3 +241,23 @@ def test_md5():
 
 def test_print():
     print(Event(GenericEventType()))
+
+
+def test_pickle_and_copy_keep_lazy_fields():
+    import copy
+    e = Event(GenericEventType, payload=dict(a=1))
+    for clone in (pickle.loads(pickle.dumps(e)), copy.deepcopy(e),
+                  copy.copy(e)):
+        assert clone._id is e._id
+        assert isinstance(clone.id, str)
+        assert clone.payload == dict(a=1)
+        assert clone.type_class is GenericEventType
+    e.id
+    assert pickle.loads(pickle.dumps(e)).id == e.id
+
+
+def test_slots():
+    e = Event(GenericEventType())
+    with pytest.raises(AttributeError):
+        e.foo = 'bar'
+        pytest.fail()
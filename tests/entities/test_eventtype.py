@@ -1,7 +1,11 @@
+import datetime
 import pytest
-from baroque.entities.eventtype import EventType
+from jsonschema import SchemaError
+from baroque.entities.eventtype import EventType, SchemaValidator, \
+    EventPriority, EVENT_FIELDS
 from baroque.entities.event import Event
-from baroque.defaults.eventtypes import GenericEventType
+from baroque.defaults.eventtypes import GenericEventType, \
+    StateTransitionEventType, MetricEventType
 
 
 def test_constructor_failures():
@@ -19,6 +23,41 @@ def test_constructor():
     assert not et.tags
     assert et.owner == 1234
     assert et.description == 'hello'
+    assert et.priority == EventPriority.NORMAL
+
+
+def test_priority():
+    assert EventType('{}', priority=EventPriority.LOW).priority == \
+        EventPriority.LOW
+    assert StateTransitionEventType().priority == EventPriority.HIGH
+    assert GenericEventType().priority == EventPriority.NORMAL
+    assert StateTransitionEventType.default_priority == EventPriority.HIGH
+    with pytest.raises(AssertionError):
+        EventType('{}', priority='high')
+        pytest.fail()
+
+    # events created with a type class get its class-level default priority
+    assert Event(StateTransitionEventType).priority == EventPriority.HIGH
+    et = GenericEventType()
+    et.priority = EventPriority.LOW
+    assert Event(et).priority == EventPriority.LOW
+    et.priority = None
+    assert et.priority == EventPriority.NORMAL
+
+
+def test_slots():
+    et = GenericEventType()
+    with pytest.raises(AttributeError):
+        et.foo = 'bar'
+        pytest.fail()
+
+    # subclasses not declaring slots can still carry any attribute
+    class CustomEventType(EventType):
+        def __init__(self):
+            EventType.__init__(self, '{}')
+            self.foo = 'bar'
+
+    assert CustomEventType().foo == 'bar'
 
 
 def test_md5():
@@ -26,6 +65,22 @@ def test_md5():
     assert et.md5() is not None
 
 
+def test_type_id():
+    class CustomEventType(EventType):
+        def __init__(self):
+            EventType.__init__(self, '{}')
+
+    result = CustomEventType().type_id
+    assert result == CustomEventType().type_id
+    assert result.startswith(__name__ + '.')
+    assert result.endswith('CustomEventType')
+
+    et = EventType('{}')
+    assert et.type_id == EventType('{}', description='x').type_id
+    assert et.type_id.startswith('baroque.entities.eventtype.EventType:')
+    assert et.type_id != EventType('{"type": "object"}').type_id
+
+
 def test_validate():
     jsonschema = '''{
         "type": "object",
@@ -55,6 +110,100 @@ def test_validate():
     event = Event(eventtype, payload=dict(x=1, y=2))
     assert not EventType.validate(event, eventtype)
 
+    # using a precompiled validator
+    validator = EventType.compile_schema(jsonschema)
+    event = Event(eventtype, payload=dict(foo='value', bar=123))
+    assert EventType.validate(event, eventtype, validator=validator)
+    event = Event(eventtype, payload=dict(x=1, y=2))
+    assert not EventType.validate(event, eventtype, validator=validator)
+
+
+def test_validate_payloads_as_json():
+    eventtype = EventType('''{
+        "type": "object",
+        "properties": {
+            "payload": {
+                "type": "object",
+                "properties": {
+                    "seq": { "type": "array" },
+                    "1": { "type": "string" }
+                },
+                "required": ["seq", "1"]
+            }
+        }
+    }''')
+
+    # tuples are arrays and non-string keys are strings, as in JSON
+    event = Event(eventtype, payload={'seq': (1, 2), 1: 'one'})
+    assert EventType.validate(event, eventtype)
+    event = Event(eventtype, payload={'seq': (1, 2), 1: 1})
+    assert not EventType.validate(event, eventtype)
+
+    # values that cannot be dumped to JSON are not validated
+    event = Event(eventtype, payload={'seq': [], '1': datetime.datetime.now()})
+    with pytest.raises(TypeError):
+        EventType.validate(event, eventtype)
+        pytest.fail()
+
+
+def test_compile_schema():
+    validator = EventType.compile_schema('{"type": "object"}')
+    assert isinstance(validator, SchemaValidator)
+    assert validator.is_valid(Event(GenericEventType()))
+    with pytest.raises(SchemaError):
+        EventType.compile_schema('{"type": 123}')
+        pytest.fail()
+
+
+def test_canonical():
+    et = MetricEventType.canonical()
+    assert isinstance(et, MetricEventType)
+    assert MetricEventType.canonical() is et
+    assert GenericEventType.canonical() is not et
+    with pytest.raises(TypeError):
+        EventType.canonical()
+        pytest.fail()
+
+
+def test_validator():
+    et = MetricEventType()
+    validator = et.validator
+    assert isinstance(validator, SchemaValidator)
+    # each schema is compiled once and shared
+    assert MetricEventType().validator is validator
+    assert EventType(et.jsonschema).validator is validator
+    assert et.schema is validator.schema
+    assert et.schema['required'] == ['payload']
+    assert GenericEventType().validator is not validator
+    # ... and follows changes of the schema
+    et.jsonschema = '{"type": "object"}'
+    assert et.validator is not validator
+
+
+def test_schema_validator_covered_fields():
+    # only the event fields named by the schema are validated
+    validator = SchemaValidator(GenericEventType().jsonschema)
+    assert validator.fields == tuple()
+    validator = SchemaValidator('''{
+        "type": "object",
+        "properties": {"owner": {"type": "string"}},
+        "required": ["payload"]
+    }''')
+    assert validator.fields == ('owner', 'payload')
+    evt = Event(GenericEventType(), payload=dict(a=1), owner=1234)
+    assert not validator.is_valid(evt)
+    evt.owner = 'me'
+    assert validator.is_valid(evt)
+
+    # schemas constraining the event as a whole see all the event fields
+    validator = SchemaValidator('''{
+        "type": "object",
+        "additionalProperties": false,
+        "properties": {"payload": {"type": "object"}}
+    }''')
+    assert validator.fields == EVENT_FIELDS
+    assert not validator.is_valid(Event(GenericEventType(), payload=dict()))
+
 
 def test_print():
     print(EventType('{}'))
@@ -1,6 +1,10 @@
+import asyncio
+import datetime
+import pickle
 import pytest
+import pytz
 from baroque.entities.reactor import Reactor
-from baroque.entities.event import Event
+from baroque.entities.event import Event, _PENDING
 from baroque.defaults.eventtypes import GenericEventType
 
 
@@ -36,6 +40,9 @@ def test_constructor():
     assert r.last_reaction_timestamp is None
     assert r.id_last_event_reacted is None
     assert r.reactions_count == 0
+    assert not r.cpu_bound
+    r = Reactor(greet, cpu_bound=True)
+    assert r.cpu_bound
 
 
 def test_only_if():
@@ -91,5 +98,96 @@ def test_react_conditionally():
     assert r.last_reacted_on() is not None
 
 
+def test_react_async():
+    reacted_on = list()
+
+    async def reaction(evt):
+        reacted_on.append(evt)
+
+    loop = asyncio.new_event_loop()
+    try:
+        # with a coroutine function
+        r = Reactor(reaction, condition=only_test_events)
+        evt = Event(GenericEventType())
+        loop.run_until_complete(r.react_conditionally_async(evt))
+        assert r.count_reactions() == 0
+        evt.payload = {'test': 'value'}
+        loop.run_until_complete(r.react_conditionally_async(evt))
+        assert reacted_on == [evt]
+        assert r.count_reactions() == 1
+        assert r.last_event_reacted() == evt.id
+
+        # with a plain function
+        r = Reactor(greet)
+        loop.run_until_complete(r.react_async(evt))
+        assert r.count_reactions() == 1
+    finally:
+        loop.close()
+
+
 def test_print():
     print(Reactor(lambda x: 1))
+
+
+def test_slots_and_pickling():
+    r = Reactor(greet)
+    with pytest.raises(AttributeError):
+        r.foo = 'bar'
+        pytest.fail()
+    r.react(Event(GenericEventType()))
+    event_id = r.last_event_reacted()
+    clone = pickle.loads(pickle.dumps(r))
+    assert clone.reaction_function is greet
+    assert clone.count_reactions() == 1
+    assert clone.last_event_reacted() == event_id
+
+    # each reactor has its own bookkeeping lock, made anew when unpickling
+    assert clone.lock is not r.lock
+    assert Reactor(greet).lock is not r.lock
+    clone.react(Event(GenericEventType()))
+    assert clone.count_reactions() == 2
+
+
+def test_last_reaction_ns():
+    r = Reactor(greet)
+    assert r.last_reaction_ns is None
+    r.react(Event(GenericEventType()))
+    assert isinstance(r.last_reaction_ns, int)
+    assert r.last_reaction_timestamp.tzinfo is not None
+    assert r.last_reacted_on() == \
+        r.last_reaction_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def test_bookkeeping_is_settable_and_keeps_no_event():
+    r = Reactor(greet)
+    e = Event(GenericEventType())
+    r.react(e)
+    assert r.id_last_event_reacted == e.id
+    assert not hasattr(r, 'last_event')
+    r.id_last_event_reacted = 'abc'
+    assert r.last_event_reacted() == 'abc'
+    when = datetime.datetime(2017, 1, 2, 3, 4, 5, tzinfo=pytz.utc)
+    r.last_reaction_timestamp = when
+    assert r.last_reaction_timestamp == when
+    r.last_reaction_timestamp = None
+    assert r.last_reaction_ns is None
+
+
+def test_last_event_id_is_generated_lazily():
+    r1, r2 = Reactor(greet), Reactor(greet)
+    e = Event(GenericEventType())
+    r1.react(e)
+    r2.react(e)
+    assert e._id is not _PENDING and not isinstance(e._id, str)
+
+    # the ID is generated once, whoever reads it first
+    event_id = r1.last_event_reacted()
+    assert e.id == event_id
+    assert r2.last_event_reacted() == event_id
+
+    # ... also after the event is gone
+    e = Event(GenericEventType())
+    r1.react(e)
+    del e
+    assert isinstance(r1.last_event_reacted(), str)
+    assert r1.last_event_reacted() == r1.last_event_reacted()
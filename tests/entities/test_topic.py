@@ -41,3 +41,25 @@ def test_constructor():
 
 def test_print():
     print(Topic('test', []))
+
+
+def test_slots_and_lazy_tags():
+    t = Topic('test', [GenericEventType()])
+    assert t._tags is None
+    assert t.tags == set()
+    t.tags.add('a')
+    assert t.tags == {'a'}
+    assert Topic('test', [], tags=['b']).tags == {'b'}
+    with pytest.raises(AttributeError):
+        t.foo = 'bar'
+        pytest.fail()
+
+
+def test_timestamp_ns():
+    t = Topic('test', [])
+    assert isinstance(t.timestamp_ns, int)
+    assert t._timestamp is None
+    assert t.timestamp is not None
+    t.timestamp_ns = 0
+    assert t.timestamp.year == 1970
+    assert '1970-01-01T00:00:00Z' in t.json()
@@ -0,0 +1,64 @@
+import os
+import pytest
+from baroque.executors.base import ReactionsHandle
+from baroque.executors.processes import ProcessPoolReactorsExecutor, \
+    react_in_worker
+from baroque.entities.event import Event
+from baroque.entities.reactor import Reactor
+from baroque.defaults.eventtypes import MetricEventType
+
+
+def crunch(evt):
+    return os.getpid(), evt.id, evt.payload['value'] ** 2
+
+
+def fail(evt):
+    raise ValueError(evt.id)
+
+
+def test_react_in_worker():
+    evt = Event(MetricEventType(), payload=dict(value=3))
+    result = react_in_worker(crunch, evt.compact())
+    assert result == (os.getpid(), evt.id, 9)
+
+
+def test_execute():
+    evt = Event(MetricEventType(), payload=dict(value=3))
+    r1 = Reactor(crunch, cpu_bound=True)
+    r2 = Reactor(crunch, condition=lambda e: False, cpu_bound=True)
+    executor = ProcessPoolReactorsExecutor(workers=2)
+    try:
+        handle = executor.execute([r1, r2], evt)
+        assert isinstance(handle, ReactionsHandle)
+        assert len(handle) == 1  # condition is checked before submission
+        handle.wait(timeout=30)
+        pid, evt_id, value = handle.futures[0].result()
+        assert pid != os.getpid()
+        assert evt_id == evt.id
+        assert value == 9
+        # bookkeeping happens in the publishing process
+        assert r1.count_reactions() == 1
+        assert r1.last_event_reacted() == evt.id
+        assert r2.count_reactions() == 0
+    finally:
+        executor.shutdown()
+
+
+def test_execute_with_failures():
+    evt = Event(MetricEventType(), payload=dict(value=3))
+    r = Reactor(fail, cpu_bound=True)
+    executor = ProcessPoolReactorsExecutor(workers=1)
+    try:
+        handle = executor.execute([r], evt)
+        with pytest.raises(ValueError):
+            handle.wait(timeout=30)
+            pytest.fail()
+        assert r.count_reactions() == 0
+    finally:
+        executor.shutdown()
+
+
+def test_print():
+    executor = ProcessPoolReactorsExecutor(workers=1)
+    print(executor)
+    executor.shutdown()
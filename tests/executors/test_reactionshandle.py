@@ -0,0 +1,86 @@
+import threading
+import pytest
+from concurrent.futures import Future, TimeoutError
+from baroque.executors.base import ReactionsHandle
+
+
+def completed(result=None, error=None):
+    f = Future()
+    if error is not None:
+        f.set_exception(error)
+    else:
+        f.set_result(result)
+    return f
+
+
+def test_constructor():
+    handle = ReactionsHandle()
+    assert len(handle) == 0
+    assert handle.propagate
+    handle = ReactionsHandle([completed()], propagate=False)
+    assert len(handle) == 1
+    assert not handle.propagate
+
+
+def test_merge():
+    handle = ReactionsHandle([completed()])
+    result = handle.merge(ReactionsHandle([completed(), completed()]))
+    assert result is handle
+    assert len(handle) == 3
+    handle.merge(None)
+    assert len(handle) == 3
+
+
+def test_done():
+    pending = Future()
+    handle = ReactionsHandle([completed(), pending])
+    assert not handle.done()
+    pending.set_result(None)
+    assert handle.done()
+
+
+def test_wait():
+    handle = ReactionsHandle([completed(), completed()])
+    handle.wait()
+
+    # exceptions are propagated
+    handle = ReactionsHandle([completed(), completed(error=ValueError())])
+    with pytest.raises(ValueError):
+        handle.wait()
+        pytest.fail()
+
+    # ... unless configured otherwise
+    handle = ReactionsHandle([completed(error=ValueError())], propagate=False)
+    handle.wait()
+
+    # timeouts
+    handle = ReactionsHandle([Future()])
+    with pytest.raises(TimeoutError):
+        handle.wait(timeout=0.01)
+        pytest.fail()
+
+
+def test_wait_timeout_is_overall():
+    futures = [Future() for _ in range(3)]
+    timers = [threading.Timer(0.08 * (i + 1), f.set_result, args=(None,))
+              for i, f in enumerate(futures)]
+    for t in timers:
+        t.start()
+    handle = ReactionsHandle(futures)
+    try:
+        with pytest.raises(TimeoutError):
+            handle.wait(timeout=0.12)
+            pytest.fail()
+    finally:
+        for t in timers:
+            t.join()
+
+
+def test_exceptions():
+    error = ValueError()
+    handle = ReactionsHandle([completed(), completed(error=error), Future()])
+    assert handle.exceptions() == [error]
+
+
+def test_print():
+    print(ReactionsHandle())
@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from baroque.executors.base import ReactorsExecutor
+from baroque.entities.event import Event
+from baroque.entities.reactor import Reactor
+from baroque.defaults.eventtypes import GenericEventType
+
+
+def square(evt):
+    return evt.payload['value'] ** 2
+
+
+def fail(evt):
+    raise ValueError(evt.payload['value'])
+
+
+def test_execute():
+    reacted_on = list()
+    evt = Event(GenericEventType())
+    reactors = [Reactor(lambda e: reacted_on.append(1)),
+                Reactor(lambda e: reacted_on.append(2))]
+    executor = ReactorsExecutor()
+    result = executor.execute(reactors, evt)
+    assert result is None
+    assert reacted_on == [1, 2]
+
+
+def test_execute_with_failures():
+    def reaction_raising_error(evt):
+        raise FileNotFoundError()
+
+    reacted_on = list()
+    evt = Event(GenericEventType())
+    reactors = [Reactor(reaction_raising_error),
+                Reactor(lambda e: reacted_on.append(e))]
+    executor = ReactorsExecutor()
+    with pytest.raises(FileNotFoundError):
+        executor.execute(reactors, evt, propagate=True)
+        pytest.fail()
+    assert not reacted_on
+    executor.execute(reactors, evt, propagate=False)
+    assert reacted_on == [evt]
+
+
+def test_react_async():
+    reacted_on = list()
+
+    async def reaction(evt):
+        reacted_on.append(evt)
+
+    evt = Event(GenericEventType())
+    loop = asyncio.new_event_loop()
+    try:
+        executor = ReactorsExecutor()
+        loop.run_until_complete(executor.react_async(Reactor(reaction), evt))
+    finally:
+        loop.close()
+    assert reacted_on == [evt]
+
+
+def test_execute_cpu_bound():
+    evt = Event(GenericEventType(), payload=dict(value=3))
+    reacted_on = list()
+    r1 = Reactor(lambda e: reacted_on.append(e))
+    r2 = Reactor(square, cpu_bound=True)
+    executor = ReactorsExecutor(process_workers=1)
+    try:
+        # waited for inline when exceptions are propagated
+        assert executor.execute([r1, r2], evt) is None
+        assert reacted_on == [evt]
+        assert r2.count_reactions() == 1
+
+        # ... and handed back otherwise
+        handle = executor.execute([r1, r2], evt, propagate=False)
+        assert reacted_on == [evt, evt]
+        assert len(handle) == 1
+        handle.wait(timeout=30)
+        assert handle.futures[0].result() == 9
+        assert r2.count_reactions() == 2
+    finally:
+        executor.shutdown()
+    assert executor.processes is None
+
+
+def test_execute_cpu_bound_with_failures():
+    evt = Event(GenericEventType(), payload=dict(value=3))
+    executor = ReactorsExecutor(process_workers=1)
+    try:
+        with pytest.raises(ValueError):
+            executor.execute([Reactor(fail, cpu_bound=True)], evt)
+            pytest.fail()
+        handle = executor.execute([Reactor(fail, cpu_bound=True)], evt,
+                                  propagate=False)
+        handle.wait(timeout=30)
+        assert len(handle.exceptions()) == 1
+    finally:
+        executor.shutdown()
+
+
+def test_print():
+    print(ReactorsExecutor())
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import pytest
+from baroque.executors.base import ReactionsHandle
+from baroque.executors.threads import ThreadPoolReactorsExecutor
+from baroque.entities.event import Event
+from baroque.entities.reactor import Reactor
+from baroque.defaults.eventtypes import GenericEventType
+
+
+def test_execute():
+    barrier = threading.Barrier(3, timeout=5)
+    threads = set()
+
+    def reaction(evt):
+        threads.add(threading.current_thread())
+        barrier.wait()  # reactors are run concurrently
+
+    evt = Event(GenericEventType())
+    executor = ThreadPoolReactorsExecutor(workers=3)
+    try:
+        handle = executor.execute([Reactor(reaction) for _ in range(3)], evt)
+        assert isinstance(handle, ReactionsHandle)
+        assert len(handle) == 3
+        handle.wait(timeout=5)
+        assert handle.done()
+        assert len(threads) == 3
+        assert threading.current_thread() not in threads
+    finally:
+        executor.shutdown()
+
+
+def test_execute_with_failures():
+    def reaction_raising_error(evt):
+        raise FileNotFoundError()
+
+    reacted_on = list()
+    evt = Event(GenericEventType())
+    reactors = [Reactor(reaction_raising_error),
+                Reactor(lambda e: reacted_on.append(e))]
+    executor = ThreadPoolReactorsExecutor(workers=2)
+    try:
+        # exceptions surface when waiting on the handle
+        handle = executor.execute(reactors, evt, propagate=True)
+        with pytest.raises(FileNotFoundError):
+            handle.wait(timeout=5)
+            pytest.fail()
+        handle = executor.execute(reactors, evt, propagate=False)
+        handle.wait(timeout=5)
+        assert len(handle.exceptions()) == 1
+        assert reacted_on == [evt, evt]
+    finally:
+        executor.shutdown()
+
+
+def test_react_async():
+    reacted_in = list()
+
+    async def async_reaction(evt):
+        reacted_in.append(('async', threading.current_thread()))
+
+    def sync_reaction(evt):
+        reacted_in.append(('sync', threading.current_thread()))
+
+    evt = Event(GenericEventType())
+    executor = ThreadPoolReactorsExecutor(workers=1)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(
+            executor.react_async(Reactor(async_reaction), evt))
+        loop.run_until_complete(
+            executor.react_async(Reactor(sync_reaction), evt))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+        executor.shutdown()
+    # coroutine functions run on the loop, plain functions on the pool
+    assert reacted_in[0] == ('async', threading.current_thread())
+    assert reacted_in[1][0] == 'sync'
+    assert reacted_in[1][1] != threading.current_thread()
+
+
+def test_concurrent_reactions_are_counted():
+    reactor = Reactor(lambda evt: None)
+    event = Event(GenericEventType())
+
+    def react_many():
+        for _ in range(1000):
+            reactor.react(event)
+
+    threads = [threading.Thread(target=react_many) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert reactor.reactions_count == 8000
+    assert reactor.last_event_reacted() == event.id
+
+
+def test_print():
+    executor = ThreadPoolReactorsExecutor(workers=2)
+    print(executor)
+    executor.shutdown()
@@ -29,6 +29,22 @@ def test_create():
     assert len(bck._db) == 1
 
 
+def test_create_many():
+    bck = DictBackend()
+    evt0 = Event(GenericEventType(), dict(foo='bar'))
+    evt0.id = None
+    evt1 = Event(GenericEventType(), dict(foo='bar'))
+    evt2 = Event(MetricEventType(), dict(foo='bar'))
+    bck.create_many([evt0, evt1, evt2, evt1])
+    assert len(bck._db) == 2
+    assert evt1 in bck
+    assert evt2 in bck
+
+    with pytest.raises(AssertionError):
+        bck.create_many([None])
+        pytest.fail()
+
+
 def test_read():
     bck = DictBackend()
     evt = Event(GenericEventType(), dict(foo='bar'))
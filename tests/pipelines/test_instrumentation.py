@@ -0,0 +1,186 @@
+import gc
+import pytest
+from baroque.pipelines.base import Stage, Pipeline
+from baroque.pipelines.instrumentation import InstrumentedStage, \
+    InstrumentedReactorsStage, InstrumentedExecutor, REACTORS, FANOUT, \
+    REACTOR
+from baroque.datastructures.histograms import LatencyHistograms
+from baroque.executors.base import ReactorsExecutor
+from baroque.entities.event import Event
+from baroque.entities.topic import Topic
+from baroque.entities.reactor import Reactor
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+class SlowStage(Stage):
+    name = 'slow'
+
+    def __init__(self, clock, before, after):
+        self.clock = clock
+        self.before = before
+        self.after = after
+
+    def process(self, event, topic, proceed):
+        self.clock.now += self.before
+        result = proceed(event, topic)
+        self.clock.now += self.after
+        return result
+
+
+class Terminal:
+    def __init__(self, clock=None, cost=0.):
+        self.clock = clock
+        self.cost = cost
+        self.published = list()
+
+    def process(self, event, topic):
+        if self.clock is not None:
+            self.clock.now += self.cost
+        self.published.append(event)
+        return 'handle'
+
+    def process_many(self, events, topic):
+        if self.clock is not None:
+            self.clock.now += self.cost
+        self.published.extend(events)
+        return 'handle'
+
+
+def test_stage_records_own_time_only():
+    clock = FakeClock()
+    hs = LatencyHistograms()
+    stage = InstrumentedStage(SlowStage(clock, 0.001, 0.002), hs, clock=clock)
+    assert stage.name == 'slow'
+
+    def proceed(event, topic):
+        clock.now += 1.
+        return 'handle'
+
+    evt = Event(GenericEventType())
+    assert stage.process(evt, None, proceed) == 'handle'
+    h = hs.get('slow', GenericEventType)
+    assert h.count() == 1
+    assert h.total == pytest.approx(3.)
+
+
+def test_stage_name_defaults_to_class_name():
+    stage = InstrumentedStage(Stage(), LatencyHistograms())
+    assert stage.name == 'Stage'
+    assert stage.on_topics
+
+
+def test_stage_records_on_errors():
+    hs = LatencyHistograms()
+
+    class Failing(Stage):
+        def process(self, event, topic, proceed):
+            raise ValueError()
+
+    stage = InstrumentedStage(Failing(), hs)
+    with pytest.raises(ValueError):
+        stage.process(Event(GenericEventType()), None, None)
+        pytest.fail()
+    assert hs.get('Failing', GenericEventType).count() == 1
+
+
+def test_stage_splits_batches():
+    clock = FakeClock()
+    hs = LatencyHistograms()
+
+    class Batching(Stage):
+        name = 'batching'
+
+        def process_many(self, events, topic, proceed):
+            clock.now += 0.004
+            return proceed(events, topic)
+
+    stage = InstrumentedStage(Batching(), hs, clock=clock)
+    evts = [Event(GenericEventType()) for _ in range(3)] + \
+        [Event(MetricEventType())]
+    stage.process_many(evts, None, lambda events, topic: None)
+    assert hs.get('batching', GenericEventType).count() == 3
+    assert hs.get('batching', GenericEventType).total == pytest.approx(3.)
+    assert hs.get('batching', MetricEventType).count() == 1
+
+
+def test_reactors_stage():
+    clock = FakeClock()
+    hs = LatencyHistograms()
+    terminal = InstrumentedReactorsStage(Terminal(clock, 0.002), hs,
+                                         clock=clock)
+    evt = Event(GenericEventType())
+    topic = Topic('test', [GenericEventType()])
+    assert terminal.process(evt, None) == 'handle'
+    assert terminal.process(evt, topic) == 'handle'
+    assert terminal.process_many([evt, evt], topic) == 'handle'
+    assert terminal.process_many([evt, evt], None) == 'handle'
+    assert hs.get(REACTORS, GenericEventType).count() == 3
+    assert hs.get(REACTORS, GenericEventType).total == pytest.approx(4.)
+    assert hs.get(FANOUT, topic).count() == 2
+
+
+def test_executor():
+    hs = LatencyHistograms()
+    executor = InstrumentedExecutor(ReactorsExecutor(), hs)
+    reacted = list()
+    r1 = Reactor(lambda e: reacted.append(1))
+    r2 = Reactor(lambda e: reacted.append(2), condition=lambda e: False)
+    evt = Event(GenericEventType())
+    assert executor.execute([r1, r2], evt) is None
+    assert reacted == [1]
+    assert r1.count_reactions() == 1
+    assert hs.get(REACTOR, r1).count() == 1
+    assert hs.get(REACTOR, r2).count() == 1
+
+    r3 = Reactor(lambda e: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        executor.execute([r3], evt)
+        pytest.fail()
+    assert hs.get(REACTOR, r3).count() == 1
+    executor.execute([r3], evt, propagate=False)
+    assert hs.get(REACTOR, r3).count() == 2
+
+
+def test_executor_does_not_keep_reactors_alive():
+    hs = LatencyHistograms()
+    executor = InstrumentedExecutor(ReactorsExecutor(), hs)
+    r = Reactor(lambda e: None)
+    executor.execute([r], Event(GenericEventType()))
+    assert len(hs.of(REACTOR)) == 1
+    del r
+    gc.collect()
+    assert len(hs.of(REACTOR)) == 0
+
+
+def test_pipeline_without_histograms_binds_stages_as_they_are():
+    stage = Stage()
+    p = Pipeline([stage], Terminal(), dict())
+    assert p.histograms is None
+    assert p.publish.func == stage.process
+
+
+def test_pipeline_with_histograms():
+    hs = LatencyHistograms()
+    stage = Stage()
+    terminal = Terminal()
+    p = Pipeline([stage], terminal, dict(), histograms=hs)
+    assert p.stages == [stage]
+    assert isinstance(p.publish.func.__self__, InstrumentedStage)
+    evt = Event(GenericEventType())
+    topic = Topic('test', [GenericEventType()])
+    p.publish(evt, None)
+    p.publish_many([evt], None)
+    p.publish_on_topic(evt, topic)
+    p.publish_many_on_topic([evt], topic)
+    assert len(terminal.published) == 4
+    assert hs.get('Stage', GenericEventType).count() == 4
+    assert hs.get(REACTORS, GenericEventType).count() == 2
+    assert hs.get(FANOUT, topic).count() == 2
@@ -0,0 +1,127 @@
+import pytest
+import functools
+from baroque.pipelines.base import Stage, Pipeline
+from baroque.entities.event import Event
+from baroque.entities.topic import Topic
+from baroque.defaults.eventtypes import GenericEventType
+
+
+class Terminal:
+    def __init__(self):
+        self.published = list()
+
+    def process(self, event, topic):
+        self.published.append((event, topic))
+        return 'handle'
+
+    def process_many(self, events, topic):
+        self.published.append((list(events), topic))
+        return 'handle'
+
+
+class Tracing(Stage):
+    def __init__(self, name, trace, enabled=True, on_topics=True):
+        self.name = name
+        self.trace = trace
+        self.is_enabled = enabled
+        self.on_topics = on_topics
+
+    def enabled(self, config):
+        return self.is_enabled
+
+    def process(self, event, topic, proceed):
+        self.trace.append(self.name)
+        return proceed(event, topic)
+
+
+class Dropping(Stage):
+    def process(self, event, topic, proceed):
+        if event.payload and event.payload.get('drop'):
+            return None
+        return proceed(event, topic)
+
+
+def test_constructor():
+    trace = list()
+    stages = [Tracing('a', trace), Tracing('b', trace, enabled=False)]
+    p = Pipeline(stages, Terminal(), dict())
+    assert len(p) == 1
+    assert p.stages == stages[:1]
+    assert isinstance(p.publish, functools.partial)
+
+
+def test_publish():
+    trace = list()
+    terminal = Terminal()
+    p = Pipeline([Tracing('a', trace), Tracing('b', trace, enabled=False),
+                  Tracing('c', trace)], terminal, dict())
+    evt = Event(GenericEventType())
+    assert p.publish(evt, None) == 'handle'
+    assert trace == ['a', 'c']  # disabled stages are not in the chain
+    assert terminal.published == [(evt, None)]
+
+
+def test_publish_on_topic():
+    trace = list()
+    terminal = Terminal()
+    p = Pipeline([Tracing('a', trace), Tracing('b', trace, on_topics=False)],
+                 terminal, dict())
+    evt = Event(GenericEventType())
+    t = Topic('test', [GenericEventType()])
+    assert p.publish_on_topic(evt, t) == 'handle'
+    assert trace == ['a']
+    assert terminal.published == [(evt, t)]
+    del trace[:]
+    p.publish_many_on_topic([evt], t)
+    assert trace == ['a']
+
+
+def test_publish_many():
+    terminal = Terminal()
+    p = Pipeline([Dropping()], terminal, dict())
+    kept = Event(GenericEventType(), payload=dict(drop=False))
+    dropped = Event(GenericEventType(), payload=dict(drop=True))
+    assert p.publish_many([kept, dropped, kept], None) == 'handle'
+    assert terminal.published == [([kept, kept], None)]
+
+    # nothing left to publish
+    assert p.publish_many([dropped], None) is None
+    assert len(terminal.published) == 1
+
+
+def test_empty_pipeline():
+    terminal = Terminal()
+    p = Pipeline([], terminal, dict())
+    evt = Event(GenericEventType())
+    assert p.publish(evt, None) == 'handle'
+    assert terminal.published == [(evt, None)]
+
+
+class Holding(Stage):
+    def __init__(self, fail=False):
+        self.flushed = 0
+        self.fail = fail
+
+    def flush(self):
+        self.flushed += 1
+        if self.fail:
+            raise FileNotFoundError()
+
+
+def test_flush_and_close():
+    stages = [Holding(fail=True), Holding()]
+    p = Pipeline(stages, Terminal(), dict())
+    with pytest.raises(FileNotFoundError):
+        p.flush()
+        pytest.fail()
+    assert stages[1].flushed == 1  # all stages are flushed anyway
+    with pytest.raises(FileNotFoundError):
+        p.close()
+        pytest.fail()
+    assert stages[1].flushed == 2
+
+
+def test_print():
+    p = Pipeline([Dropping()], Terminal(), dict())
+    assert 'Dropping' in str(p)
+    print(p)
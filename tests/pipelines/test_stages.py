@@ -0,0 +1,249 @@
+import pytest
+from baroque import Baroque
+import copy
+import threading
+from baroque.pipelines.stages import FilterStage, EnrichmentStage, \
+    RateLimitStage, CoalescingStage, ValidationStage, CountingStage, StatusStage, PersistenceStage, \
+    ReactorsStage
+from baroque.entities.event import Event, EventStatus
+from baroque.entities.reactor import Reactor
+from baroque.entities.topic import Topic
+from baroque.defaults.config import DEFAULT_CONFIG
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType, \
+    DataOperationEventType
+from baroque.exceptions.eventtypes import InvalidEventSchemaError
+from baroque.exceptions.configuration import InvalidConfigurationError
+
+
+def proceed(event, topic):
+    return event
+
+
+def test_filter_stage():
+    s = FilterStage(lambda e: e.owner == 'me')
+    mine = Event(GenericEventType(), owner='me')
+    other = Event(GenericEventType(), owner='you')
+    assert s.process(mine, None, proceed) is mine
+    assert s.process(other, None, proceed) is None
+    assert s.process_many([mine, other, mine], None, proceed) == [mine, mine]
+    assert s.process_many([other], None, proceed) is None
+    with pytest.raises(AssertionError):
+        FilterStage(None)
+        pytest.fail()
+
+
+def test_enrichment_stage():
+    s = EnrichmentStage(lambda e: e.tags.add('enriched'))
+    evt = Event(GenericEventType())
+    s.process(evt, None, proceed)
+    assert evt.tags == {'enriched'}
+    evts = [Event(GenericEventType()), Event(GenericEventType())]
+    assert s.process_many(evts, None, proceed) == evts
+    assert all(e.tags == {'enriched'} for e in evts)
+
+
+def limited_broker(**rate_limits):
+    brq = Baroque()
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config['events']['rate_limits'].update(rate_limits)
+    brq.config = config
+    return brq
+
+
+def test_rate_limit_stage():
+    brq = limited_broker()
+    assert not RateLimitStage(brq).enabled(brq.config)
+
+    # drop
+    brq = limited_broker(owners={'*': dict(rate=0.001, burst=1)})
+    s = RateLimitStage(brq)
+    assert s.enabled(brq.config)
+    first = Event(GenericEventType(), owner='me')
+    second = Event(GenericEventType(), owner='me')
+    assert s.process(first, None, proceed) is first
+    assert s.process(second, None, proceed) is None
+    kept = list()
+    s.process_many([Event(GenericEventType(), owner='you'), second], None,
+                   lambda events, topic: kept.extend(events))
+    assert len(kept) == 1
+    assert brq.events.count_limited('drop') == 2
+
+    # delay
+    brq = limited_broker(action='delay', eventtypes={
+        'baroque.defaults.eventtypes.GenericEventType': dict(rate=100)})
+    s = RateLimitStage(brq)
+    for _ in range(101):
+        s.process(Event(GenericEventType()), None, proceed)
+    assert brq.events.count_limited('delay') == 1
+
+    # reroute
+    brq = limited_broker(action='reroute', reroute_topic='overflow',
+                         topics={'main': dict(rate=0.001, burst=1)})
+    main = brq.topics.new('main', eventtypes=[GenericEventType()])
+    overflow = brq.topics.new('overflow', eventtypes=[GenericEventType()])
+    s = RateLimitStage(brq)
+    targets = list()
+    evts = [Event(GenericEventType()) for _ in range(3)]
+    s.process(evts[0], main, lambda e, t: targets.append(t))
+    s.process(evts[1], main, lambda e, t: targets.append(t))
+    s.process_many([evts[2]], main, lambda e, t: targets.append(t))
+    assert targets == [main, overflow, overflow]
+    assert brq.events.count_limited('reroute') == 2
+
+    # ... dropping events while the rerouting topic is not registered
+    brq.topics.remove(overflow)
+    s.process(Event(GenericEventType()), main, lambda e, t: targets.append(t))
+    assert targets == [main, overflow, overflow]
+    assert brq.events.count_limited('reroute') == 2
+    assert brq.events.count_limited('drop') == 1
+
+    # invalid configurations
+    with pytest.raises(InvalidConfigurationError):
+        limited_broker(action='unknown')
+        pytest.fail()
+    with pytest.raises(InvalidConfigurationError):
+        limited_broker(action='reroute', reroute_topic=None)
+        pytest.fail()
+
+
+def coalescing_broker(**coalescing):
+    brq = Baroque()
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config['events']['coalescing'].update(coalescing)
+    brq.config = config
+    return brq
+
+
+def data_event(pk, value):
+    return Event(DataOperationEventType(), payload=dict(
+        datum=dict(table='t', data_type='row', pk=pk),
+        operation='update', timestamp=0, meta=dict(), value=value))
+
+
+def test_coalescing_stage():
+    keys = {'baroque.defaults.eventtypes.DataOperationEventType':
+            'baroque.defaults.keys.datum_pk'}
+    brq = coalescing_broker()
+    assert not CoalescingStage(brq).enabled(brq.config)
+    brq = coalescing_broker(window=1000, eventtypes=keys)
+    s = CoalescingStage(brq)
+    assert s.enabled(brq.config)
+    try:
+        published = list()
+
+        def collect(event, topic):
+            published.append(event)
+
+        other = Event(GenericEventType())
+        assert s.process(other, None, collect) is None
+        assert published == [other]  # not coalesced
+        for i in range(3):
+            s.process(data_event('1', i), None, collect)
+        kept = list()
+        s.process_many([data_event('2', 0), data_event('1', 3), other], None,
+                       lambda events, topic: kept.extend(events))
+        assert kept == [other]
+        assert published == [other]
+        assert brq.events.count_coalesced() == 3
+        s.flush()
+        # held events go on through the chain they were last published on
+        assert published == [other]
+        assert sorted((e.payload['datum']['pk'], e.payload['value'])
+                      for e in kept[1:]) == [('1', 3), ('2', 0)]
+    finally:
+        s.close()
+
+    with pytest.raises(InvalidConfigurationError):
+        coalescing_broker(window=1, mode='unknown')
+        pytest.fail()
+
+
+def test_coalescing_stage_window():
+    brq = coalescing_broker(window=0.05, eventtypes={
+        'baroque.defaults.eventtypes.DataOperationEventType':
+            'baroque.defaults.keys.datum_pk'})
+    s = CoalescingStage(brq)
+    released = threading.Event()
+    try:
+        s.process(data_event('1', 0), None, lambda e, t: released.set())
+        assert released.wait(timeout=5)  # released by the background thread
+    finally:
+        s.close()
+    assert not s.thread.is_alive()
+
+
+def test_validation_stage():
+    brq = Baroque()
+    s = ValidationStage(brq)
+    assert not s.on_topics
+    assert s.enabled(dict(events=dict(validate_schema=True)))
+    assert not s.enabled(dict(events=dict(validate_schema=False)))
+    valid = Event(MetricEventType(),
+                  payload=dict(metric='m', value=1, timestamp=0))
+    invalid = Event(MetricEventType(), payload=dict())
+    assert s.process(valid, None, proceed) is valid
+    with pytest.raises(InvalidEventSchemaError):
+        s.process(invalid, None, proceed)
+        pytest.fail()
+    with pytest.raises(InvalidEventSchemaError):
+        s.process_many([valid, invalid], None, proceed)
+        pytest.fail()
+
+
+def test_counting_stage():
+    brq = Baroque()
+    s = CountingStage(brq)
+    s.process(Event(GenericEventType()), None, proceed)
+    s.process_many([Event(GenericEventType())] * 2, None, proceed)
+    assert brq.events.count_all() == 3
+
+
+def test_status_stage():
+    brq = Baroque()
+    s = StatusStage(brq)
+    seen = list()
+
+    def check(event, topic):
+        seen.append(event.status)  # not published yet
+
+    evt = Event(GenericEventType())
+    s.process(evt, None, check)
+    assert seen == [EventStatus.UNPUBLISHED]
+    assert evt.status == EventStatus.PUBLISHED
+    evts = [Event(GenericEventType())]
+    s.process_many(evts, None, proceed)
+    assert evts[0].status == EventStatus.PUBLISHED
+
+
+def test_persistence_stage():
+    brq = Baroque()
+    s = PersistenceStage(brq)
+    assert s.enabled(dict(events=dict(persist=True)))
+    assert not s.enabled(dict(events=dict(persist=False)))
+    evt = Event(GenericEventType())
+    s.process(evt, None, proceed)
+    s.process_many([Event(GenericEventType())], None, proceed)
+    assert len(brq._persistance_backend) == 2
+    assert evt in brq._persistance_backend
+
+
+def test_reactors_stage():
+    brq = Baroque()
+    reacted_on = list()
+    brq.on(GenericEventType()).run(Reactor(lambda e: reacted_on.append(e)))
+    s = ReactorsStage(brq)
+    assert s.propagate == DEFAULT_CONFIG['reactors']['propagate_exceptions']
+    evt = Event(GenericEventType())
+    assert s.process(evt, None) is None
+    assert reacted_on == [evt]
+    evts = [Event(GenericEventType()), Event(MetricEventType())]
+    assert s.process_many(evts, None) is None
+    assert reacted_on == [evt, evts[0]]
+
+    # on topics
+    on_topic = list()
+    t = brq.topics.new('test', eventtypes=[MetricEventType()])
+    brq.on_topic_run(t, Reactor(lambda e: on_topic.append(e)))
+    s.process(evts[1], t)
+    s.process_many(evts, t)
+    assert on_topic == [evts[1], evts[1]]
@@ -0,0 +1,258 @@
+import asyncio
+import copy
+import threading
+import pytest
+from baroque import AsyncBaroque
+from baroque.defaults.config import DEFAULT_CONFIG
+from baroque.entities.event import Event, EventStatus
+from baroque.entities.reactor import Reactor
+from baroque.entities.topic import Topic
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType
+from baroque.exceptions.configuration import InvalidConfigurationError
+from baroque.exceptions.eventtypes import InvalidEventSchemaError
+from baroque.exceptions.topics import UnregisteredTopicError
+from baroque.persistence.backend import AsyncPersistenceBackend
+from baroque.pipelines.base import Stage
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def new_broker(**reactors_cfg):
+    brq = AsyncBaroque()
+    cfg = copy.deepcopy(DEFAULT_CONFIG)
+    cfg['events']['validate_schema'] = True
+    cfg['events']['persist'] = False
+    cfg['reactors']['propagate_exceptions'] = True
+    cfg['reactors'].update(reactors_cfg)
+    brq.config = cfg
+    return brq
+
+
+class FakeAsyncPersistenceBackend(AsyncPersistenceBackend):
+    def __init__(self):
+        self.events = list()
+
+    async def create(self, event):
+        await asyncio.sleep(0)
+        self.events.append(event)
+
+
+def crunch(evt):
+    return evt.payload['value'] ** 2
+
+
+def test_publish():
+    brq = new_broker()
+    reacted_on = list()
+
+    async def async_reaction(evt):
+        await asyncio.sleep(0)
+        reacted_on.append(('async', evt))
+
+    r1 = Reactor(async_reaction)
+    r2 = Reactor(lambda evt: reacted_on.append(('sync', evt)))
+    brq.on(GenericEventType).run(r1)
+    brq.on_any_event_run(r2)
+    evt = Event(GenericEventType())
+    run(brq.publish(evt))
+    assert ('async', evt) in reacted_on
+    assert ('sync', evt) in reacted_on
+    assert r1.count_reactions() == 1
+    assert r1.last_event_reacted() == evt.id
+    assert brq.events.count_all() == 1
+    assert evt.status == EventStatus.PUBLISHED
+
+    with pytest.raises(AssertionError):
+        run(brq.publish('not-an-event'))
+        pytest.fail()
+
+
+def test_publish_invalid_event():
+    brq = new_broker()
+    evt = Event(MetricEventType(), payload={'metric': 'temperature'})
+    with pytest.raises(InvalidEventSchemaError):
+        run(brq.publish(evt))
+        pytest.fail()
+
+
+def test_reactors_run_concurrently():
+    brq = new_broker()
+    started = list()
+
+    async def reaction(evt):
+        started.append(evt)
+        await asyncio.sleep(0.05)
+        # all reactors have started before any of them is over
+        assert len(started) == 3
+
+    for _ in range(3):
+        brq.on(GenericEventType).run(Reactor(reaction))
+    run(brq.publish(Event(GenericEventType())))
+
+
+def test_concurrency_limit():
+    brq = new_broker(concurrency_limit=2)
+    running = list()
+    peak = list()
+
+    async def reaction(evt):
+        running.append(evt)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    for _ in range(5):
+        brq.on(GenericEventType).run(Reactor(reaction))
+    run(brq.publish(Event(GenericEventType())))
+    assert len(peak) == 5
+    assert max(peak) == 2
+
+
+def test_concurrency_limit_across_event_loops():
+    brq = new_broker(concurrency_limit=1)
+    reacted_on = list()
+
+    async def reaction(evt):
+        await asyncio.sleep(0)
+        reacted_on.append(evt)
+
+    # reactors wait on the semaphore, which binds it to the running loop
+    for _ in range(2):
+        brq.on(GenericEventType).run(Reactor(reaction))
+    e1, e2 = Event(GenericEventType()), Event(GenericEventType())
+    asyncio.run(brq.publish(e1))
+    asyncio.run(brq.publish(e2))
+    assert reacted_on == [e1, e1, e2, e2]
+
+
+def test_exception_bubbling():
+    async def reaction_raising_error(evt):
+        raise FileNotFoundError()
+
+    reacted_on = list()
+    brq = new_broker(propagate_exceptions=True)
+    brq.on(GenericEventType).run(Reactor(reaction_raising_error))
+    brq.on(GenericEventType).run(Reactor(lambda evt: reacted_on.append(evt)))
+    with pytest.raises(FileNotFoundError):
+        run(brq.publish(Event(GenericEventType())))
+        pytest.fail()
+    # the other reactors did run anyway
+    assert len(reacted_on) == 1
+
+    brq = new_broker(propagate_exceptions=False)
+    brq.on(GenericEventType).run(Reactor(reaction_raising_error))
+    run(brq.publish(Event(GenericEventType())))
+
+
+def test_publish_many():
+    brq = new_broker()
+    reacted_on = list()
+
+    async def reaction(evt):
+        reacted_on.append(evt)
+
+    brq.on(GenericEventType).run(Reactor(reaction))
+    evts = [Event(GenericEventType()) for _ in range(3)]
+    run(brq.publish_many(evts))
+    assert reacted_on == evts
+    assert brq.events.count_all() == 3
+    assert all(evt.status == EventStatus.PUBLISHED for evt in evts)
+
+
+def test_publish_on_topic():
+    brq = new_broker()
+    t = brq.topics.new('test-topic', eventtypes=[MetricEventType()])
+    reacted_on = list()
+
+    async def reaction(evt):
+        reacted_on.append(evt)
+
+    brq.on_topic_run(t, Reactor(reaction))
+    evt1 = Event(MetricEventType())
+    evt2 = Event(GenericEventType())
+    run(brq.publish_on_topic(evt1, t))
+    run(brq.publish_many_on_topic([evt2, evt1], t))
+    assert reacted_on == [evt1, evt1]
+    assert brq.events.count_all() == 3
+
+    with pytest.raises(UnregisteredTopicError):
+        run(brq.publish_on_topic(evt1, Topic('unregistered', [])))
+        pytest.fail()
+
+
+def test_async_persistence():
+    brq = new_broker()
+    brq.config['events']['persist'] = True
+    brq._persistance_backend = FakeAsyncPersistenceBackend()
+    evt1 = Event(GenericEventType())
+    evt2 = Event(GenericEventType())
+    run(brq.publish(evt1))
+    run(brq.publish_many([evt2]))
+    assert brq._persistance_backend.events == [evt1, evt2]
+
+
+def test_sync_persistence():
+    brq = new_broker()
+    brq.config['events']['persist'] = True
+    evt = Event(GenericEventType())
+    run(brq.fire(evt))
+    assert evt in brq._persistance_backend
+
+
+def test_sync_reactors_on_thread_pool():
+    brq = new_broker(executor=dict(mode='threads', workers=1))
+    brq._load_reactors_executor()
+    reacted_in = list()
+    brq.on(GenericEventType).run(
+        Reactor(lambda evt: reacted_in.append(threading.current_thread())))
+    run(brq.publish(Event(GenericEventType())))
+    brq.close()
+    assert len(reacted_in) == 1
+    assert reacted_in[0] != threading.current_thread()
+
+
+def test_cpu_bound_reactors():
+    brq = new_broker(executor=dict(mode='inline', process_workers=1))
+    brq._load_reactors_executor()
+    r = Reactor(crunch, cpu_bound=True)
+    brq.on(GenericEventType).run(r)
+    evt = Event(GenericEventType(), payload=dict(value=3))
+    run(brq.publish(evt))
+    brq.close()
+    assert r.count_reactions() == 1
+
+
+def test_unsupported_features():
+    brq = new_broker()
+    with pytest.raises(InvalidConfigurationError):
+        brq.use(Stage())
+        pytest.fail()
+    assert brq._used_stages == []
+
+    unsupported = [
+        ('rate_limits', dict(owners={'me': dict(rate=1)})),
+        ('coalescing', dict(window=10, eventtypes={
+            'baroque.defaults.eventtypes.DataOperationEventType':
+                'baroque.defaults.keys.datum_pk'})),
+        ('instrumentation', dict(enabled=True)),
+        ('dispatch', dict(mode='queued'))]
+    for section, value in unsupported:
+        cfg = copy.deepcopy(brq.config)
+        cfg['events'][section] = value
+        with pytest.raises(InvalidConfigurationError):
+            brq.config = cfg
+            pytest.fail()
+
+
+def test_pipeline_persistence_is_not_a_coroutine():
+    brq = new_broker()
+    brq.config['events']['persist'] = True
+    evt = Event(GenericEventType())
+    assert brq._persist_event(evt) is None
+    assert evt in brq._persistance_backend
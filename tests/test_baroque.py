@@ -1,10 +1,13 @@
 import pytest
 from baroque import Baroque, EventType
 from baroque.defaults.config import DEFAULT_CONFIG
-from baroque.entities.reactor import Reactor
+from baroque.entities.reactor import Reactor, BatchingReactor
 from baroque.entities.topic import Topic
 from baroque.datastructures.counters import EventCounter
 from baroque.datastructures.bags import ReactorsBag
+from baroque.executors.base import ReactorsExecutor
+from baroque.pipelines.base import Pipeline, Stage
+from baroque.pipelines.stages import FilterStage, EnrichmentStage
 from baroque.datastructures.registries import EventTypesRegistry, \
     ReactorsRegistry, TopicsRegistry
 from baroque.entities.event import Event, EventStatus
@@ -50,6 +53,14 @@ def test_on_any_event_run():
     assert r in brq.reactors.jolly_bag
 
 
+def test_on_any_event_run_many():
+    brq = Baroque()
+    reactors = [ReactorFactory.stdout() for _ in range(3)]
+    result = brq.on_any_event_run_many(reactors)
+    assert result == reactors
+    assert brq.reactors.jolly_bag.reactors == tuple(reactors)
+
+
 def test_reactors():
     brq = Baroque()
     result = brq.reactors
@@ -74,6 +85,61 @@ def test_topics():
     assert isinstance(result, TopicsRegistry)
 
 
+def test_executor():
+    brq = Baroque()
+    result = brq.executor
+    assert isinstance(result, ReactorsExecutor)
+    brq.close()
+
+
+def test_pipeline():
+    brq = Baroque()
+    assert isinstance(brq.pipeline, Pipeline)
+    pipeline = brq.pipeline
+    brq.config = brq.config
+    assert brq.pipeline is not pipeline  # recompiled on config change
+
+
+def test_use():
+    brq = Baroque()
+    reacted_on = list()
+    brq.on(GenericEventType()).run(Reactor(lambda e: reacted_on.append(e)))
+    stages = len(brq.pipeline)
+    f = FilterStage(lambda e: e.owner != 'spammer')
+    assert brq.use(f) is f
+    brq.use(EnrichmentStage(lambda e: e.tags.add('checked')))
+    assert len(brq.pipeline) == stages + 2
+    assert brq.pipeline.stages[0] is f
+
+    spam = Event(GenericEventType(), owner='spammer')
+    ham = Event(GenericEventType(), owner='me')
+    brq.publish(spam)
+    brq.publish_many([spam, ham])
+    assert reacted_on == [ham]
+    assert ham.tags == {'checked'}
+    assert brq.events.count_all() == 1  # filtered events are not counted
+    with pytest.raises(AssertionError):
+        brq.use(lambda e: e)
+        pytest.fail()
+
+
+def test_flush_batching_reactors():
+    brq = Baroque()
+    batches = list()
+    brq.on(GenericEventType()).run(BatchingReactor(batches.append))
+    t = brq.topics.new('test', eventtypes=[GenericEventType()])
+    brq.on_topic_run(t, BatchingReactor(batches.append))
+    evts = [Event(GenericEventType()) for _ in range(3)]
+    brq.publish_many(evts)
+    brq.publish_on_topic(evts[0], t)
+    assert batches == []
+    assert brq.flush()
+    assert sorted(len(b) for b in batches) == [1, 3]
+    brq.publish(evts[1])
+    brq.close()
+    assert len(batches) == 3
+
+
 def test_reset():
     brq = Baroque()
 
@@ -155,6 +221,36 @@ def test_fire():
     assert brq.events.count_all() == 1
 
 
+def test_publish_many():
+    brq = Baroque()
+    reacted_on = list()
+    brq.on(MetricEventType).run(Reactor(lambda evt: reacted_on.append(evt)))
+    brq.on_any_event_run(Reactor(lambda evt: reacted_on.append(evt.id)))
+    evts = [Event(MetricEventType(), payload={'metric': 'temperature',
+                                              'value': 56.7793,
+                                              'timestamp': 1487166969}),
+            Event(GenericEventType())]
+    brq.publish_many(iter(evts))
+    assert reacted_on == [evts[0].id, evts[0], evts[1].id]
+    assert brq.events.count_all() == 2
+    assert brq.events.count(MetricEventType()) == 1
+    assert all(evt.status == EventStatus.PUBLISHED for evt in evts)
+
+    # a single invalid event prevents the whole batch from being published
+    del reacted_on[:]
+    evts = [Event(GenericEventType()),
+            Event(MetricEventType(), payload={'metric': 'temperature'})]
+    with pytest.raises(InvalidEventSchemaError):
+        brq.publish_many(evts)
+        pytest.fail()
+    assert not reacted_on
+    assert brq.events.count_all() == 2
+
+    with pytest.raises(AssertionError):
+        brq.publish_many(['not-an-event'])
+        pytest.fail()
+
+
 def test_count_event():
     brq = Baroque()
     eventtype = GenericEventType()
@@ -216,6 +312,35 @@ def test_validate_event_schema():
     except InvalidEventSchemaError:
         pytest.fail()
 
+    # the schema validator has been compiled once and cached
+    assert et.validator is MetricEventType().validator
+
+
+class CountingMetricEventType(MetricEventType):
+    lookups = 0
+
+    @property
+    def validator(self):
+        CountingMetricEventType.lookups += 1
+        return MetricEventType.validator.fget(self)
+
+
+def test_validate_events_schema_looks_up_validators_once():
+    brq = Baroque()
+    payload = {'metric': 'temperature', 'value': 1,
+               'timestamp': '2017-02-15T13:56:09Z'}
+    events = [Event(CountingMetricEventType(), payload=payload)
+              for _ in range(5)]
+    brq._validate_events_schema(events)
+    assert CountingMetricEventType.lookups == 1
+
+    # types of the same class with schemas of their own are told apart
+    other = CountingMetricEventType()
+    other.jsonschema = '{"type": "object", "required": ["nothing"]}'
+    with pytest.raises(InvalidEventSchemaError):
+        brq._validate_events_schema(events + [Event(other, payload=payload)])
+        pytest.fail()
+
 
 def test_on_topic_run():
     brq = Baroque()
@@ -238,6 +363,20 @@ def test_on_topic_run():
     assert len(brq.topics.topics[t2]) == 1
 
 
+def test_on_topic_run_many():
+    brq = Baroque()
+    brq.config['topics']['register_on_binding'] = True
+    t = Topic('test-topic', eventtypes=[MetricEventType()])
+    reactors = [ReactorFactory.stdout() for _ in range(3)]
+    brq.on_topic_run_many(t, reactors)
+    assert t in brq.topics
+    assert list(brq.topics.topics[t]) == reactors
+
+    # unbinding
+    assert brq.remove_from_topic(t, reactors[:2]) == 2
+    assert list(brq.topics.topics[t]) == reactors[2:]
+
+
 def test_publish_on_topic():
     brq = Baroque()
     t = brq.topics.new('test-topic1',
@@ -261,5 +400,22 @@ def test_publish_on_topic():
     assert evt.status == EventStatus.PUBLISHED
 
 
+def test_publish_many_on_topic():
+    brq = Baroque()
+    t = brq.topics.new('test-topic1', eventtypes=[MetricEventType()])
+    evts = [Event(MetricEventType()), Event(GenericEventType())]
+
+    with pytest.raises(UnregisteredTopicError):
+        brq.publish_many_on_topic(evts, Topic('unregistered', []))
+        pytest.fail()
+
+    reacted_on = list()
+    brq.on_topic_run(t, Reactor(lambda evt: reacted_on.append(evt)))
+    brq.publish_many_on_topic(evts, t)
+    assert reacted_on == [evts[0]]
+    assert brq.events.count_all() == 2
+    assert all(evt.status == EventStatus.PUBLISHED for evt in evts)
+
+
 def test_print():
     print(Baroque())
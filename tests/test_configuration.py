@@ -1,3 +1,4 @@
+import threading
 import pytest
 from baroque import Baroque, EventType
 from baroque.defaults.config import DEFAULT_CONFIG as cfg
@@ -7,9 +8,18 @@ from baroque.exceptions.topics import UnregisteredTopicError
 from baroque.entities.reactor import Reactor
 from baroque.entities.event import Event
 from baroque.entities.topic import Topic
-from baroque.defaults.eventtypes import GenericEventType, MetricEventType
+from baroque.defaults.eventtypes import GenericEventType, MetricEventType, \
+    DataOperationEventType
 from baroque.defaults.reactors import ReactorFactory
 from baroque.persistence.backend import PersistenceBackend
+from baroque.pipelines.base import Stage
+from baroque.exceptions.configuration import InvalidConfigurationError
+from baroque.executors.base import ReactorsExecutor, ReactionsHandle
+from baroque.executors.threads import ThreadPoolReactorsExecutor
+from baroque.dispatchers.base import Dispatcher
+from baroque.dispatchers.queued import QueuedDispatcher
+from baroque.dispatchers.priority import PriorityDispatcher
+from baroque.dispatchers.partitioned import PartitionedDispatcher
 
 
 class FakeEventType(EventType):
@@ -84,6 +94,36 @@ def test_preregistered_eventtypes():
     assert FakeEventType() in brq.eventtypes
 
 
+def test_dispatch_to_supertypes():
+    class TemperatureEventType(MetricEventType):
+        pass
+
+    reacted = list()
+    cfg['eventtypes']['ignore_unregistered'] = False
+    brq = Baroque()
+    brq.config = cfg
+    brq.on(MetricEventType).run(Reactor(lambda e: reacted.append(e)))
+    event = Event(TemperatureEventType,
+                  payload=dict(metric='temperature', value=21, timestamp=1))
+    with pytest.raises(UnregisteredEventTypeError):
+        brq.publish(event)
+        pytest.fail()
+    assert reacted == []
+
+    cfg['eventtypes']['dispatch_to_supertypes'] = True
+    brq.config = cfg
+    brq.publish(event)
+    assert reacted == [event]
+
+    # reset brokers keep the setting
+    brq.reset()
+    assert brq.reactors.supertypes
+
+    cfg['eventtypes']['dispatch_to_supertypes'] = False
+    brq.config = cfg
+    assert not brq.reactors.supertypes
+
+
 def test_validate_schema():
     cfg['eventtypes']['pre_registered'] = ['baroque.defaults.eventtypes.MetricEventType']
     brq = Baroque()
@@ -101,6 +141,7 @@ def test_validate_schema():
 
     # do validate
     cfg['events']['validate_schema'] = True
+    brq.config = cfg
     with pytest.raises(InvalidEventSchemaError):
         brq.publish(event)
 
@@ -162,6 +203,144 @@ def test_persist():
     assert len(brq._persistance_backend) == 0
 
 
+class FakeStage(Stage):
+    seen = list()
+
+    def process(self, event, topic, proceed):
+        FakeStage.seen.append(event)
+        return proceed(event, topic)
+
+
+def test_middlewares():
+    cfg['events']['middlewares'] = ['tests.test_configuration.FakeStage']
+    brq = Baroque()
+    assert isinstance(brq.pipeline.stages[0], FakeStage)
+    evt = Event(GenericEventType())
+    brq.publish(evt)
+    assert FakeStage.seen == [evt]
+    cfg['events']['middlewares'] = []
+
+
+def test_rate_limits():
+    cfg['eventtypes']['ignore_unregistered'] = True
+    cfg['events']['persist'] = False
+    cfg['events']['rate_limits']['owners'] = {'spammer': dict(rate=0.001,
+                                                              burst=2)}
+    brq = Baroque()
+    reacted_on = list()
+    brq.on(GenericEventType()).run(Reactor(lambda e: reacted_on.append(e)))
+    for _ in range(5):
+        brq.publish(Event(GenericEventType(), owner='spammer'))
+    brq.publish_many([Event(GenericEventType(), owner='spammer'),
+                      Event(GenericEventType(), owner='me')])
+    assert len(reacted_on) == 3
+    assert brq.events.count_all() == 3
+    assert brq.events.count_limited('drop') == 4
+    cfg['events']['rate_limits']['owners'] = dict()
+
+
+def test_rate_limits_survive_recompiling():
+    cfg['eventtypes']['ignore_unregistered'] = True
+    cfg['events']['persist'] = False
+    cfg['events']['rate_limits']['owners'] = {'spammer': dict(rate=0.001,
+                                                              burst=2)}
+    brq = Baroque()
+    for _ in range(2):
+        brq.publish(Event(GenericEventType(), owner='spammer'))
+    brq.use(Stage())
+    brq.publish(Event(GenericEventType(), owner='spammer'))
+    assert brq.events.count_limited('drop') == 1
+    cfg['events']['rate_limits']['owners'] = dict()
+
+
+def test_changes_in_place():
+    cfg['reactors']['propagate_exceptions'] = True
+    cfg['reactors']['executor'] = dict(mode='inline', workers=None)
+    brq = Baroque()
+    executor = brq.executor
+    assert type(executor) == ReactorsExecutor
+
+    # changes made in place take effect once the configuration is set
+    cfg['reactors']['executor'] = dict(mode='threads', workers=1)
+    assert brq.publish(Event(GenericEventType())) is None
+    assert brq.executor is executor
+    brq.config = brq.config
+    assert isinstance(brq.publish(Event(GenericEventType())),
+                      ReactionsHandle)
+    assert type(brq.executor) == ThreadPoolReactorsExecutor
+
+    cfg['events']['dispatch'] = dict(mode='queued', queue_size=10)
+    brq.config = cfg
+    assert type(brq.dispatcher) == QueuedDispatcher
+    cfg['events']['dispatch'] = dict(mode='sync')
+    cfg['reactors']['executor'] = dict(mode='inline', workers=None)
+    brq.config = cfg
+    assert type(brq.dispatcher) == Dispatcher
+    assert type(brq.executor) == ReactorsExecutor
+    brq.close()
+
+
+def test_coalescing():
+    cfg['eventtypes']['ignore_unregistered'] = True
+    cfg['events']['persist'] = False
+    cfg['events']['validate_schema'] = True
+    cfg['events']['coalescing'] = dict(
+        window=1000, mode='merge',
+        eventtypes={'baroque.defaults.eventtypes.DataOperationEventType':
+                    'baroque.defaults.keys.datum_pk'})
+    brq = Baroque()
+    reacted_on = list()
+    brq.on(DataOperationEventType()).run(
+        Reactor(lambda e: reacted_on.append(e.payload)))
+    for i in range(10):
+        brq.publish(Event(DataOperationEventType(), payload=dict(
+            datum=dict(table='t', data_type='row', pk='1'),
+            operation='update', timestamp=0, meta=dict(), **{str(i): i})))
+    assert reacted_on == []
+    brq.flush()
+    assert len(reacted_on) == 1
+    assert all(reacted_on[0][str(i)] == i for i in range(10))
+    assert brq.events.count_all() == 1
+    assert brq.events.count_coalesced() == 9
+    brq.close()
+    cfg['events']['coalescing'] = dict(window=0, mode='last',
+                                       eventtypes=dict())
+
+
+def test_instrumentation():
+    brq = Baroque()
+    assert brq.latencies is None
+    cfg['events']['instrumentation'] = dict(enabled=True, buckets=[1, 10])
+    brq.config = cfg
+    latencies = brq.latencies
+    assert latencies is not None
+    assert latencies.buckets == (1, 10)
+    topic = brq.topics.new('test', eventtypes=[GenericEventType()])
+    r = Reactor(lambda e: None)
+    brq.on(GenericEventType()).run(r)
+    brq.on_topic_run(topic, Reactor(lambda e: None))
+    brq.publish(Event(GenericEventType()))
+    brq.publish_on_topic(Event(GenericEventType()), topic)
+    assert latencies.get('validation', GenericEventType).count() == 1
+    assert latencies.get('counting', GenericEventType).count() == 2
+    assert latencies.get('status', GenericEventType).count() == 2
+    assert latencies.get('reactors', GenericEventType).count() == 1
+    assert latencies.get('fanout', topic).count() == 1
+    assert latencies.get('reactor', r).count() == 1
+
+    # histograms survive recompilation, unless buckets change
+    brq.compile_pipeline()
+    assert brq.latencies is latencies
+    cfg['events']['instrumentation'] = dict(enabled=True, buckets=None)
+    brq.config = cfg
+    assert brq.latencies is not latencies
+    assert len(brq.latencies) == 0
+
+    cfg['events']['instrumentation'] = dict(enabled=False, buckets=None)
+    brq.config = cfg
+    assert brq.latencies is None
+
+
 def test_persistence_backend():
     brq = Baroque()
 
@@ -176,3 +355,136 @@ def test_persistence_backend():
     brq.publish(evt)
     assert len(pb) == 1
     assert evt in pb
+
+
+def test_reactors_executor():
+    cfg['reactors']['propagate_exceptions'] = True
+    cfg['eventtypes']['ignore_unregistered'] = True
+    cfg['events']['persist'] = False
+
+    # run reactors inline
+    cfg['reactors']['executor'] = dict(mode='inline', workers=None)
+    brq = Baroque()
+    brq.config = cfg
+    assert type(brq.executor) == ReactorsExecutor
+    assert brq.publish(Event(GenericEventType())) is None
+
+    # run reactors on a thread pool
+    cfg['reactors']['executor'] = dict(mode='threads', workers=2)
+    brq = Baroque()
+    brq.config = cfg
+    assert isinstance(brq.executor, ThreadPoolReactorsExecutor)
+
+    def reaction_raising_error(evt):
+        raise FileNotFoundError()
+
+    reacted_on = list()
+    brq.on(GenericEventType()).run(Reactor(lambda e: reacted_on.append(e)))
+    evt = Event(GenericEventType())
+    handle = brq.publish(evt)
+    assert isinstance(handle, ReactionsHandle)
+    handle.wait(timeout=5)
+    assert reacted_on == [evt]
+
+    # exceptions are propagated when waiting on the handle
+    brq.on(GenericEventType()).run(Reactor(reaction_raising_error))
+    handle = brq.publish_many([Event(GenericEventType()),
+                               Event(GenericEventType())])
+    assert len(handle) == 4
+    with pytest.raises(FileNotFoundError):
+        handle.wait(timeout=5)
+        pytest.fail()
+    brq.close()
+
+    # unsupported execution modes
+    cfg['reactors']['executor'] = dict(mode='unknown')
+    with pytest.raises(InvalidConfigurationError):
+        Baroque()
+        pytest.fail()
+    cfg['reactors']['executor'] = dict(mode='inline', workers=None)
+
+
+def test_events_dispatch():
+    cfg['reactors']['propagate_exceptions'] = True
+    cfg['eventtypes']['ignore_unregistered'] = True
+    cfg['events']['persist'] = False
+    cfg['events']['validate_schema'] = True
+
+    # publications are carried out synchronously
+    cfg['events']['dispatch'] = dict(mode='sync')
+    brq = Baroque()
+    assert type(brq.dispatcher) == Dispatcher
+
+    # publications are carried out by dispatcher threads
+    cfg['events']['dispatch'] = dict(mode='queued', queue_size=100,
+                                     overflow='block', dispatchers=1)
+    brq = Baroque()
+    assert isinstance(brq.dispatcher, QueuedDispatcher)
+    reacted_on = list()
+    brq.on(GenericEventType()).run(
+        Reactor(lambda e: reacted_on.append(threading.current_thread())))
+    assert brq.publish(Event(GenericEventType())) is None
+    assert brq.publish_many([Event(GenericEventType()),
+                             Event(GenericEventType())]) is None
+    assert brq.flush(timeout=5)
+    assert len(reacted_on) == 3
+    assert threading.current_thread() not in reacted_on
+    assert brq.events.count_all() == 3
+
+    # exceptions are propagated when flushing
+    brq.on(MetricEventType()).run(Reactor(lambda e: 1 / 0))
+    brq.publish(Event(MetricEventType(), payload=dict(metric='x', value=1,
+                                                      timestamp=0)))
+    with pytest.raises(ZeroDivisionError):
+        brq.flush(timeout=5)
+        pytest.fail()
+
+    # invalid events are reported when flushing
+    brq.publish(Event(MetricEventType(), payload=dict()))
+    with pytest.raises(InvalidEventSchemaError):
+        brq.flush(timeout=5)
+        pytest.fail()
+    brq.close()
+
+    # publications are carried out by priority
+    cfg['events']['dispatch'] = dict(mode='priority', aging=0)
+    brq = Baroque()
+    assert isinstance(brq.dispatcher, PriorityDispatcher)
+    assert brq.dispatcher.queue.aging == 0
+    brq.close()
+
+    # publications are carried out on key-partitioned lanes
+    cfg['events']['dispatch'] = dict(
+        mode='partitioned', lanes=2,
+        partition_key='baroque.defaults.keys.datum_pk')
+    brq = Baroque()
+    assert isinstance(brq.dispatcher, PartitionedDispatcher)
+    assert len(brq.dispatcher.lanes) == 2
+    journal = list()
+    brq.on(DataOperationEventType()).run(
+        Reactor(lambda e: journal.append(e.payload['operation'])))
+    for operation in ['creation', 'update', 'deletion']:
+        brq.publish(Event(DataOperationEventType(), payload=dict(
+            datum=dict(table='t', data_type='row', pk='1'),
+            operation=operation, timestamp=0, meta=dict())))
+    assert brq.flush(timeout=5)
+    assert journal == ['creation', 'update', 'deletion']
+    brq.close()
+    cfg['events']['dispatch'] = dict(mode='partitioned', partition_key=None)
+    with pytest.raises(InvalidConfigurationError):
+        Baroque()
+        pytest.fail()
+
+    # unsupported dispatch modes and overflow policies
+    cfg['events']['dispatch'] = dict(mode='unknown')
+    with pytest.raises(InvalidConfigurationError):
+        Baroque()
+        pytest.fail()
+    cfg['events']['dispatch'] = dict(mode='queued', overflow='unknown')
+    with pytest.raises(InvalidConfigurationError):
+        Baroque()
+        pytest.fail()
+    cfg['events']['dispatch'] = dict(mode='sync', queue_size=10000,
+                                     overflow='block', dispatchers=1,
+                                     aging=100, lanes=4,
+                                     partition_key='baroque.defaults.keys.datum_pk')
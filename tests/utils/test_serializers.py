@@ -0,0 +1,54 @@
+import json
+import pytest
+from baroque.utils import serializers
+from baroque.utils.serializers import JSONSerializer, OrjsonSerializer
+
+
+DATA = dict(a=1, b=[1.5, None, True], c='città', d={1: 'x'})
+
+
+def test_json_serializer():
+    s = JSONSerializer()
+    text = s.dumps(DATA)
+    assert isinstance(text, str)
+    assert ' ' not in text
+    assert 'città' in text
+    assert s.loads(text) == json.loads(json.dumps(DATA))
+
+
+def test_orjson_serializer():
+    pytest.importorskip('orjson')
+    s = OrjsonSerializer()
+    text = s.dumps(DATA)
+    assert isinstance(text, str)
+    assert text == JSONSerializer().dumps(DATA)
+    assert s.loads(text) == JSONSerializer().loads(text)
+
+    # values orjson cannot dump are dumped by the standard library
+    big = dict(x=2 ** 70)
+    assert s.loads(s.dumps(big)) == big
+
+
+def test_default_serializer():
+    s = serializers.default_serializer()
+    if serializers.orjson is None:
+        assert type(s) == JSONSerializer
+    else:
+        assert type(s) == OrjsonSerializer
+
+
+def test_use_serializer():
+    s = JSONSerializer()
+    previous = serializers.use_serializer(s)
+    try:
+        assert serializers.serializer is s
+        assert serializers.loads(serializers.dumps(dict(a=1))) == dict(a=1)
+        with pytest.raises(AssertionError):
+            serializers.use_serializer(object())
+    finally:
+        assert serializers.use_serializer(previous) is s
+    assert serializers.serializer is previous
+    serializers.use_serializer()
+    assert type(serializers.serializer) == \
+        type(serializers.default_serializer())
+    serializers.use_serializer(previous)
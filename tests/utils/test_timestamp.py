@@ -1,4 +1,7 @@
 import datetime
+import time
+import pytest
+import pytz
 from baroque.utils import timestamp
 
 
@@ -11,3 +14,57 @@ def test_stringify():
     dateobj = datetime.datetime(1983, 7, 3, 9, 0, 0)
     result = timestamp.stringify(dateobj)
     assert isinstance(result, str)
+
+
+def test_now_ns():
+    ns = timestamp.now_ns()
+    assert isinstance(ns, int)
+    assert timestamp.now_ns() >= ns
+
+
+def test_from_ns_and_to_ns():
+    dateobj = datetime.datetime(1983, 7, 3, 9, 0, 0, 123456,
+                                tzinfo=pytz.utc)
+    ns = timestamp.to_ns(dateobj)
+    assert ns == 426070800123456000
+    assert timestamp.from_ns(ns) == dateobj
+    assert timestamp.from_ns(ns + 999).microsecond == 123456
+    assert timestamp.from_ns(ns).tzinfo is not None
+    # naive timestamps are taken as UTC
+    assert timestamp.to_ns(dateobj.replace(tzinfo=None)) == ns
+
+
+def test_stringify_ns():
+    dateobj = datetime.datetime(1983, 7, 3, 9, 0, 0, tzinfo=pytz.utc)
+    assert timestamp.stringify_ns(timestamp.to_ns(dateobj)) == \
+        timestamp.stringify(dateobj) == '1983-07-03T09:00:00Z'
+
+
+def test_use_clock():
+    previous = timestamp.use_clock(lambda: 42)
+    try:
+        assert timestamp.now_ns() == 42
+    finally:
+        assert timestamp.use_clock(previous)() == 42
+    assert timestamp.now_ns() != 42
+    timestamp.use_clock()
+    assert timestamp.now_ns is time.time_ns
+    timestamp.use_clock(previous)
+
+
+def test_coarse_clock():
+    clock = timestamp.CoarseClock(resolution_ms=1)
+    assert clock() > 0
+    with clock:
+        assert clock.thread is not None
+        first = timestamp.now_ns()
+        assert first == clock.now
+        deadline = time.time() + 5
+        while timestamp.now_ns() == first and time.time() < deadline:
+            time.sleep(0.001)
+        assert timestamp.now_ns() > first
+    assert clock.thread is None
+    assert timestamp.now_ns is not clock
+    with pytest.raises(AssertionError):
+        timestamp.CoarseClock(resolution_ms=0)
+        pytest.fail()